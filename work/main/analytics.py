@@ -0,0 +1,230 @@
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, time as dt_time, timedelta, timezone as dt_timezone
+
+import numpy as np
+from django.conf import settings
+from django.db.models import Count, FloatField, Func, Max
+from django.utils import timezone
+
+from .cache import get_response_cache
+from .models import Task
+
+PRIORITIES = [value for value, _ in Task._meta.get_field('priority').choices]
+HOUR = np.timedelta64(1, 'h')
+
+
+def analytics_setting(name):
+    defaults = {'CACHE_TIMEOUT': 300, 'MAX_WEEKS': 104, 'MAX_DAYS': 365}
+    return getattr(settings, 'ANALYTICS', {}).get(name, defaults[name])
+
+
+@dataclass
+class TaskColumns:
+    """
+    Задачи проекта по колонкам: время в datetime64[us] (UTC), NaT вместо NULL.
+
+    Время завершения задачи отдельно не хранится, поэтому для задач в статусе
+    Done им считается updated_at.
+    """
+
+    created: np.ndarray
+    updated: np.ndarray
+    deadline: np.ndarray
+    done: np.ndarray
+    priority: np.ndarray
+
+    @property
+    def completed(self):
+        return np.where(self.done, self.updated, np.datetime64('NaT', 'us'))
+
+
+class EpochSeconds(Func):
+    """
+    Время в секундах от эпохи UTC (double precision, NULL остаётся NULL).
+
+    Числа из базы numpy превращает в массив целиком, без datetime-конвертеров
+    Django и построчного Python.
+    """
+
+    template = 'EXTRACT(EPOCH FROM %(expressions)s)'
+    output_field = FloatField()
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection, template='EXTRACT(EPOCH FROM %(expressions)s)::double precision',
+                           **extra_context)
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        # SQLite хранит время текстом 'YYYY-MM-DD HH:MM:SS[.ffffff]' в UTC; %s отдаёт целые секунды.
+        return self.as_sql(compiler, connection, template=(
+            "(strftime('%%%%s', %(expressions)s) + COALESCE(CAST(substr(%(expressions)s, 20) AS REAL), 0))"
+        ), **extra_context)
+
+
+def _datetimes(seconds):
+    seconds = np.array(seconds, dtype=np.float64)  # None -> nan
+    result = np.full(seconds.shape, np.datetime64('NaT'), dtype='datetime64[us]')
+    known = ~np.isnan(seconds)
+    result[known] = np.rint(seconds[known] * 1e6).astype(np.int64).astype('datetime64[us]')
+    return result
+
+
+def load_columns(project_id):
+    """
+    Читает задачи проекта одним запросом values_list и раскладывает их по массивам.
+    Время приходит из базы числом секунд (EpochSeconds).
+    """
+
+    rows = Task.objects.filter(project_id=project_id).order_by().values_list(
+        EpochSeconds('created_at'), EpochSeconds('updated_at'), EpochSeconds('deadline'), 'status', 'priority')
+    created, updated, deadline, task_status, priority = zip(*rows) if rows else ([],) * 5
+    return TaskColumns(
+        created=_datetimes(created),
+        updated=_datetimes(updated),
+        deadline=_datetimes(deadline),
+        done=np.array(task_status, dtype=str) == 'Done',
+        priority=np.array(priority, dtype=str),
+    )
+
+
+def _utc64(value):
+    return np.datetime64(value.astimezone(dt_timezone.utc).replace(tzinfo=None), 'us')
+
+
+def _local_midnight(day):
+    return datetime.combine(day, dt_time(), tzinfo=timezone.get_current_timezone())
+
+
+def _week_starts(weeks):
+    # Недели начинаются с понедельника по местному времени, последняя — текущая.
+    today = timezone.localdate()
+    monday = today - timedelta(days=today.weekday())
+    return [monday - timedelta(weeks=weeks - 1 - i) for i in range(weeks)]
+
+
+def _count_until(sorted_times, points):
+    # Сколько моментов из sorted_times не позже каждой точки.
+    return np.searchsorted(sorted_times, points, side='right')
+
+
+def _percentiles(hours, percentiles):
+    if not len(hours):
+        return {_percentile_name(p): None for p in percentiles}
+    values = np.percentile(hours, percentiles)
+    return {_percentile_name(p): round(float(value), 2) for p, value in zip(percentiles, values)}
+
+
+def _percentile_name(percentile):
+    return f'{percentile:g}'
+
+
+def cycle_time(columns, weeks, percentiles):
+    """
+    Время от создания до завершения (в часах) задач, завершённых за последние weeks недель:
+    перцентили по проекту и по приоритетам.
+    """
+
+    first_week = _week_starts(weeks)[0]
+    completed = columns.done & (columns.updated >= _utc64(_local_midnight(first_week)))
+    hours = (columns.updated[completed] - columns.created[completed]) / HOUR
+    priority = columns.priority[completed]
+    return {
+        'since': first_week.isoformat(),
+        'completed': int(len(hours)),
+        'mean_hours': round(float(hours.mean()), 2) if len(hours) else None,
+        'percentiles': _percentiles(hours, percentiles),
+        'by_priority': {
+            value: {'completed': int(np.count_nonzero(priority == value)),
+                    'percentiles': _percentiles(hours[priority == value], percentiles)}
+            for value in PRIORITIES
+        },
+    }
+
+
+def throughput(columns, weeks):
+    """
+    Число созданных и завершённых задач по неделям за последние weeks недель.
+    """
+
+    starts = _week_starts(weeks)
+    edges = np.array([_utc64(_local_midnight(day)) for day in starts]
+                     + [_utc64(_local_midnight(starts[-1] + timedelta(weeks=1)))])
+
+    def per_week(times):
+        times = times[~np.isnat(times)]
+        counts = _count_until(np.sort(times), edges - np.timedelta64(1, 'us'))
+        return np.diff(counts)
+
+    created = per_week(columns.created)
+    completed = per_week(columns.completed)
+    return {'weeks': [
+        {'week': day.isoformat(), 'created': int(created[i]), 'completed': int(completed[i])}
+        for i, day in enumerate(starts)
+    ]}
+
+
+def burndown(columns, days):
+    """
+    Состояние проекта на конец каждого из последних days дней (сегодня — на текущий момент):
+    scope — создано задач, remaining — не завершено, overdue — не завершено после дедлайна.
+    """
+
+    today = timezone.localdate()
+    dates = [today - timedelta(days=days - 1 - i) for i in range(days)]
+    now = timezone.now()
+    points = np.array([_utc64(min(_local_midnight(day + timedelta(days=1)), now)) for day in dates])
+
+    completed = columns.completed
+    has_deadline = ~np.isnat(columns.deadline)
+    # Задача просрочена с max(created, deadline) и до завершения.
+    overdue_from = np.maximum(columns.created[has_deadline], columns.deadline[has_deadline])
+
+    scope = _count_until(np.sort(columns.created), points)
+    remaining = scope - _count_until(np.sort(np.maximum(columns.created, completed)[columns.done]), points)
+    overdue = (_count_until(np.sort(overdue_from), points)
+               - _count_until(np.sort(np.maximum(overdue_from, completed[has_deadline])[columns.done[has_deadline]]),
+                              points))
+    return {'points': [
+        {'date': day.isoformat(), 'scope': int(scope[i]), 'remaining': int(remaining[i]),
+         'overdue': int(overdue[i])}
+        for i, day in enumerate(dates)
+    ]}
+
+
+METRICS = {
+    'cycle_time': cycle_time,
+    'throughput': throughput,
+    'burndown': burndown,
+}
+
+
+def project_state(project_id):
+    """
+    Отметка изменения задач проекта: число задач и максимальный updated_at
+    (одним index-only запросом по task_project_updated_idx). Число задач
+    нужно, потому что удаление не меняет Max(updated_at).
+    """
+
+    state = Task.objects.filter(project_id=project_id).order_by().aggregate(
+        count=Count('id'), updated=Max('updated_at'))
+    return f"{state['count']}:{state['updated'] and state['updated'].isoformat()}"
+
+
+def project_analytics(project_id, metric, **params):
+    """
+    Метрика metric проекта, закэшированная по проекту, отметке изменения задач,
+    параметрам и текущей дате (окна недель и дней сдвигаются с датой).
+
+    Запись живёт ANALYTICS['CACHE_TIMEOUT'] секунд: изменения задач сбрасывают
+    её сразу, а переход задачи в просроченные виден с этой задержкой.
+    """
+
+    parts = [metric, str(project_id), project_state(project_id), timezone.localdate().isoformat(),
+             *(f'{name}={params[name]}' for name in sorted(params))]
+    key = 'analytics:' + hashlib.md5('|'.join(parts).encode('utf-8')).hexdigest()
+    cache = get_response_cache()
+    data = cache.get(key)
+    if data is None:
+        data = {'project': project_id, **METRICS[metric](load_columns(project_id), **params)}
+        cache.set(key, data, analytics_setting('CACHE_TIMEOUT'))
+    return data
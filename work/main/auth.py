@@ -1,5 +1,259 @@
-from rest_framework.authentication import TokenAuthentication
+import threading
+import time
+from collections import OrderedDict
+
+import hmac
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework.authentication import BaseAuthentication, TokenAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.throttling import BaseThrottle
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
 
 
 class Bearer(TokenAuthentication):
-    keyword = 'Bearer'
\ No newline at end of file
+    keyword = 'Bearer'
+
+
+class FailedLoginCache:
+    """
+    Ограниченный кэш недавних неудачных попыток входа.
+
+    После max_attempts неудач подряд ключ (см. login_attempt_key) блокируется на timeout секунд,
+    и следующие попытки отклоняются до проверки пароля, то есть без расчёта
+    PBKDF2. Каждая неудача продлевает окно. Размер кэша ограничен max_entries,
+    при переполнении вытесняются давно не обновлявшиеся записи.
+    Кэш живёт в памяти процесса: у каждого воркера свой счётчик.
+    """
+
+    def __init__(self, max_entries=10000, max_attempts=5, timeout=300):
+        self.max_entries = max_entries
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def blocked_for(self, key):
+        """
+        Возвращает число секунд до снятия блокировки или 0.
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return 0
+            failures, expires_at = entry
+            remaining = expires_at - time.monotonic()
+            if remaining <= 0:
+                del self._entries[key]
+                return 0
+            if failures < self.max_attempts:
+                return 0
+            return remaining
+
+    def add_failure(self, key):
+        with self._lock:
+            failures, expires_at = self._entries.pop(key, (0, 0))
+            if expires_at <= time.monotonic():
+                failures = 0
+            self._entries[key] = (failures + 1, time.monotonic() + self.timeout)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def reset(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def login_attempt_key(email, request=None):
+    """
+    Ключ неудачных входов: email и адрес клиента (как у троттлинга DRF, с учётом
+    NUM_PROXIES). Подбор пароля блокируется для адреса, с которого он идёт, а
+    владелец аккаунта со своего адреса войти может.
+    """
+
+    return email.lower(), BaseThrottle().get_ident(request) if request is not None else None
+
+
+_failed_logins = None
+
+
+def get_failed_login_cache():
+    """
+    Кэш неудачных входов по настройке LOGIN_FAILURE_CACHE или None, если он отключён.
+    """
+
+    global _failed_logins
+    options = getattr(settings, 'LOGIN_FAILURE_CACHE', None)
+    if not options:
+        return None
+    if _failed_logins is None:
+        _failed_logins = FailedLoginCache(
+            max_entries=options.get('MAX_ENTRIES', 10000),
+            max_attempts=options.get('MAX_ATTEMPTS', 5),
+            timeout=options.get('TIMEOUT', 300),
+        )
+    return _failed_logins
+
+
+def jwt_auth_setting(name):
+    defaults = {'USER_TIMEOUT': 10, 'REVOKED_SYNC_INTERVAL': 5}
+    return getattr(settings, 'JWT_AUTH_CACHE', {}).get(name, defaults[name])
+
+
+class RevokedTokens:
+    """
+    Отозванные JTI в памяти процесса.
+
+    Множество дополняется из BlacklistedToken инкрементально (id > последнего
+    прочитанного) не чаще раза в sync_interval секунд, поэтому проверка токена
+    обычно не обращается к базе. Токены, отозванные в этом же процессе,
+    добавляются сразу; другие воркеры узнают о них не позже чем через
+    sync_interval: множество своё у каждого процесса, общая у них только
+    таблица token_blacklist. Истёкшие JTI удаляются: такой токен и так не
+    пройдёт проверку exp.
+    """
+
+    def __init__(self, sync_interval=5):
+        self.sync_interval = sync_interval
+        self._expires = {}
+        self._last_id = 0
+        self._synced_at = None
+        self._lock = threading.Lock()
+
+    def is_revoked(self, jti):
+        self.sync()
+        return jti in self._expires
+
+    def add(self, jti, expires_at):
+        with self._lock:
+            self._expires[jti] = expires_at
+
+    def sync(self, force=False):
+        if not force and self._synced_at is not None and time.monotonic() - self._synced_at < self.sync_interval:
+            return
+        with self._lock:
+            if not force and self._synced_at is not None and time.monotonic() - self._synced_at < self.sync_interval:
+                return
+            now = timezone.now()
+            rows = BlacklistedToken.objects.filter(
+                id__gt=self._last_id, token__expires_at__gt=now
+            ).order_by('id').values_list('id', 'token__jti', 'token__expires_at')
+            for row_id, jti, expires_at in rows:
+                self._expires[jti] = expires_at
+                self._last_id = row_id
+            self._expires = {jti: expires_at for jti, expires_at in self._expires.items() if expires_at > now}
+            self._synced_at = time.monotonic()
+
+    def clear(self):
+        with self._lock:
+            self._expires.clear()
+            self._last_id = 0
+            self._synced_at = None
+
+
+_revoked_tokens = None
+
+
+def get_revoked_tokens():
+    global _revoked_tokens
+    if _revoked_tokens is None:
+        _revoked_tokens = RevokedTokens(sync_interval=jwt_auth_setting('REVOKED_SYNC_INTERVAL'))
+    return _revoked_tokens
+
+
+def revoke_token(token):
+    """
+    Заносит JWT (в том числе access-токен) в чёрный список token_blacklist.
+    """
+
+    jti = token[jwt_settings.JTI_CLAIM]
+    expires_at = datetime_from_epoch(token['exp'])
+    outstanding, _ = OutstandingToken.objects.get_or_create(
+        jti=jti,
+        defaults={
+            'token': str(token),
+            'expires_at': expires_at,
+            'user_id': token.get(jwt_settings.USER_ID_CLAIM),
+        },
+    )
+    BlacklistedToken.objects.get_or_create(token=outstanding)
+    get_revoked_tokens().add(jti, expires_at)
+
+
+def _user_cache_key(user_id):
+    return f'auth:user:{user_id}'
+
+
+def invalidate_cached_user(user_id):
+    """
+    Сбрасывает кэш пользователя только в текущем процессе (кэш default — LocMemCache).
+    """
+
+    cache.delete(_user_cache_key(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication без запросов к базе в установившемся режиме.
+
+    Подпись и срок действия проверяются как обычно, отзыв — по множеству
+    RevokedTokens, а пользователь берётся из кэша на JWT_AUTH_CACHE['USER_TIMEOUT']
+    секунд. Кэш пользователя сбрасывается при сохранении или удалении UserAPI
+    (смена профиля, пароля, is_active), см. main.signals.
+
+    Оба кэша живут в памяти процесса: общий кэш стоил бы запроса на каждый
+    запрос API. Поэтому в других воркерах блокировка пользователя действует
+    не позже чем через USER_TIMEOUT (по умолчанию 10 с), а отзыв токена — через
+    REVOKED_SYNC_INTERVAL (5 с); в воркере, где они произошли, — сразу.
+    """
+
+    def get_validated_token(self, raw_token):
+        validated_token = super().get_validated_token(raw_token)
+        jti = validated_token.get(jwt_settings.JTI_CLAIM)
+        if jti is not None and get_revoked_tokens().is_revoked(jti):
+            raise InvalidToken({'detail': 'Token is blacklisted', 'code': 'token_not_valid'})
+        return validated_token
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[jwt_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken('Token contained no recognizable user identification')
+
+        key = _user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(validated_token)
+            cache.set(key, user, jwt_auth_setting('USER_TIMEOUT'))
+            return user
+
+        if not user.is_active:
+            raise AuthenticationFailed('User is inactive', code='user_inactive')
+        return user
+
+
+class MetricsTokenAuthentication(BaseAuthentication):
+    """
+    Сборщик метрик с токеном из settings.METRICS['TOKEN']
+    (Authorization: Bearer <токен>). Другие заголовки пропускает дальше,
+    чтобы сотрудник мог открыть /metrics с обычной авторизацией.
+    """
+
+    def authenticate(self, request):
+        expected = getattr(settings, 'METRICS', {}).get('TOKEN')
+        scheme, _, token = request.META.get('HTTP_AUTHORIZATION', '').partition(' ')
+        if not expected or scheme.lower() != 'bearer' or not hmac.compare_digest(token.strip(), expected):
+            return None
+        return AnonymousUser(), token
@@ -0,0 +1,62 @@
+import re
+from dataclasses import dataclass
+
+from django.conf import settings
+
+
+@dataclass(frozen=True)
+class Budget:
+    queries: int
+    latency_ms: float
+
+
+def performance_budget(method='GET', *, queries, latency_ms):
+    """
+    Бюджет представления: сколько SQL-запросов и миллисекунд допускается на
+    один запрос method при масштабе данных PerformanceBudgetTests.
+
+    Ставится над @api_view (или над классом APIView), несколько декораторов
+    задают бюджеты разных методов. Превышение валит PerformanceBudgetTests
+    с диффом SQL относительно снимка в main/query_snapshots/.
+    """
+
+    def decorator(view):
+        budgets = dict(getattr(view, 'performance_budgets', {}))
+        budgets[method] = Budget(queries, latency_ms)
+        view.performance_budgets = budgets
+        return view
+
+    return decorator
+
+
+def get_budgets(view):
+    """
+    Бюджеты маршрута по его callback: функция из @api_view или as_view() класса.
+    """
+
+    view_class = getattr(view, 'view_class', None) or getattr(view, 'cls', None)
+    return getattr(view, 'performance_budgets', None) or getattr(view_class, 'performance_budgets', {})
+
+
+def latency_factor():
+    # Медленные CI-машины поднимают множитель вместо правки бюджетов.
+    return getattr(settings, 'PERFORMANCE_BUDGETS', {}).get('LATENCY_FACTOR', 1.0)
+
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST_RE = re.compile(r'IN \((?:\?, )+\?\)')
+_SAVEPOINT_RE = re.compile(r'"s\d+_x\d+"')
+
+
+def normalize_sql(sql):
+    """
+    SQL без литералов: id, даты и строки заменены на ?, списки IN свёрнуты,
+    имена точек сохранения (в них id потока) одинаковы,
+    чтобы снимки не зависели от данных конкретного прогона.
+    """
+
+    sql = _SAVEPOINT_RE.sub('"savepoint"', sql)
+    sql = _STRING_RE.sub('?', sql)
+    sql = _NUMBER_RE.sub('?', sql)
+    return _IN_LIST_RE.sub('IN (...)', sql)
@@ -0,0 +1,138 @@
+import hashlib
+import threading
+import uuid
+from collections import Counter
+from functools import wraps
+
+from django.core.cache import caches
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import CacheGeneration
+
+CACHE_ALIAS = 'responses'
+
+
+def get_response_cache():
+    return caches[CACHE_ALIAS]
+
+
+class CacheStats:
+    """
+    Счётчики попаданий и промахов кэша ответов по именам представлений (на процесс).
+    """
+
+    def __init__(self):
+        self._counters = Counter()
+        self._lock = threading.Lock()
+
+    def hit(self, name):
+        with self._lock:
+            self._counters[(name, 'hits')] += 1
+
+    def miss(self, name):
+        with self._lock:
+            self._counters[(name, 'misses')] += 1
+
+    def snapshot(self):
+        with self._lock:
+            counters = dict(self._counters)
+        stats = {}
+        for (name, kind), value in counters.items():
+            stats.setdefault(name, {'hits': 0, 'misses': 0})[kind] = value
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self._counters.clear()
+
+
+stats = CacheStats()
+
+
+def project_scope(project_id):
+    return f'project:{project_id}'
+
+
+def user_scope(user_id):
+    return f'user:{user_id}'
+
+
+def _generations(scopes):
+    """
+    Текущие поколения областей кэша одним запросом к CacheGeneration.
+
+    Поколение — случайная строка, а не счётчик: если строку удалить, новое
+    значение не совпадёт ни с одной старой записью.
+    """
+
+    generations = dict(CacheGeneration.objects.filter(scope__in=scopes).values_list('scope', 'generation'))
+    missing = [scope for scope in scopes if scope not in generations]
+    if missing:
+        CacheGeneration.objects.bulk_create(
+            [CacheGeneration(scope=scope, generation=uuid.uuid4().hex) for scope in missing], ignore_conflicts=True)
+        generations.update(CacheGeneration.objects.filter(scope__in=missing).values_list('scope', 'generation'))
+    return [generations[scope] for scope in scopes]
+
+
+def invalidate(*scopes):
+    """
+    Сбрасывает все закэшированные ответы, зависящие от указанных областей,
+    во всех воркерах: новые поколения записываются одним INSERT ... ON CONFLICT.
+    """
+
+    if scopes:
+        CacheGeneration.objects.bulk_create(
+            [CacheGeneration(scope=scope, generation=uuid.uuid4().hex) for scope in sorted(set(scopes))],
+            update_conflicts=True, unique_fields=['scope'], update_fields=['generation'],
+        )
+
+
+def invalidate_projects(project_ids):
+    invalidate(*(project_scope(project_id) for project_id in project_ids))
+
+
+def invalidate_users(user_ids):
+    invalidate(*(user_scope(user_id) for user_id in user_ids))
+
+
+def cached_response(name, scopes):
+    """
+    Кэширует данные успешного GET-ответа представления.
+
+    scopes(request, *args, **kwargs) возвращает области, от которых зависит
+    ответ (project_scope/user_scope). Ключ собирается из имени, полного URL
+    запроса (вместе с ?fields=, курсором и т.п.) и поколений областей, поэтому
+    запись перестаёт находиться сразу после invalidate() любой из них.
+    Данные лежат в кэше процесса (CACHES['responses']), а поколения — в
+    базе, поэтому invalidate() видят все воркеры.
+    В кэше лежат данные ответа, а не байты: формат выбирается заново на
+    каждый запрос. Декоратор ставится под @api_view/@permission_classes, для
+    APIView — через method_decorator.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method != 'GET':
+                return view(request, *args, **kwargs)
+
+            cache = get_response_cache()
+            parts = [name, request.build_absolute_uri(), *_generations(scopes(request, *args, **kwargs))]
+            key = 'response:' + hashlib.md5('|'.join(parts).encode('utf-8')).hexdigest()
+
+            data = cache.get(key)
+            if data is not None:
+                stats.hit(name)
+                response = Response(data, status=status.HTTP_200_OK)
+                response['X-Cache'] = 'HIT'
+                return response
+
+            stats.miss(name)
+            response = view(request, *args, **kwargs)
+            if isinstance(response, Response) and response.status_code == status.HTTP_200_OK:
+                cache.set(key, response.data)
+                response['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
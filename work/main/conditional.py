@@ -0,0 +1,66 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.views.decorators.http import condition
+
+from .models import Comment, Project, Task
+
+
+def _validator(request, fetch):
+    """
+    Значение валидатора, вычисленное один раз на запрос.
+
+    condition() спрашивает etag_func и last_modified_func по отдельности,
+    а запрос к базе нужен только один.
+    """
+
+    http_request = getattr(request, '_request', request)
+    if not hasattr(http_request, '_conditional_validator'):
+        http_request._conditional_validator = fetch() if request.method in ('GET', 'HEAD') else None
+    return http_request._conditional_validator
+
+
+def _etag(request, value):
+    if value is None:
+        return None
+    # Один и тот же ресурс отдаётся в разных форматах и с ?fields=, поэтому
+    # в ETag входят полный путь и Accept.
+    key = '|'.join([request.get_full_path(), request.META.get('HTTP_ACCEPT', ''), str(value)])
+    return hashlib.md5(key.encode('utf-8')).hexdigest()
+
+
+def _project_updated(request, pk):
+    return _validator(
+        request, lambda: Project.objects.filter(pk=pk).values_list('time_updated', flat=True).first()
+    )
+
+
+def _task_updated(request, pk):
+    return _validator(
+        request, lambda: Task.objects.filter(pk=pk).values_list('updated_at', flat=True).first()
+    )
+
+
+def _comments_state(request, task_id):
+    def fetch():
+        state = Comment.objects.filter(task_id=task_id).aggregate(count=Count('id'), updated=Max('updated_at'))
+        return f"{state['count']}:{state['updated'] and state['updated'].isoformat()}"
+    return _validator(request, fetch)
+
+
+# Для проекта и задачи валидатор — одна колонка по первичному ключу.
+project_condition = condition(
+    etag_func=lambda request, pk: _etag(request, _project_updated(request, pk)),
+    last_modified_func=_project_updated,
+)
+
+task_condition = condition(
+    etag_func=lambda request, pk: _etag(request, _task_updated(request, pk)),
+    last_modified_func=_task_updated,
+)
+
+# У списка комментариев только ETag: удаление комментария не меняет
+# Max(updated_at), зато меняет число строк.
+comments_condition = condition(
+    etag_func=lambda request, task_id: _etag(request, _comments_state(request, task_id)),
+)
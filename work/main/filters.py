@@ -1,5 +1,5 @@
 from django_filters import rest_framework as filters
-from .models import Project, Task
+from .models import Comment, Project, Task
 
 class ProjectFilter(filters.FilterSet):
     title = filters.CharFilter(lookup_expr='icontains')
@@ -22,3 +22,12 @@ class TaskFilter(filters.FilterSet):
         model = Task
         fields = ['status', 'priority', 'assigned_to', 'created_at', 'updated_at', 'title']
 
+
+class CommentFilter(filters.FilterSet):
+    task = filters.NumberFilter(field_name='task', lookup_expr='exact')
+    author = filters.NumberFilter(field_name='author', lookup_expr='exact')
+    created_at = filters.DateFromToRangeFilter(field_name='created_at')
+
+    class Meta:
+        model = Comment
+        fields = ['task', 'author', 'created_at']
@@ -0,0 +1,185 @@
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.utils import timezone
+
+from main.analytics import METRICS, load_columns, project_analytics
+from main.cache import get_response_cache
+from main.models import Project, Task, UserAPI
+from main.serializers import TaskSerializer
+
+PARAMS = {
+    'cycle_time': {'weeks': 12, 'percentiles': [50.0, 85.0, 95.0]},
+    'throughput': {'weeks': 12},
+    'burndown': {'days': 30},
+}
+
+
+class Command(BaseCommand):
+    """
+    Бенчмарк аналитики проекта (main.analytics) на большом проекте.
+
+    Пример:
+        python manage.py bench_analytics --seed 1000000
+        python manage.py bench_analytics --project 42 --naive
+
+    Для каждой метрики печатается медиана по --repeat прогонам: чтение колонок
+    через values_list, векторный расчёт в NumPy и ответ из кэша. С --naive
+    для сравнения та же метрика считается циклом по задачам поверх вывода
+    TaskSerializer (на миллионе задач это минуты).
+    """
+
+    help = 'Время расчёта cycle time, throughput и burndown проекта: NumPy, кэш и построчный Python.'
+
+    batch_size = 10000
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Сколько задач сгенерировать в новом проекте (например, 1000000).')
+        parser.add_argument('--project', type=int, help='ID проекта; по умолчанию проект с наибольшим числом задач.')
+        parser.add_argument('--repeat', type=int, default=3)
+        parser.add_argument('--naive', action='store_true', help='Замерить и построчный расчёт по TaskSerializer.')
+
+    def handle(self, *args, **options):
+        if options['seed']:
+            project_id = self.seed(options['seed'])
+        elif options['project']:
+            project_id = options['project']
+        else:
+            project_id = (Task.objects.values('project_id').annotate(total=Count('id')).order_by('-total')
+                          .values_list('project_id', flat=True).first())
+        if project_id is None:
+            raise CommandError('Нет данных: запустите команду с --seed.')
+
+        total = Task.objects.filter(project_id=project_id).count()
+        self.stdout.write(self.style.MIGRATE_HEADING(f'Проект {project_id}: {total} задач'))
+
+        load = self.measure(options['repeat'], lambda: load_columns(project_id))
+        self.stdout.write(f'{"values_list -> NumPy":<22} {load * 1000:10.1f} мс')
+        columns = load_columns(project_id)
+        for metric, params in PARAMS.items():
+            compute = self.measure(options['repeat'], lambda: METRICS[metric](columns, **params))
+            get_response_cache().clear()
+            project_analytics(project_id, metric, **params)
+            cached = self.measure(options['repeat'], lambda: project_analytics(project_id, metric, **params))
+            line = f'{metric:<22} расчёт {compute * 1000:8.1f} мс  из кэша {cached * 1000:8.1f} мс'
+            if options['naive']:
+                naive = self.measure(1, lambda: NAIVE[metric](project_id, **params))
+                line += f'  построчно {naive * 1000:10.1f} мс  x{naive / (load + compute):.0f}'
+            self.stdout.write(line)
+
+    @staticmethod
+    def measure(repeat, func):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - started)
+        return statistics.median(timings)
+
+    def seed(self, total):
+        if connection.vendor != 'postgresql':
+            raise CommandError('Генерация рассчитана на PostgreSQL.')
+        started = time.monotonic()
+        owner = UserAPI.objects.create(email=f'bench-analytics-{time.time_ns()}@example.com', name='Bench',
+                                       surname='Analytics', password='!')
+        project = Project.objects.create(title='Bench analytics', content='', owner=owner)
+        statuses = [choice for choice, _ in Task._meta.get_field('status').choices]
+        priorities = [choice for choice, _ in Task._meta.get_field('priority').choices]
+        now = timezone.now()
+        created = 0
+        while created < total:
+            size = min(self.batch_size, total - created)
+            Task.objects.bulk_create([
+                Task(title=f'Task {i}', content='', project=project, status=random.choice(statuses),
+                     priority=random.choice(priorities),
+                     deadline=now - timedelta(days=random.randint(-60, 365)) if random.random() < 0.5 else None)
+                for i in range(created, created + size)
+            ])
+            created += size
+            self.stdout.write(f'\r{created}/{total}', ending='')
+        # auto_now_add проставил одинаковое время: разносим created_at/updated_at по году.
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "UPDATE main_task SET created_at = now() - random() * interval '365 days', "
+                "updated_at = now() - random() * interval '365 days' WHERE project_id = %s", [project.id]
+            )
+            cursor.execute("UPDATE main_task SET updated_at = created_at WHERE project_id = %s "
+                           "AND updated_at < created_at", [project.id])
+            cursor.execute('ANALYZE main_task')
+        call_command('rebuild_project_stats', project=[project.id], stdout=self.stdout)
+        self.stdout.write(f'\nСгенерировано {total} задач за {time.monotonic() - started:.1f} с')
+        return project.id
+
+
+# Построчный расчёт для сравнения: так метрики считались бы по выводу TaskSerializer.
+
+def _serialized_tasks(project_id):
+    for task in TaskSerializer(Task.objects.filter(project_id=project_id), many=True).data:
+        yield {
+            'created': datetime.fromisoformat(task['created_at']),
+            'updated': datetime.fromisoformat(task['updated_at']),
+            'deadline': task['deadline'] and datetime.fromisoformat(task['deadline']),
+            'done': task['status'] == 'Done',
+            'priority': task['priority'],
+        }
+
+
+def _week_bounds(weeks):
+    today = timezone.localdate()
+    monday = today - timedelta(days=today.weekday())
+    tz = timezone.get_current_timezone()
+    return [datetime.combine(monday - timedelta(weeks=weeks - 1 - i), datetime.min.time(), tzinfo=tz)
+            for i in range(weeks + 1)]
+
+
+def naive_cycle_time(project_id, weeks, percentiles):
+    since = _week_bounds(weeks)[0]
+    hours = sorted((task['updated'] - task['created']).total_seconds() / 3600
+                   for task in _serialized_tasks(project_id) if task['done'] and task['updated'] >= since)
+    return {p: hours[min(len(hours) - 1, int(len(hours) * p / 100))] for p in percentiles} if hours else {}
+
+
+def naive_throughput(project_id, weeks):
+    bounds = _week_bounds(weeks)
+    counts = [[0, 0] for _ in range(weeks)]
+    for task in _serialized_tasks(project_id):
+        for i in range(weeks):
+            if bounds[i] <= task['created'] < bounds[i + 1]:
+                counts[i][0] += 1
+            if task['done'] and bounds[i] <= task['updated'] < bounds[i + 1]:
+                counts[i][1] += 1
+    return counts
+
+
+def naive_burndown(project_id, days):
+    now = timezone.now()
+    points = [min(now, now - timedelta(days=days - 1 - i)) for i in range(days)]
+    tasks = list(_serialized_tasks(project_id))
+    result = []
+    for point in points:
+        scope = remaining = overdue = 0
+        for task in tasks:
+            if task['created'] > point:
+                continue
+            scope += 1
+            if task['done'] and task['updated'] <= point:
+                continue
+            remaining += 1
+            if task['deadline'] and task['deadline'] <= point:
+                overdue += 1
+        result.append((scope, remaining, overdue))
+    return result
+
+
+NAIVE = {
+    'cycle_time': naive_cycle_time,
+    'throughput': naive_throughput,
+    'burndown': naive_burndown,
+}
@@ -0,0 +1,69 @@
+import asyncio
+import time
+
+from channels.db import database_sync_to_async
+from channels.layers import InMemoryChannelLayer
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from main.models import ChannelGroupMembership, ChannelMessage
+from main.notifications.layers import PostgresChannelLayer
+
+
+class Command(BaseCommand):
+    """
+    Пропускная способность group_send/receive PostgresChannelLayer и InMemoryChannelLayer.
+
+    Пример:
+        python manage.py bench_channel_layer --messages 5000 --receivers 10
+    """
+
+    help = 'Сравнение пропускной способности channel layer на PostgreSQL и в памяти.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--messages', type=int, default=2000, help='Сообщений group_send.')
+        parser.add_argument('--receivers', type=int, default=5, help='Каналов в группе.')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('Бенчмарк рассчитан на PostgreSQL.')
+
+        layers = {
+            'InMemoryChannelLayer': InMemoryChannelLayer(capacity=options['messages']),
+            'PostgresChannelLayer': PostgresChannelLayer(capacity=options['messages']),
+        }
+        for name, layer in layers.items():
+            elapsed = asyncio.run(self.run(layer, options['messages'], options['receivers']))
+            delivered = options['messages'] * options['receivers']
+            self.stdout.write(
+                f'{name}: {options["messages"]} group_send, {delivered} доставок за {elapsed:.2f} с '
+                f'({options["messages"] / elapsed:.0f} group_send/с, {delivered / elapsed:.0f} сообщений/с)'
+            )
+
+    async def run(self, layer, messages, receivers):
+        # Свои группа и префикс каналов: flush() стёр бы сообщения и группы живых
+        # пользователей, если бенчмарк запущен на рабочей базе.
+        group = f'bench{time.time_ns()}'
+        await database_sync_to_async(self.cleanup)(group)
+        try:
+            channels = [await layer.new_channel(prefix=f'{group}.') for _ in range(receivers)]
+            for channel in channels:
+                await layer.group_add(group, channel)
+
+            async def drain(channel):
+                for _ in range(messages):
+                    await layer.receive(channel)
+
+            started = time.perf_counter()
+            consumers = [asyncio.create_task(drain(channel)) for channel in channels]
+            for i in range(messages):
+                await layer.group_send(group, {'type': 'send_notification', 'message': {'message': i}})
+            await asyncio.gather(*consumers)
+            return time.perf_counter() - started
+        finally:
+            await database_sync_to_async(self.cleanup)(group)
+
+    @staticmethod
+    def cleanup(group):
+        ChannelMessage.objects.filter(channel__startswith=f'{group}.').delete()
+        ChannelGroupMembership.objects.filter(group=group).delete()
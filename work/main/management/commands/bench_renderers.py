@@ -0,0 +1,62 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from main.models import Task
+from main.renderers import MessagePackRenderer, ORJSONRenderer
+from main.serializers import TaskSerializer
+
+
+class Command(BaseCommand):
+    """
+    Микробенчмарк рендеринга вывода TaskSerializer разными рендерерами.
+
+    Пример:
+        python manage.py bench_renderers --tasks 10000 --repeat 20
+
+    Задачи создаются в памяти, база данных не нужна.
+    """
+
+    help = 'Сравнение JSONRenderer, ORJSONRenderer и MessagePackRenderer на выводе TaskSerializer.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=5000)
+        parser.add_argument('--repeat', type=int, default=10)
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        tasks = [
+            Task(
+                id=i,
+                title=f'Task {i}',
+                content='Описание задачи ' * 10,
+                project_id=1,
+                assigned_to_id=i % 50 or None,
+                status='In Progress',
+                priority='Medium',
+                created_at=now - timedelta(minutes=i),
+                updated_at=now,
+                deadline=now + timedelta(days=i % 30),
+            )
+            for i in range(1, options['tasks'] + 1)
+        ]
+        data = {'next': None, 'previous': None, 'results': TaskSerializer(tasks, many=True).data}
+
+        renderers = {
+            'JSONRenderer (json)': JSONRenderer(),
+            'ORJSONRenderer': ORJSONRenderer(),
+            'MessagePackRenderer': MessagePackRenderer(),
+        }
+        baseline = None
+        for name, renderer in renderers.items():
+            started = time.perf_counter()
+            for _ in range(options['repeat']):
+                payload = renderer.render(data)
+            elapsed = (time.perf_counter() - started) / options['repeat'] * 1000
+            baseline = baseline or elapsed
+            self.stdout.write(
+                f'{name:<22} {elapsed:8.2f} мс/ответ  {len(payload) / 1024:8.1f} КиБ  x{baseline / elapsed:.1f}'
+            )
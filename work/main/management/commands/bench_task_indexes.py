@@ -0,0 +1,147 @@
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from main.models import Project, ProjectParticipant, Task, UserAPI
+from main.pagination import KeysetPagination
+
+
+class Command(BaseCommand):
+    """
+    Сравнение планов запросов фильтрации задач с индексами и без них.
+
+    Пример:
+        python manage.py bench_task_indexes --seed 1000000
+
+    Для каждого запроса, который строят TaskFilter, ProjectTaskFilterView,
+    ProjectDateRangeFilterView, profile_view и TaskFilterView, печатается
+    EXPLAIN ANALYZE дважды: с индексами из 0002_task_filter_indexes и с
+    запрещёнными индексными сканированиями (как до миграции). Последний
+    запрос — глубокая страница KeysetPagination (курсор на середине my_tasks):
+    в плане с индексами должен быть Index Cond по created_at, а не BitmapOr.
+    """
+
+    help = 'EXPLAIN ANALYZE запросов фильтрации задач с индексами и без них.'
+
+    batch_size = 10000
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Сколько задач сгенерировать перед замером (например, 1000000).')
+        parser.add_argument('--projects', type=int, default=200)
+        parser.add_argument('--users', type=int, default=500)
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('Бенчмарк рассчитан на PostgreSQL.')
+
+        if options['seed']:
+            self.seed(options['seed'], options['projects'], options['users'])
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+
+        project = Project.objects.order_by('-id').first()
+        user = UserAPI.objects.order_by('-id').first()
+        if project is None or user is None:
+            raise CommandError('Нет данных: запустите команду с --seed.')
+
+        now = timezone.now()
+        month_ago = now - timedelta(days=30)
+        queries = {
+            'TaskFilter status+priority+created_at': Task.objects.filter(
+                status='Dev', priority='High', created_at__gte=month_ago, created_at__lte=now),
+            'TaskFilter assigned_to+status': Task.objects.filter(
+                assigned_to=user, status='In Progress'),
+            'ProjectTaskFilterView created': Task.objects.filter(
+                project_id=project.id, created_at__range=(month_ago, now)).order_by('created_at'),
+            'ProjectTaskFilterView deadline': Task.objects.filter(
+                project_id=project.id, deadline__range=(month_ago, now)).order_by('-deadline'),
+            'ProjectDateRangeFilterView': Project.objects.filter(
+                time_created__range=(month_ago, now)).order_by('time_created'),
+            'profile_view': Project.objects.filter(participants=user, status=Project.Status.ACTIVE),
+            'TaskFilterView lower_title+icontains': Task.objects.annotate(lower_title=Lower('title')).filter(
+                title__icontains='task 4242').order_by('lower_title'),
+            'TaskFilterView lower_title': Task.objects.annotate(lower_title=Lower('title')).order_by('lower_title'),
+            'KeysetPagination deep page': self.deep_page(),
+        }
+
+        for name, queryset in queries.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(f'\n=== {name}'))
+            self.stdout.write(self.style.SUCCESS('-- с индексами'))
+            self.stdout.write(self.explain(queryset[:50]))
+            self.stdout.write(self.style.WARNING('-- без индексов'))
+            self.stdout.write(self.explain(queryset[:50], use_indexes=False))
+
+    @staticmethod
+    def deep_page():
+        # Позиция из середины выдачи по убыванию created_at, как у курсора next.
+        middle = Task.objects.order_by('-created_at', '-id').values('created_at', 'id')[Task.objects.count() // 2]
+        pagination = KeysetPagination()
+        pagination.sort_field = 'created_at'
+        cursor = {'v': middle['created_at'].isoformat(), 'i': middle['id']}
+        return Task.objects.filter(pagination.position_filter(cursor, descending=True)).order_by('-created_at', '-id')
+
+    def explain(self, queryset, use_indexes=True):
+        with transaction.atomic():
+            if not use_indexes:
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_indexscan = off')
+                    cursor.execute('SET LOCAL enable_bitmapscan = off')
+                    cursor.execute('SET LOCAL enable_indexonlyscan = off')
+            return queryset.explain(analyze=True, buffers=True)
+
+    def seed(self, total, projects_count, users_count):
+        started = time.monotonic()
+        users = UserAPI.objects.bulk_create([
+            UserAPI(email=f'bench-{time.time_ns()}-{i}@example.com', name='Bench', surname=str(i),
+                    password='!')
+            for i in range(users_count)
+        ])
+        owner = users[0]
+        projects = Project.objects.bulk_create([
+            Project(title=f'Bench project {i}', content='', owner=owner,
+                    status=random.choice(Project.Status.values))
+            for i in range(projects_count)
+        ])
+        ProjectParticipant.objects.bulk_create([
+            ProjectParticipant(project=project, user=user)
+            for project in projects
+            for user in random.sample(users, min(len(users), 20))
+        ], ignore_conflicts=True)
+
+        statuses = [choice for choice, _ in Task._meta.get_field('status').choices]
+        priorities = [choice for choice, _ in Task._meta.get_field('priority').choices]
+        now = timezone.now()
+        created = 0
+        while created < total:
+            size = min(self.batch_size, total - created)
+            batch = []
+            for i in range(created, created + size):
+                batch.append(Task(
+                    title=f'Task {i}',
+                    content='',
+                    project=random.choice(projects),
+                    assigned_to=random.choice(users) if random.random() < 0.8 else None,
+                    status=random.choice(statuses),
+                    priority=random.choice(priorities),
+                    deadline=now - timedelta(days=random.randint(-60, 365)) if random.random() < 0.5 else None,
+                ))
+            Task.objects.bulk_create(batch)
+            created += size
+            self.stdout.write(f'\r{created}/{total}', ending='')
+        # auto_now_add проставил одинаковое время: разносим created_at/updated_at по году.
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "UPDATE main_task SET created_at = now() - random() * interval '365 days' "
+                "WHERE project_id = ANY(%s)", [[project.id for project in projects]]
+            )
+            cursor.execute(
+                "UPDATE main_task SET updated_at = created_at + random() * interval '30 days' "
+                "WHERE project_id = ANY(%s)", [[project.id for project in projects]]
+            )
+        self.stdout.write(f'\nСгенерировано {total} задач за {time.monotonic() - started:.1f} с')
@@ -0,0 +1,31 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import F
+from django.utils import timezone
+
+from main.models import Notification
+from main.notifications.inbox import inbox_setting
+
+
+class Command(BaseCommand):
+    """
+    Очистка входящих уведомлений.
+
+    Удаляет прочитанные уведомления старше NOTIFICATIONS['INBOX_RETENTION_DAYS']
+    и у каждого пользователя оставляет не больше INBOX_MAX_PER_USER последних
+    (по seq). Номера seq не переиспользуются, поэтому повтор по last_seq
+    после очистки продолжает работать.
+    Пример (cron раз в сутки):
+        python manage.py compact_notifications
+    """
+
+    help = 'Удаление старых и лишних уведомлений из входящих.'
+
+    def handle(self, *args, **options):
+        threshold = timezone.now() - timedelta(days=inbox_setting('INBOX_RETENTION_DAYS'))
+        expired, _ = Notification.objects.filter(read_at__isnull=False, created_at__lt=threshold).delete()
+        overflow, _ = Notification.objects.filter(
+            user__notification_counter__last_seq__gte=F('seq') + inbox_setting('INBOX_MAX_PER_USER')
+        ).delete()
+        self.stdout.write(f'Удалено прочитанных: {expired}, сверх лимита: {overflow}')
@@ -0,0 +1,275 @@
+import asyncio
+import itertools
+import json
+import statistics
+import time
+from datetime import timedelta
+from urllib.parse import urlencode
+
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from main import urls as main_urls
+from main.models import Comment, Project, ProjectParticipant, Task
+
+
+class Command(BaseCommand):
+    """
+    Нагрузочный тест маршрутов main/urls.py внутри процесса.
+
+    Пример:
+        python manage.py seed_data --tasks 1000000 --comments 3000000
+        python manage.py loadtest --requests 500 --concurrency 16 --output release.json
+        python manage.py loadtest --compare release.json
+
+    Запросы отправляются напрямую в ASGI-приложение work.asgi.application
+    (без сети и без сервера), --concurrency корутин параллельно. Маршруты
+    замеряются по очереди, для каждого печатаются p50/p95/p99 задержки,
+    пропускная способность и число ответов с ошибкой. Авторизация — JWT
+    участника самого большого проекта, поэтому сначала нужен seed_data.
+    Удаляющие маршруты, выход и маршруты для сотрудников пропускаются.
+    """
+
+    help = 'p50/p95/p99 и пропускная способность маршрутов API через ASGI-приложение.'
+
+    # Маршруты, которые нельзя гонять повторно или которые требуют прав сотрудника.
+    skipped = {
+        'project-destroy': 'удаляет проект',
+        'task-destroy': 'удаляет задачу',
+        'remove-participant': 'удаляет участника',
+        'add-participant': 'повтор нарушает уникальность',
+        'unassign_user_from_task': 'повтор возвращает 400',
+        'log-out-user': 'отзывает токен',
+        'response-cache-stats': 'только для сотрудников',
+        'profile-report-list': 'только для сотрудников',
+        'profile-report': 'только для сотрудников',
+        'ws-notifications': 'WebSocket',
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Запросов на маршрут.')
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--warmup', type=int, default=5, help='Незамеряемых запросов на маршрут.')
+        parser.add_argument('--routes', nargs='*', help='Имена маршрутов (по умолчанию все).')
+        parser.add_argument('--password', default='seedpassword123', help='Пароль из seed_data для log-in-user.')
+        parser.add_argument('--output', help='Сохранить результаты в JSON для сравнения релизов.')
+        parser.add_argument('--compare', help='JSON предыдущего прогона: печатать изменение p95.')
+
+    def handle(self, *args, **options):
+        # Импорт здесь: work.asgi настраивает Django при загрузке.
+        from work.asgi import application
+
+        self.application = application
+        self.context = self.build_context(options['password'])
+        scenarios = self.scenarios(self.context)
+
+        names = options['routes'] or self.route_names()
+        unknown = set(names) - set(self.route_names())
+        if unknown:
+            raise CommandError(f"Неизвестные маршруты: {', '.join(sorted(unknown))}")
+
+        baseline = {}
+        if options['compare']:
+            with open(options['compare'], encoding='utf-8') as file:
+                baseline = {(item['route'], item['method']): item for item in json.load(file)}
+
+        results = []
+        self.stdout.write(f"{'маршрут':<34}{'метод':<7}{'p50 мс':>9}{'p95 мс':>9}{'p99 мс':>9}"
+                          f"{'rps':>9}{'ошибки':>8}")
+        for name in names:
+            if name in self.skipped or name not in scenarios:
+                self.stdout.write(self.style.WARNING(
+                    f"{name:<34}пропущен: {self.skipped.get(name, 'нет сценария')}"))
+                continue
+            for method, make_request in scenarios[name]:
+                result = asyncio.run(self.run_route(method, make_request, options))
+                result.update(route=name, method=method)
+                results.append(result)
+                self.stdout.write(self.format_result(result, baseline.get((name, method))))
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                json.dump(results, file, ensure_ascii=False, indent=2)
+            self.stdout.write(f"Результаты сохранены в {options['output']}")
+
+    def route_names(self):
+        return [pattern.name for pattern in main_urls.urlpatterns if pattern.name]
+
+    def build_context(self, password):
+        project_id = Task.objects.order_by('-id').values_list('project_id', flat=True).first()
+        if project_id is None:
+            raise CommandError('Нет данных: сначала запустите seed_data.')
+        project = Project.objects.get(pk=project_id)
+        user = project.owner
+        member_id = (ProjectParticipant.objects.filter(project=project).exclude(user=user)
+                     .values_list('user_id', flat=True).first() or user.id)
+        task = Task.objects.filter(project=project).order_by('-id').first()
+        comment = Comment.objects.filter(task=task, author=user).first()
+        if comment is None:
+            comment = Comment.objects.create(task=task, author=user, content='Load test comment')
+        return {
+            'user': user,
+            'password': password,
+            'token': str(RefreshToken.for_user(user).access_token),
+            'project': project,
+            'member_id': member_id,
+            'task': task,
+            'comment': comment,
+            'counter': itertools.count(),
+        }
+
+    def scenarios(self, ctx):
+        """
+        Сценарии маршрутов: имя -> [(метод, функция, возвращающая (путь, тело))].
+        """
+
+        project_id, task_id = ctx['project'].id, ctx['task'].id
+        today = timezone.now().date()
+        period = {'start_date': (today - timedelta(days=30)).isoformat(), 'end_date': today.isoformat()}
+
+        def get(name, query=None, **kwargs):
+            path = reverse(name, kwargs=kwargs or None)
+            if query:
+                path = f'{path}?{urlencode(query)}'
+            return 'GET', lambda: (path, None)
+
+        def send(method, name, body, **kwargs):
+            path = reverse(name, kwargs=kwargs or None)
+            return method, lambda: (path, body() if callable(body) else body)
+
+        def task_body():
+            return {'title': f"Load test {next(ctx['counter'])}", 'content': 'Text', 'project': project_id,
+                    'status': 'Dev', 'priority': 'Low'}
+
+        return {
+            'project-list-create': [get('project-list-create'),
+                                    send('POST', 'project-list-create', {'title': 'Load test', 'content': 'Text'})],
+            'my-projects': [get('my-projects')],
+            'project-retrieve': [get('project-retrieve', pk=project_id)],
+            'project-update': [send('PATCH', 'project-update', {'content': 'Updated'}, pk=project_id)],
+            'project-tasks': [get('project-tasks', pk=project_id)],
+            'project-stats': [get('project-stats', pk=project_id)],
+            'project-cycle-time': [get('project-cycle-time', pk=project_id)],
+            'project-throughput': [get('project-throughput', pk=project_id)],
+            'project-burndown': [get('project-burndown', pk=project_id)],
+            'update-participant-role': [send('PATCH', 'update-participant-role', {'role': 'Backend'},
+                                             project_id=project_id, user_id=ctx['member_id'])],
+            'task-list-create': [get('task-list-create'), send('POST', 'task-list-create', task_body)],
+            'my-tasks': [get('my-tasks')],
+            'task-retrieve': [get('task-retrieve', pk=task_id)],
+            'task-update': [send('PATCH', 'task-update', {'status': 'In Progress'}, pk=task_id)],
+            'assign_user_to_task': [send('PATCH', 'assign_user_to_task', {'user_id': ctx['user'].id},
+                                         task_id=task_id)],
+            'task-filter': [get('task-filter', {'status': 'Dev', 'ordering': 'lower_title'})],
+            'task-bulk': [send('POST', 'task-bulk', lambda: [task_body() for _ in range(10)])],
+            'sign-up-user': [send('POST', 'sign-up-user', lambda: {
+                'name': 'Load', 'surname': 'Test', 'role': 'Backend', 'password': 'loadtestpassword123',
+                'email': f"loadtest-{time.time_ns()}-{next(ctx['counter'])}@example.com"})],
+            'log-in-user': [send('POST', 'log-in-user', {'email': ctx['user'].email, 'password': ctx['password']})],
+            'profile-view': [get('profile-view')],
+            'comment-list-create': [get('comment-list-create', task_id=task_id),
+                                    send('POST', 'comment-list-create', {'content': 'Load test'}, task_id=task_id)],
+            'comment-detail': [send('PUT', 'comment-detail', {'content': 'Edited'},
+                                    task_id=task_id, pk=ctx['comment'].id)],
+            'filter-symbol': [get('filter-symbol', {'sort_by': 'title'})],
+            'project-task-filter': [get('project-task-filter', period, project_id=project_id)],
+            'project-date-sort': [get('project-date-sort', period)],
+            'project-task-export': [get('project-task-export', {'format': 'ndjson'}, project_id=project_id)],
+            'project-comment-export': [get('project-comment-export', {'format': 'csv'}, project_id=project_id)],
+            'sync': [get('sync')],
+            'notification-list': [get('notification-list')],
+            'notification-mark-read': [send('POST', 'notification-mark-read', {'up_to_seq': 0})],
+        }
+
+    async def run_route(self, method, make_request, options):
+        for _ in range(options['warmup']):
+            await self.request(method, make_request)
+
+        latencies = []
+        errors = 0
+        remaining = iter(range(options['requests']))
+
+        async def worker():
+            nonlocal errors
+            for _ in remaining:
+                started = time.perf_counter()
+                status_code = await self.request(method, make_request)
+                latencies.append(time.perf_counter() - started)
+                if status_code >= 400:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(options['concurrency'])))
+        elapsed = time.perf_counter() - started
+
+        if len(latencies) > 1:
+            percentiles = statistics.quantiles(latencies, n=100, method='inclusive')
+        else:
+            percentiles = latencies * 99
+        return {
+            'requests': len(latencies),
+            'errors': errors,
+            'p50_ms': round(percentiles[49] * 1000, 2),
+            'p95_ms': round(percentiles[94] * 1000, 2),
+            'p99_ms': round(percentiles[98] * 1000, 2),
+            'rps': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        }
+
+    async def request(self, method, make_request):
+        """
+        Один HTTP-запрос к ASGI-приложению; тело ответа читается целиком,
+        включая потоковые выгрузки. Возвращает код ответа.
+        """
+
+        path, body = make_request()
+        path, _, query = path.partition('?')
+        payload = json.dumps(body).encode() if body is not None else b''
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': method,
+            'scheme': 'http',
+            'path': path,
+            'raw_path': path.encode(),
+            'query_string': query.encode(),
+            'root_path': '',
+            'headers': [
+                (b'host', b'localhost'),
+                (b'authorization', f"Bearer {self.context['token']}".encode()),
+                (b'content-type', b'application/json'),
+                (b'content-length', str(len(payload)).encode()),
+            ],
+            'client': ('127.0.0.1', 0),
+            'server': ('localhost', 80),
+        }
+        done = asyncio.Event()
+        response = {}
+
+        async def receive():
+            if not response.get('body_sent'):
+                response['body_sent'] = True
+                return {'type': 'http.request', 'body': payload, 'more_body': False}
+            await done.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                response['status'] = message['status']
+            elif message['type'] == 'http.response.body' and not message.get('more_body'):
+                done.set()
+
+        await self.application(scope, receive, send)
+        done.set()
+        return response.get('status', 500)
+
+    def format_result(self, result, previous):
+        line = (f"{result['route']:<34}{result['method']:<7}{result['p50_ms']:>9.1f}{result['p95_ms']:>9.1f}"
+                f"{result['p99_ms']:>9.1f}{result['rps']:>9.1f}{result['errors']:>8}")
+        if previous and previous['p95_ms']:
+            change = (result['p95_ms'] - previous['p95_ms']) / previous['p95_ms'] * 100
+            style = self.style.ERROR if change > 10 else self.style.SUCCESS if change < -10 else str
+            line += style(f'  p95 {change:+.0f}%')
+        return line
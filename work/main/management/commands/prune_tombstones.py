@@ -0,0 +1,24 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from main.models import Tombstone
+from main.sync import sync_setting
+
+
+class Command(BaseCommand):
+    """
+    Удаление надгробий старше SYNC['TOMBSTONE_RETENTION_DAYS'].
+
+    Клиенты с более старым курсором получают 410 и делают полную синхронизацию.
+    Пример (cron раз в сутки):
+        python manage.py prune_tombstones
+    """
+
+    help = 'Удаление устаревших надгробий дельта-синхронизации.'
+
+    def handle(self, *args, **options):
+        threshold = timezone.now() - timedelta(days=sync_setting('TOMBSTONE_RETENTION_DAYS'))
+        deleted, _ = Tombstone.objects.filter(deleted_at__lt=threshold).delete()
+        self.stdout.write(f'Удалено надгробий: {deleted}')
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from main.models import Project
+from main.stats import rebuild_project_stats
+
+
+class Command(BaseCommand):
+    """
+    Пересчёт счётчиков задач проектов (ProjectStats, ProjectAssigneeStats).
+
+    Миграция 0007_project_stats заполняет счётчики сама; команда нужна после
+    seed_data и массовых изменений задач в обход модели (QuerySet.update()
+    или SQL). Проекты обрабатываются пачками по --batch-size, каждая пачка —
+    отдельная транзакция.
+    Пример:
+        python manage.py rebuild_project_stats
+        python manage.py rebuild_project_stats --project 12 --project 40
+    """
+
+    help = 'Пересчёт денормализованных счётчиков задач проектов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--project', type=int, action='append', dest='projects',
+                            help='ID проекта (можно несколько раз). По умолчанию — все проекты.')
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        project_ids = options['projects'] or list(Project.objects.order_by('id').values_list('id', flat=True))
+        batch_size = options['batch_size']
+        for start in range(0, len(project_ids), batch_size):
+            rebuild_project_stats(project_ids[start:start + batch_size])
+        self.stdout.write(f'Пересчитано проектов: {len(project_ids)}')
@@ -0,0 +1,182 @@
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from main.models import Comment, Project, ProjectParticipant, Task, UserAPI
+
+
+class Command(BaseCommand):
+    """
+    Генерация большого набора данных для нагрузочного тестирования.
+
+    Пример:
+        python manage.py seed_data --users 5000 --projects 1000 --tasks 2000000 --comments 6000000
+
+    Все объекты создаются через bulk_create пачками по --batch-size, сигналы
+    не срабатывают, поэтому в конце счётчики проектов пересчитываются
+    командой rebuild_project_stats. Распределения приближены к реальным: число участников и
+    задач на проект подчиняется закону Парето (немного больших проектов и
+    много маленьких), исполнители и авторы комментариев — участники проекта.
+    При одинаковом --random-seed получается одинаковый набор данных.
+    Все пользователи получают пароль --password, email вида
+    <prefix>-<n>@example.com.
+    """
+
+    help = 'Массовая генерация пользователей, проектов, задач и комментариев.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--projects', type=int, default=200)
+        parser.add_argument('--tasks', type=int, default=100000)
+        parser.add_argument('--comments', type=int, default=300000)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--days', type=int, default=365, help='Глубина истории для created_at.')
+        parser.add_argument('--random-seed', type=int, default=42)
+        parser.add_argument('--prefix', default='seed')
+        parser.add_argument('--password', default='seedpassword123')
+
+    def handle(self, *args, **options):
+        if options['users'] < 1 or options['projects'] < 1:
+            raise CommandError('Нужен хотя бы один пользователь и один проект.')
+        if UserAPI.objects.filter(email__startswith=f"{options['prefix']}-").exists():
+            raise CommandError(f"Пользователи с префиксом '{options['prefix']}' уже есть: укажите другой --prefix.")
+
+        self.random = random.Random(options['random_seed'])
+        self.batch_size = options['batch_size']
+        started = time.monotonic()
+
+        users = self.create_users(options['users'], options['prefix'], options['password'])
+        projects, members = self.create_projects(options['projects'], users)
+        task_ids = self.create_tasks(options['tasks'], projects, members)
+        self.create_comments(options['comments'], task_ids, members)
+        if connection.vendor == 'postgresql':
+            self.spread_timestamps(projects, options['days'])
+        call_command('rebuild_project_stats', project=[project.id for project in projects], stdout=self.stdout)
+
+        self.stdout.write(self.style.SUCCESS(f'Готово за {time.monotonic() - started:.1f} с'))
+
+    def pareto(self, alpha, limit):
+        return min(limit, int(self.random.paretovariate(alpha)))
+
+    def create_users(self, count, prefix, password):
+        # Хэш считается один раз: PBKDF2 на каждого пользователя занял бы минуты.
+        password = make_password(password)
+        roles = [role for role, _ in UserAPI.ROLE_CHOICES]
+        users = []
+        for start in range(0, count, self.batch_size):
+            users += UserAPI.objects.bulk_create([
+                UserAPI(email=f'{prefix}-{i}@example.com', name=f'User{i}', surname='Seed',
+                        role=self.random.choice(roles), password=password)
+                for i in range(start, min(count, start + self.batch_size))
+            ])
+        self.stdout.write(f'Пользователи: {len(users)}')
+        return users
+
+    def create_projects(self, count, users):
+        statuses = Project.Status.values
+        projects = []
+        for start in range(0, count, self.batch_size):
+            projects += Project.objects.bulk_create([
+                Project(title=f'Project {i}', content=f'Seeded project {i}', owner=self.random.choice(users),
+                        status=self.random.choices(statuses, weights=[9, 1])[0])
+                for i in range(start, min(count, start + self.batch_size))
+            ])
+
+        roles = [role for role, _ in ProjectParticipant.ROLE_CHOICES if role != 'owner']
+        members = {}
+        participants = []
+        for project in projects:
+            size = self.pareto(1.2, len(users)) * 3
+            team = {project.owner_id} | {user.id for user in self.random.sample(users, min(size, len(users)))}
+            members[project.id] = sorted(team)
+            participants += [
+                ProjectParticipant(project_id=project.id, user_id=user_id,
+                                   role='owner' if user_id == project.owner_id else self.random.choice(roles))
+                for user_id in members[project.id]
+            ]
+        ProjectParticipant.objects.bulk_create(participants, batch_size=self.batch_size)
+        self.stdout.write(f'Проекты: {len(projects)}, участники: {len(participants)}')
+        return projects, members
+
+    def create_tasks(self, count, projects, members):
+        statuses = [choice for choice, _ in Task._meta.get_field('status').choices]
+        priorities = [choice for choice, _ in Task._meta.get_field('priority').choices]
+        weights = [self.random.paretovariate(1.1) for _ in projects]
+        now = timezone.now()
+        task_ids = []
+        for start in range(0, count, self.batch_size):
+            batch = []
+            for i, project in enumerate(self.random.choices(projects, weights=weights,
+                                                            k=min(self.batch_size, count - start)), start):
+                team = members[project.id]
+                batch.append(Task(
+                    title=f'Task {i}',
+                    content='Seeded task description',
+                    project_id=project.id,
+                    assigned_to_id=self.random.choice(team) if self.random.random() < 0.8 else None,
+                    testing_responsible_id=self.random.choice(team) if self.random.random() < 0.3 else None,
+                    status=self.random.choice(statuses),
+                    priority=self.random.choice(priorities),
+                    deadline=(now + timedelta(days=self.random.randint(-60, 180))
+                              if self.random.random() < 0.5 else None),
+                ))
+            with transaction.atomic():
+                task_ids += [(task.id, task.project_id) for task in Task.objects.bulk_create(batch)]
+            self.stdout.write(f'\rЗадачи: {len(task_ids)}/{count}', ending='')
+        self.stdout.write('')
+        return task_ids
+
+    def create_comments(self, count, task_ids, members):
+        if not task_ids:
+            return
+        created = 0
+        while created < count:
+            size = min(self.batch_size, count - created)
+            batch = []
+            # Обсуждения тоже неравномерны: к части задач комментарии пишут пачками.
+            for task_id, project_id in self.random.choices(task_ids, k=size):
+                batch.append(Comment(task_id=task_id, author_id=self.random.choice(members[project_id]),
+                                     content=f'Seeded comment {created + len(batch)}'))
+            with transaction.atomic():
+                Comment.objects.bulk_create(batch)
+            created += size
+            self.stdout.write(f'\rКомментарии: {created}/{count}', ending='')
+        self.stdout.write('')
+
+    def spread_timestamps(self, projects, days):
+        # auto_now_add проставил одинаковое время: разносим даты по истории (как bench_task_indexes).
+        project_ids = [project.id for project in projects]
+        interval = f'{days} days'
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "UPDATE main_project SET time_created = now() - random() * %s::interval, "
+                "time_updated = now() - random() * interval '7 days' WHERE id = ANY(%s)",
+                [interval, project_ids],
+            )
+            cursor.execute(
+                "UPDATE main_task SET created_at = now() - random() * %s::interval WHERE project_id = ANY(%s)",
+                [interval, project_ids],
+            )
+            cursor.execute(
+                "UPDATE main_task SET updated_at = LEAST(now(), created_at + random() * interval '30 days') "
+                "WHERE project_id = ANY(%s)",
+                [project_ids],
+            )
+            cursor.execute(
+                "UPDATE main_comment c SET created_at = LEAST(now(), t.created_at + random() * interval '14 days') "
+                "FROM main_task t WHERE c.task_id = t.id AND t.project_id = ANY(%s)",
+                [project_ids],
+            )
+            cursor.execute(
+                "UPDATE main_comment c SET updated_at = c.created_at "
+                "FROM main_task t WHERE c.task_id = t.id AND t.project_id = ANY(%s)",
+                [project_ids],
+            )
+            cursor.execute('ANALYZE')
+        self.stdout.write('Даты разнесены по истории, статистика обновлена (ANALYZE).')
@@ -0,0 +1,89 @@
+from django.conf import settings
+from django.core.cache import caches
+
+from .models import ProjectParticipant
+
+# Роль хранится в кэше строкой, отсутствие участия — пустой строкой.
+_NOT_A_MEMBER = ''
+# Роли определяют доступ, поэтому кэш общий для всех воркеров (CACHES['shared']):
+# invalidate_membership() сразу действует везде.
+MEMBERSHIP_CACHE_ALIAS = 'shared'
+
+
+def get_membership_cache():
+    return caches[MEMBERSHIP_CACHE_ALIAS]
+
+
+def _cache_key(project_id, user_id):
+    return f'membership:{project_id}:{user_id}'
+
+
+def _request_cache(request):
+    http_request = getattr(request, '_request', request)
+    if not hasattr(http_request, '_membership_cache'):
+        http_request._membership_cache = {}
+    return http_request._membership_cache
+
+
+def get_participant_roles(request, project_ids):
+    """
+    Роли текущего пользователя в проектах: {project_id: role или None}.
+
+    Порядок поиска: кэш текущего запроса, затем общий для воркеров кэш
+    CACHES['shared'] с коротким TTL (MEMBERSHIP_CACHE_TIMEOUT), затем один
+    запрос к ProjectParticipant по уникальному индексу (user, project) для
+    всех оставшихся проектов.
+    """
+
+    cache = get_membership_cache()
+    user_id = request.user.pk
+    local = _request_cache(request)
+    roles = {project_id: local[project_id] for project_id in project_ids if project_id in local}
+
+    missing = [project_id for project_id in project_ids if project_id not in roles]
+    if missing:
+        cached = cache.get_many([_cache_key(project_id, user_id) for project_id in missing])
+        for project_id in missing:
+            role = cached.get(_cache_key(project_id, user_id))
+            if role is not None:
+                roles[project_id] = role or None
+
+    missing = [project_id for project_id in project_ids if project_id not in roles]
+    if missing:
+        found = dict(
+            ProjectParticipant.objects.filter(user_id=user_id, project_id__in=missing)
+            .values_list('project_id', 'role')
+        )
+        cache.set_many(
+            {_cache_key(project_id, user_id): found.get(project_id, _NOT_A_MEMBER) for project_id in missing},
+            getattr(settings, 'MEMBERSHIP_CACHE_TIMEOUT', 30),
+        )
+        for project_id in missing:
+            roles[project_id] = found.get(project_id)
+
+    local.update(roles)
+    return roles
+
+
+def get_participant_role(request, project_id):
+    return get_participant_roles(request, [project_id])[project_id]
+
+
+def is_participant(request, project_id):
+    """
+    Является ли текущий пользователь участником проекта.
+    """
+
+    return get_participant_role(request, project_id) is not None
+
+
+def member_project_ids(request, project_ids):
+    """
+    Подмножество project_ids, в которых участвует текущий пользователь.
+    """
+
+    return {project_id for project_id, role in get_participant_roles(request, project_ids).items() if role}
+
+
+def invalidate_membership(project_id, user_id):
+    get_membership_cache().delete(_cache_key(project_id, user_id))
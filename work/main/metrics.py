@@ -0,0 +1,173 @@
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+# Фазы текущего запроса: {'db': сек, 'db_queries': n, 'serialize': сек, 'notify': сек}.
+# None вне запроса, поэтому фоновые потоки и команды ничего не пишут.
+_timings = contextvars.ContextVar('request_timings', default=None)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200)
+
+
+def start_request():
+    return _timings.set({})
+
+
+def finish_request(token):
+    timings = _timings.get()
+    _timings.reset(token)
+    return timings or {}
+
+
+def record(phase, value):
+    timings = _timings.get()
+    if timings is not None:
+        timings[phase] = timings.get(phase, 0) + value
+
+
+@contextmanager
+def timed(phase):
+    """
+    Добавляет время блока к фазе текущего запроса. Вложенные блоки одной фазы
+    не суммируются дважды.
+    """
+
+    timings = _timings.get()
+    if timings is None or timings.get(f'_{phase}_active'):
+        yield
+        return
+    timings[f'_{phase}_active'] = True
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[f'_{phase}_active'] = False
+        record(phase, time.perf_counter() - started)
+
+
+def query_timer(execute, sql, params, many, context):
+    """
+    Обёртка connection.execute_wrapper(): число и время запросов к базе.
+    """
+
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        record('db', time.perf_counter() - started)
+        record('db_queries', 1)
+
+
+class Histogram:
+    """
+    Гистограмма в формате Prometheus: накопительные бакеты, сумма и количество по меткам.
+    """
+
+    def __init__(self, name, documentation, buckets, labelnames):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self.labelnames = tuple(labelnames)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def collect(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            series = {key: (list(counts), total, count) for key, (counts, total, count) in self._series.items()}
+        for key, (counts, total, count) in sorted(series.items()):
+            labels = ','.join(f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = '+Inf' if bound == float('inf') else repr(float(bound))
+                lines.append(f'{self.name}_bucket{{{labels},le="{le}"}} {cumulative}')
+            lines.append(f'{self.name}_sum{{{labels}}} {total}')
+            lines.append(f'{self.name}_count{{{labels}}} {count}')
+        return lines
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+
+class Counter:
+    def __init__(self, name, documentation, labelnames):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def collect(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} counter']
+        with self._lock:
+            values = dict(self._values)
+        for key, value in sorted(values.items()):
+            labels = ','.join(f'{name}="{_escape(v)}"' for name, v in zip(self.labelnames, key))
+            lines.append(f'{self.name}{{{labels}}} {value}')
+        return lines
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+REQUESTS = Counter('api_requests_total', 'Запросы по представлению, методу и статусу.',
+                   ['view', 'method', 'status'])
+REQUEST_DURATION = Histogram('api_request_duration_seconds', 'Полное время обработки запроса.',
+                             DURATION_BUCKETS, ['view', 'method'])
+DB_DURATION = Histogram('api_request_db_duration_seconds', 'Время запросов к базе за запрос.',
+                        DURATION_BUCKETS, ['view', 'method'])
+DB_QUERIES = Histogram('api_request_db_queries', 'Число запросов к базе за запрос.',
+                       QUERY_COUNT_BUCKETS, ['view', 'method'])
+SERIALIZE_DURATION = Histogram('api_request_serialize_duration_seconds',
+                               'Время сериализации и рендеринга ответа.', DURATION_BUCKETS, ['view', 'method'])
+NOTIFY_DURATION = Histogram('api_request_notify_duration_seconds',
+                            'Время постановки уведомлений в отправку.', DURATION_BUCKETS, ['view', 'method'])
+
+REGISTRY = [REQUESTS, REQUEST_DURATION, DB_DURATION, DB_QUERIES, SERIALIZE_DURATION, NOTIFY_DURATION]
+
+
+def observe_request(view, method, status, duration, timings):
+    REQUESTS.inc(view=view, method=method, status=status)
+    REQUEST_DURATION.observe(duration, view=view, method=method)
+    DB_DURATION.observe(timings.get('db', 0), view=view, method=method)
+    DB_QUERIES.observe(timings.get('db_queries', 0), view=view, method=method)
+    SERIALIZE_DURATION.observe(timings.get('serialize', 0), view=view, method=method)
+    NOTIFY_DURATION.observe(timings.get('notify', 0), view=view, method=method)
+
+
+def render_metrics():
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.collect())
+    return '\n'.join(lines) + '\n'
+
+
+def clear_metrics():
+    for metric in REGISTRY:
+        metric.clear()
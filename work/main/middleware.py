@@ -0,0 +1,76 @@
+import time
+from contextlib import ExitStack
+
+from django.db import connections
+
+from . import metrics, profiling
+
+
+class PerformanceMiddleware:
+    """
+    Метрики производительности каждого запроса.
+
+    Для представления (имя маршрута из main/urls.py) считаются полное время,
+    число и время запросов к базе, время сериализации/рендеринга и время
+    постановки уведомлений. Результат уходит в заголовок Server-Timing и в
+    гистограммы процесса, которые отдаёт /metrics в формате Prometheus.
+    Должен стоять первым в MIDDLEWARE, чтобы полное время включало остальные.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = metrics.start_request()
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics.query_timer))
+                response = self.get_response(request)
+        finally:
+            timings = metrics.finish_request(token)
+        duration = time.perf_counter() - started
+
+        match = request.resolver_match
+        view = match.view_name if match is not None else 'unmatched'
+        metrics.observe_request(view, request.method, response.status_code, duration, timings)
+        response['Server-Timing'] = self.server_timing(duration, timings)
+        return response
+
+    @staticmethod
+    def server_timing(duration, timings):
+        parts = [f'total;dur={duration * 1000:.1f}']
+        parts.append(f'db;dur={timings.get("db", 0) * 1000:.1f};desc="{timings.get("db_queries", 0)} queries"')
+        for phase in ('serialize', 'notify'):
+            if phase in timings:
+                parts.append(f'{phase};dur={timings[phase] * 1000:.1f}')
+        return ', '.join(parts)
+
+
+class ProfilingMiddleware:
+    """
+    Профилирование отдельного запроса по требованию сотрудника.
+
+    Включается заголовком X-Profile: 1 или параметром ?_profile=1 и только
+    для сотрудников, не чаще PROFILING['RATE_LIMIT'] раз за RATE_PERIOD
+    секунд. Запрос выполняется под cProfile с записью SQL, отчёт сохраняется
+    (main.profiling), его имя возвращается в заголовке X-Profile-Report.
+    Без флага запрос проходит дальше без дополнительной работы.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not profiling.is_requested(request) or not profiling.is_staff(request):
+            return self.get_response(request)
+        if not profiling.acquire_slot():
+            response = self.get_response(request)
+            response['X-Profile-Report'] = 'rate-limited'
+            return response
+
+        profile = profiling.RequestProfile(request)
+        response = profile.run(self.get_response)
+        response['X-Profile-Report'] = profile.save()
+        return response
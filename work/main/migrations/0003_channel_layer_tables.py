@@ -0,0 +1,47 @@
+# Generated by Django 4.2 on 2026-10-17 03:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0002_task_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChannelGroupMembership',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('group', models.CharField(max_length=100)),
+                ('channel', models.CharField(max_length=100)),
+                ('expires_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ChannelMessage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('channel', models.CharField(max_length=100)),
+                ('message', models.JSONField()),
+                ('expires_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='channelmessage',
+            index=models.Index(fields=['channel', 'id'], name='channelmessage_channel_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='channelmessage',
+            index=models.Index(fields=['expires_at'], name='channelmessage_expires_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='channelgroupmembership',
+            index=models.Index(fields=['expires_at'], name='channelgroup_expires_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='channelgroupmembership',
+            unique_together={('group', 'channel')},
+        ),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 4.2 on 2026-10-17 04:33
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+BACKFILL_BATCH_SIZE = 500
+STATUS_FIELDS = {'Grooming': 'status_grooming', 'In Progress': 'status_in_progress', 'Dev': 'status_dev',
+                 'Done': 'status_done'}
+PRIORITY_FIELDS = {'Low': 'priority_low', 'Medium': 'priority_medium', 'High': 'priority_high'}
+
+
+def backfill_project_stats(apps, schema_editor):
+    # Счётчики существующих проектов считаются сразу, пачками по BACKFILL_BATCH_SIZE проектов.
+    db = schema_editor.connection.alias
+    Project = apps.get_model('main', 'Project')
+    Task = apps.get_model('main', 'Task')
+    ProjectStats = apps.get_model('main', 'ProjectStats')
+    ProjectAssigneeStats = apps.get_model('main', 'ProjectAssigneeStats')
+
+    aggregates = {'tasks_total': models.Count('id')}
+    aggregates.update({name: models.Count('id', filter=models.Q(status=value)) for value, name in STATUS_FIELDS.items()})
+    aggregates.update({name: models.Count('id', filter=models.Q(priority=value))
+                       for value, name in PRIORITY_FIELDS.items()})
+
+    project_ids = list(Project.objects.using(db).order_by('id').values_list('id', flat=True))
+    for start in range(0, len(project_ids), BACKFILL_BATCH_SIZE):
+        batch = project_ids[start:start + BACKFILL_BATCH_SIZE]
+        tasks = Task.objects.using(db).filter(project_id__in=batch).order_by()
+        by_project = {row.pop('project_id'): row for row in tasks.values('project_id').annotate(**aggregates)}
+        ProjectStats.objects.using(db).bulk_create([
+            ProjectStats(project_id=project_id, **by_project.get(project_id, {})) for project_id in batch
+        ])
+        ProjectAssigneeStats.objects.using(db).bulk_create([
+            ProjectAssigneeStats(project_id=row.pop('project_id'), user_id=row.pop('assigned_to_id'), **row)
+            for row in tasks.filter(assigned_to__isnull=False).values('project_id', 'assigned_to_id').annotate(
+                **aggregates)
+        ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0006_my_tasks_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectStats',
+            fields=[
+                ('tasks_total', models.IntegerField(default=0)),
+                ('status_grooming', models.IntegerField(default=0)),
+                ('status_in_progress', models.IntegerField(default=0)),
+                ('status_dev', models.IntegerField(default=0)),
+                ('status_done', models.IntegerField(default=0)),
+                ('priority_low', models.IntegerField(default=0)),
+                ('priority_medium', models.IntegerField(default=0)),
+                ('priority_high', models.IntegerField(default=0)),
+                ('project', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='main.project')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='ProjectAssigneeStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tasks_total', models.IntegerField(default=0)),
+                ('status_grooming', models.IntegerField(default=0)),
+                ('status_in_progress', models.IntegerField(default=0)),
+                ('status_dev', models.IntegerField(default=0)),
+                ('status_done', models.IntegerField(default=0)),
+                ('priority_low', models.IntegerField(default=0)),
+                ('priority_medium', models.IntegerField(default=0)),
+                ('priority_high', models.IntegerField(default=0)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='assignee_stats', to='main.project')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='assignee_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='projectassigneestats',
+            constraint=models.UniqueConstraint(fields=('project', 'user'), name='assignee_stats_project_user_uniq'),
+        ),
+        migrations.RunPython(backfill_project_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.2 on 2026-10-17 05:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0008_shared_cache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CacheGeneration',
+            fields=[
+                ('scope', models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ('generation', models.CharField(max_length=32)),
+            ],
+        ),
+    ]
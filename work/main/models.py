@@ -1,6 +1,9 @@
 from django.contrib.auth.base_user import AbstractBaseUser, BaseUserManager
 from django.contrib.auth.models import PermissionsMixin
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db import models, router, transaction
+from django.db.models import Q
+from django.db.models.functions import Lower, Upper
 from django.conf import settings
 
 
@@ -18,6 +21,12 @@ class Project(models.Model):
                                           related_name='projects')
     owner = models.ForeignKey("main.UserAPI", on_delete=models.CASCADE, related_name="owned_projects")
 
+    class Meta:
+        indexes = [
+            # ProjectDateRangeFilterView и курсорная пагинация по (time_created, id).
+            models.Index(fields=['time_created', 'id'], name='project_created_idx'),
+        ]
+
     def __str__(self):
         return self.title
 
@@ -37,9 +46,15 @@ class ProjectParticipant(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='project_participations')
     project = models.ForeignKey('Project', on_delete=models.CASCADE, related_name='participants_project')
     role = models.CharField(max_length=50, choices=ROLE_CHOICES, default='developer')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ('user', 'project')
+        indexes = [
+            # Дельта-синхронизация: изменения участников проектов пользователя.
+            models.Index(fields=['project', 'updated_at'], name='participant_updated_idx'),
+        ]
 
 
 class Task(models.Model):
@@ -76,6 +91,56 @@ class Task(models.Model):
         verbose_name='Ответственный за тестирование'
     )
 
+    class Meta:
+        indexes = [
+            # Задачи проекта: диапазоны и сортировка ProjectTaskFilterView, ProjectTaskListView.
+            models.Index(fields=['project', 'created_at', 'id'], name='task_project_created_idx'),
+            models.Index(fields=['project', 'updated_at', 'id'], name='task_project_updated_idx'),
+            models.Index(fields=['project', 'deadline', 'id'], name='task_project_deadline_idx',
+                         condition=Q(deadline__isnull=False)),
+            # my_tasks: задачи всех проектов пользователя (project_id IN (...)) по убыванию created_at.
+            models.Index(fields=['created_at', 'id'], name='task_created_idx'),
+            # TaskFilter: равенство по status/priority/assigned_to плюс диапазон по created_at.
+            models.Index(fields=['status', 'priority', 'created_at'], name='task_status_priority_idx'),
+            models.Index(fields=['assigned_to', 'status', 'created_at'], name='task_assignee_status_idx',
+                         condition=Q(assigned_to__isnull=False)),
+            # TaskFilterView: сортировка ?ordering=lower_title (keyset по lower(title), id)
+            # и поиск title__icontains (UPPER(title) LIKE ...).
+            models.Index(Lower('title'), 'id', name='task_lower_title_idx'),
+            GinIndex(OpClass(Upper('title'), name='gin_trgm_ops'), name='task_title_trgm_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Значения на момент загрузки: обработчики сигналов сравнивают их с
+        # сохраняемыми (например, при переносе задачи в другой проект).
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def save(self, *args, **kwargs):
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        # Счётчики ProjectStats обновляются в post_save: задача и счётчики
+        # фиксируются одной транзакцией.
+        with transaction.atomic(using=using, savepoint=False):
+            super().save(*args, **kwargs)
+        # Следующее сохранение сравнивается уже с записанными значениями.
+        self._remember_loaded_values()
+
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using=using, fields=fields)
+        self._remember_loaded_values(fields)
+
+    def _remember_loaded_values(self, fields=None):
+        deferred = self.get_deferred_fields()
+        loaded = getattr(self, '_loaded_values', {}) if fields is not None else {}
+        loaded.update({
+            field.attname: getattr(self, field.attname)
+            for field in self._meta.concrete_fields
+            if field.attname not in deferred and (fields is None or field.name in fields or field.attname in fields)
+        })
+        self._loaded_values = loaded
+
     def __str__(self):
         return self.title
 
@@ -87,6 +152,12 @@ class Comment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['task', 'created_at', 'id'], name='comment_task_created_idx'),
+            models.Index(fields=['task', 'updated_at'], name='comment_task_updated_idx'),
+        ]
+
     def __str__(self):
         return f"Comment by {self.author} on {self.task}"
 
@@ -146,3 +217,149 @@ class UserAPI(AbstractBaseUser, PermissionsMixin):
 
     def natural_key(self):
         return (self.email,)
+
+
+class ChannelMessage(models.Model):
+    """
+    Сообщение PostgresChannelLayer, ожидающее получения каналом.
+    """
+
+    channel = models.CharField(max_length=100)
+    message = models.JSONField()
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['channel', 'id'], name='channelmessage_channel_idx'),
+            models.Index(fields=['expires_at'], name='channelmessage_expires_idx'),
+        ]
+
+
+class ChannelGroupMembership(models.Model):
+    """
+    Членство канала в группе PostgresChannelLayer, действует до expires_at.
+    """
+
+    group = models.CharField(max_length=100)
+    channel = models.CharField(max_length=100)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ('group', 'channel')
+        indexes = [
+            models.Index(fields=['expires_at'], name='channelgroup_expires_idx'),
+        ]
+
+
+class Tombstone(models.Model):
+    """
+    Запись об удалённом объекте для дельта-синхронизации (/sync/).
+
+    Видна участникам project_id, а если задан user_id — ещё и этому
+    пользователю: так удалённый из проекта участник узнаёт об исключении,
+    а участники удалённого проекта — об удалении.
+    """
+
+    class Kind(models.TextChoices):
+        PROJECT = 'project', 'Project'
+        TASK = 'task', 'Task'
+        COMMENT = 'comment', 'Comment'
+        MEMBERSHIP = 'membership', 'Membership'
+
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    object_id = models.BigIntegerField()
+    project_id = models.BigIntegerField()
+    user_id = models.BigIntegerField(null=True, blank=True)
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['project_id', 'deleted_at'], name='tombstone_project_idx'),
+            models.Index(fields=['user_id', 'deleted_at'], name='tombstone_user_idx',
+                         condition=Q(user_id__isnull=False)),
+            models.Index(fields=['deleted_at'], name='tombstone_deleted_idx'),
+        ]
+
+
+class CacheGeneration(models.Model):
+    """
+    Текущее поколение области кэша ответов (main.cache). Хранится в базе, общей
+    для всех воркеров, поэтому invalidate() в одном процессе сбрасывает ответы,
+    закэшированные в остальных.
+    """
+
+    scope = models.CharField(max_length=100, primary_key=True)
+    generation = models.CharField(max_length=32)
+
+
+class NotificationCounter(models.Model):
+    """
+    Последний выданный номер уведомления пользователя.
+    """
+
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True,
+                                related_name='notification_counter')
+    last_seq = models.BigIntegerField(default=0)
+
+
+class Notification(models.Model):
+    """
+    Сохранённое WebSocket-уведомление. seq монотонно растёт в пределах пользователя,
+    поэтому пропущенное за время отключения читается диапазоном (user, seq > last_seq).
+    """
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='notifications')
+    seq = models.BigIntegerField()
+    payload = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    read_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'seq'], name='notification_user_seq_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'seq'], name='notification_unread_idx', condition=Q(read_at__isnull=True)),
+            models.Index(fields=['created_at'], name='notification_created_idx'),
+        ]
+
+
+class TaskCounters(models.Model):
+    """
+    Счётчики задач по статусам и приоритетам (main.stats).
+    """
+
+    tasks_total = models.IntegerField(default=0)
+    status_grooming = models.IntegerField(default=0)
+    status_in_progress = models.IntegerField(default=0)
+    status_dev = models.IntegerField(default=0)
+    status_done = models.IntegerField(default=0)
+    priority_low = models.IntegerField(default=0)
+    priority_medium = models.IntegerField(default=0)
+    priority_high = models.IntegerField(default=0)
+
+    class Meta:
+        abstract = True
+
+
+class ProjectStats(TaskCounters):
+    """
+    Денормализованные счётчики задач проекта для /projects/<id>/stats/.
+    Обновляются в транзакции сохранения или удаления задачи.
+    """
+
+    project = models.OneToOneField(Project, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+
+
+class ProjectAssigneeStats(TaskCounters):
+    """
+    Счётчики задач проекта по исполнителю.
+    """
+
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='assignee_stats')
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='assignee_stats')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['project', 'user'], name='assignee_stats_project_user_uniq'),
+        ]
@@ -0,0 +1,218 @@
+import atexit
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from .dispatcher import dispatcher
+from .inbox import store_notifications
+from .presence import is_online
+
+logger = logging.getLogger(__name__)
+
+
+def notification_setting(name):
+    defaults = {'COALESCE_WINDOW': 2.0, 'DIGEST_INTERVAL': 300, 'DIGEST_SIZE': 20, 'STORE_RETRIES': 3}
+    return getattr(settings, 'NOTIFICATIONS', {}).get(name, defaults[name])
+
+
+class NotificationCoalescer:
+    """
+    Склейка уведомлений перед отправкой в channel layer.
+
+    Каждое уведомление сначала сохраняется во входящие (main.notifications.inbox)
+    и получает seq, а склейка и дайджесты решают только, как оно уйдёт в
+    открытые сокеты: повтор при переподключении видит все уведомления сразу.
+    Сохранение идёт в фоновом потоке склейки, а не в потоке запроса: add_many()
+    только ставит уведомления в очередь. Неудачная запись повторяется
+    STORE_RETRIES раз, а при остановке процесса очередь дописывается во входящие.
+
+    Уведомления с одним ключом (пользователь, задача), пришедшие в течение
+    COALESCE_WINDOW секунд после первого, уходят одним событием с последним
+    текстом и счётчиком. Если у пользователя нет открытых сокетов (presence),
+    событие не отправляется сразу, а копится в дайджесте, который раз в
+    DIGEST_INTERVAL секунд уходит одним сообщением на пользователя.
+    Нулевые значения отключают соответствующую стадию.
+    """
+
+    def __init__(self, sink=None):
+        self.sink = sink
+        self._incoming = []
+        self._storing = 0
+        self._pending = {}
+        self._digests = {}
+        self._next_digest_at = None
+        self._condition = threading.Condition()
+        self._thread = None
+        self._pid = None
+
+    def add(self, user_id, message, task_id=None):
+        self.add_many([(user_id, message, task_id)])
+
+    def add_many(self, notifications):
+        """
+        Ставит уведомления [(user_id, message, task_id), ...] в очередь: фоновый
+        поток сохранит их во входящие одной пачкой и передаст в живую доставку.
+        """
+
+        self._ensure_started()
+        with self._condition:
+            self._incoming.extend(notifications)
+            self._condition.notify()
+
+    def _store_incoming(self):
+        """
+        Сохраняет очередь add_many() во входящие и передаёт уведомления в склейку.
+        """
+
+        with self._condition:
+            notifications, self._incoming = self._incoming, []
+            if not notifications:
+                return
+            self._storing += 1
+        try:
+            payloads = self._store(notifications)
+            self._coalesce(notifications, payloads)
+        finally:
+            with self._condition:
+                self._storing -= 1
+                self._condition.notify_all()
+
+    def _coalesce(self, notifications, payloads):
+        if notification_setting('COALESCE_WINDOW') <= 0:
+            self._deliver([((user_id, task_id), [payload])
+                           for (user_id, _, task_id), payload in zip(notifications, payloads)])
+            return
+
+        with self._condition:
+            for (user_id, _, task_id), payload in zip(notifications, payloads):
+                entry = self._pending.get((user_id, task_id))
+                if entry is None:
+                    deadline = time.monotonic() + notification_setting('COALESCE_WINDOW')
+                    self._pending[(user_id, task_id)] = (deadline, [payload])
+                    self._condition.notify()
+                else:
+                    entry[1].append(payload)
+
+    @staticmethod
+    def _store(notifications):
+        batch = [(f"user_{user_id}", {"type": "send_notification", "message": {"message": message}})
+                 for user_id, message, _ in notifications]
+        retries = notification_setting('STORE_RETRIES')
+        for attempt in range(retries + 1):
+            try:
+                close_old_connections()
+                batch = store_notifications(batch)
+                break
+            except Exception:
+                if attempt == retries:
+                    # Живая доставка важнее: уведомление уйдёт без seq.
+                    logger.exception("Не удалось сохранить уведомления во входящие")
+                else:
+                    time.sleep(0.1 * 2 ** attempt)
+        return [event["message"] for _, event in batch]
+
+    def flush(self):
+        """
+        Немедленно сохраняет очередь и отправляет всё накопленное, включая дайджесты.
+        """
+
+        self._store_incoming()
+        with self._condition:
+            # Пачку, которую сейчас сохраняет фоновый поток, тоже дожидаемся.
+            self._condition.wait_for(lambda: not self._storing)
+            ready, self._pending = list(self._pending.items()), {}
+        self._deliver([(key, messages) for key, (_, messages) in ready])
+        self._send_digests(force=True)
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._condition:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            if self._pid != os.getpid():
+                self._incoming, self._storing, self._pending, self._digests = [], 0, {}, {}
+                atexit.register(self._store_incoming)
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='notification-coalescer', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                now = time.monotonic()
+                due = [key for key, (deadline, _) in self._pending.items() if deadline <= now]
+                ready = [(key, self._pending.pop(key)[1]) for key in due]
+                if not ready and not self._incoming:
+                    deadlines = [deadline for deadline, _ in self._pending.values()]
+                    if self._next_digest_at is not None:
+                        deadlines.append(self._next_digest_at)
+                    self._condition.wait(min(deadlines) - now if deadlines else None)
+            try:
+                self._store_incoming()
+                # Присутствие читается из общего кэша в базе.
+                close_old_connections()
+                self._deliver(ready)
+                self._send_digests()
+            except Exception:
+                logger.exception("Ошибка при склейке уведомлений")
+
+    def _deliver(self, ready):
+        digest_enabled = notification_setting('DIGEST_INTERVAL') > 0
+        for (user_id, task_id), payloads in ready:
+            if digest_enabled and not is_online(user_id):
+                self._add_to_digest(user_id, payloads)
+                continue
+            if len(payloads) == 1:
+                payload = payloads[0]
+            else:
+                payload = {
+                    "message": payloads[-1]["message"],
+                    "count": len(payloads),
+                    "task": task_id,
+                    "messages": [item["message"] for item in payloads[-notification_setting('DIGEST_SIZE'):]],
+                }
+                if "seq" in payloads[-1]:
+                    # Клиент сверяет повтор по seq последнего склеенного уведомления.
+                    payload["seq"] = payloads[-1]["seq"]
+            self._emit(f"user_{user_id}", {"type": "send_notification", "message": payload})
+
+    def _emit(self, group, event):
+        (self.sink or dispatcher.enqueue)(group, event)
+
+    def _add_to_digest(self, user_id, payloads):
+        # Дайджест — только живая доставка: все уведомления уже лежат во входящих.
+        self._ensure_started()
+        size = notification_setting('DIGEST_SIZE')
+        with self._condition:
+            count, kept, seq = self._digests.get(user_id, (0, [], None))
+            seqs = [payload["seq"] for payload in payloads if "seq" in payload]
+            if seqs:
+                seq = max(seqs + ([seq] if seq is not None else []))
+            self._digests[user_id] = (count + len(payloads), (kept + payloads)[-size:], seq)
+            if self._next_digest_at is None:
+                self._next_digest_at = time.monotonic() + notification_setting('DIGEST_INTERVAL')
+                self._condition.notify()
+
+    def _send_digests(self, force=False):
+        with self._condition:
+            if not force and (self._next_digest_at is None or self._next_digest_at > time.monotonic()):
+                return
+            digests, self._digests, self._next_digest_at = self._digests, {}, None
+        for user_id, (count, payloads, seq) in digests.items():
+            message = {
+                "message": f"Пропущено уведомлений: {count}.",
+                "digest": True,
+                "count": count,
+                "messages": [payload["message"] for payload in payloads],
+            }
+            if seq is not None:
+                message["seq"] = seq
+            self._emit(f"user_{user_id}", {"type": "send_notification", "message": message})
+
+
+coalescer = NotificationCoalescer()
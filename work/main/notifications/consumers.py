@@ -1,33 +1,129 @@
-
 import json
+from urllib.parse import parse_qs
+
+from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
 
+from main.models import ProjectParticipant
+
+from .inbox import inbox_setting, missed_notifications
+from .presence import user_connected, user_disconnected
+
 
 class NotificationsConsumer(AsyncWebsocketConsumer):
+    """
+    Личные уведомления пользователя и живая лента проектов.
+
+    Пользователь определяется по JWT при рукопожатии (JWTAuthMiddleware);
+    неаутентифицированное соединение закрывается с кодом 4401. Сокет всегда
+    состоит в группе user_<id>. Ленты проектов подключаются сообщениями
+    {"action": "subscribe", "project": <id>} и {"action": "unsubscribe", "project": <id>},
+    подписаться можно только на проект, в котором пользователь участвует.
+    События задач и комментариев рассылаются в группу project_<id> одним
+    group_send на всех зрителей доски.
+
+    Личные уведомления нумеруются (message.seq). Клиент, переподключаясь с
+    ?last_seq=<n>, сразу получает пропущенные уведомления из входящих. Если их
+    больше REPLAY_LIMIT, после них приходит {"type": "replay_truncated"}, и
+    остальное нужно дочитать через /api/v1/notifications/. Уведомление,
+    пришедшее во время повтора, может прийти дважды: клиент сверяет seq.
+    """
+
+    max_subscriptions = 50
+    close_unauthenticated = 4401
+    close_forbidden = 4403
+
     async def connect(self):
-        try:
-            self.user_id = self.scope['url_route']['kwargs']['user_id']
-            self.group_name = f"user_{self.user_id}"
-
-            await self.channel_layer.group_add(
-                self.group_name,
-                self.channel_name
-            )
-            await self.accept()
-            print(f"WebSocket подключён: user_id={self.user_id}")
-        except KeyError as e:
-            print(f"Ошибка: {e}")
-            await self.close()
+        user = self.scope.get('user')
+        if user is None or not user.is_authenticated:
+            await self.close(code=self.close_unauthenticated)
+            return
+
+        url_user_id = self.scope['url_route']['kwargs'].get('user_id')
+        if url_user_id is not None and int(url_user_id) != user.pk:
+            await self.close(code=self.close_forbidden)
+            return
+
+        self.user_id = user.pk
+        self.group_name = f"user_{self.user_id}"
+        self.projects = set()
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await database_sync_to_async(user_connected)(self.user_id)
+        await self.accept()
+        await self.replay()
 
     async def disconnect(self, close_code):
-        await self.channel_layer.group_discard(
-            self.group_name,
-            self.channel_name
-        )
+        if not hasattr(self, 'group_name'):
+            return
+        await database_sync_to_async(user_disconnected)(self.user_id)
+        await self.channel_layer.group_discard(self.group_name, self.channel_name)
+        for project_id in self.projects:
+            await self.channel_layer.group_discard(f"project_{project_id}", self.channel_name)
+
+    async def receive(self, text_data=None, bytes_data=None):
+        try:
+            data = json.loads(text_data or '')
+            action = data['action']
+            project_id = int(data['project'])
+        except (ValueError, KeyError, TypeError):
+            await self.send_json({'type': 'error', 'error': 'Expected {"action": ..., "project": <id>}.'})
+            return
+
+        if action == 'subscribe':
+            await self.subscribe(project_id)
+        elif action == 'unsubscribe':
+            await self.unsubscribe(project_id)
+            await self.send_json({'type': 'unsubscribed', 'project': project_id})
+        else:
+            await self.send_json({'type': 'error', 'error': f'Unknown action: {action}.'})
+
+    async def subscribe(self, project_id):
+        if project_id not in self.projects:
+            if len(self.projects) >= self.max_subscriptions:
+                await self.send_json({'type': 'error', 'project': project_id, 'error': 'Too many subscriptions.'})
+                return
+            if not await self.is_participant(project_id):
+                await self.send_json({'type': 'error', 'project': project_id,
+                                      'error': 'You are not a participant of this project.'})
+                return
+            await self.channel_layer.group_add(f"project_{project_id}", self.channel_name)
+            self.projects.add(project_id)
+        await self.send_json({'type': 'subscribed', 'project': project_id})
+
+    async def unsubscribe(self, project_id):
+        if project_id in self.projects:
+            self.projects.discard(project_id)
+            await self.channel_layer.group_discard(f"project_{project_id}", self.channel_name)
+
+    async def replay(self):
+        try:
+            last_seq = int(parse_qs(self.scope.get('query_string', b'').decode('latin-1'))['last_seq'][0])
+        except (KeyError, ValueError):
+            return
+        limit = inbox_setting('REPLAY_LIMIT')
+        missed = await database_sync_to_async(missed_notifications)(self.user_id, last_seq, limit + 1)
+        for payload in missed[:limit]:
+            await self.send_json({'message': payload})
+        if len(missed) > limit:
+            await self.send_json({'type': 'replay_truncated', 'seq': missed[limit - 1]['seq']})
+
+    @database_sync_to_async
+    def is_participant(self, project_id):
+        return ProjectParticipant.objects.filter(project_id=project_id, user_id=self.user_id).exists()
+
+    async def send_json(self, content):
+        await self.send(text_data=json.dumps(content))
+
+    # Обработчики событий channel layer
 
     async def send_notification(self, event):
         message = event.get('message', 'No message provided')
-        print(f"Отправка сообщения: {message}")
-        await self.send(text_data=json.dumps({
-            'message': message
-        }))
+        await self.send_json({'message': message})
+
+    async def project_event(self, event):
+        await self.send_json({'type': event['event'], 'project': event['project'], 'data': event['data']})
+
+    async def membership_revoked(self, event):
+        # Исключённый из проекта участник перестаёт получать его ленту.
+        await self.unsubscribe(event['project'])
+        await self.send_json({'type': 'membership_revoked', 'project': event['project']})
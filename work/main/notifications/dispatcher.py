@@ -0,0 +1,92 @@
+import asyncio
+import logging
+import os
+import queue
+import threading
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationDispatcher:
+    """
+    Фоновая отправка уведомлений в channel layer (outbox).
+
+    Представления только кладут событие в очередь, а фоновый поток забирает
+    события пачками до batch_size и отправляет их через group_send. Личные
+    уведомления к этому моменту уже сохранены во входящие (NotificationCoalescer).
+    Время ответа HTTP-запроса не зависит от задержки channel layer, а ошибки
+    отправки пишутся в лог и не влияют на запрос.
+    """
+
+    def __init__(self, batch_size=None, max_queue_size=None):
+        options = getattr(settings, 'NOTIFICATIONS', {})
+        self.batch_size = batch_size or options.get('BATCH_SIZE', 100)
+        self.max_queue_size = max_queue_size or options.get('QUEUE_SIZE', 10000)
+        self.queue = queue.Queue(maxsize=self.max_queue_size)
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def enqueue(self, group, event):
+        self._ensure_started()
+        try:
+            self.queue.put_nowait((group, event))
+        except queue.Full:
+            logger.warning("Очередь уведомлений переполнена, событие для %s отброшено", group)
+
+    def flush(self):
+        """
+        Ждёт, пока все поставленные в очередь события будут отправлены.
+        """
+
+        self.queue.join()
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            if self._pid != os.getpid():
+                # После fork воркера поток родителя не наследуется.
+                self.queue = queue.Queue(maxsize=self.max_queue_size)
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='notification-dispatcher', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                async_to_sync(self._send_batch)(batch)
+            except Exception:
+                logger.exception("Ошибка при отправке пачки уведомлений")
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    def _next_batch(self):
+        batch = [self.queue.get()]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    async def _send_batch(self, batch):
+        channel_layer = get_channel_layer()
+        results = await asyncio.gather(
+            *(channel_layer.group_send(group, event) for group, event in batch),
+            return_exceptions=True,
+        )
+        for (group, _), result in zip(batch, results):
+            if isinstance(result, Exception):
+                logger.error("Ошибка при отправке уведомления в %s: %s", group, result)
+
+
+dispatcher = NotificationDispatcher()
@@ -0,0 +1,63 @@
+from django.conf import settings
+from django.db import transaction
+
+from main.models import Notification, NotificationCounter
+
+
+def inbox_setting(name):
+    defaults = {'REPLAY_LIMIT': 500, 'INBOX_RETENTION_DAYS': 30, 'INBOX_MAX_PER_USER': 1000}
+    return getattr(settings, 'NOTIFICATIONS', {}).get(name, defaults[name])
+
+
+def _user_id(group):
+    prefix, _, user_id = group.partition('_')
+    return int(user_id) if prefix == 'user' and user_id.isdigit() else None
+
+
+def store_notifications(batch):
+    """
+    Сохраняет личные уведомления пачки и проставляет им seq.
+
+    Номера выдаются под блокировкой строк NotificationCounter, по одному
+    UPDATE на пачку, поэтому число запросов не зависит от размера пачки.
+    Возвращает пачку, в которой у сохранённых событий в message есть seq.
+    """
+
+    stored = [
+        (index, _user_id(group))
+        for index, (group, event) in enumerate(batch)
+        if event.get('type') == 'send_notification' and _user_id(group) is not None
+    ]
+    if not stored:
+        return batch
+
+    user_ids = {user_id for _, user_id in stored}
+    batch = list(batch)
+    with transaction.atomic():
+        NotificationCounter.objects.bulk_create(
+            [NotificationCounter(user_id=user_id) for user_id in user_ids], ignore_conflicts=True
+        )
+        counters = NotificationCounter.objects.select_for_update().in_bulk(user_ids)
+        notifications = []
+        for index, user_id in stored:
+            counter = counters[user_id]
+            counter.last_seq += 1
+            group, event = batch[index]
+            payload = dict(event['message'], seq=counter.last_seq)
+            batch[index] = (group, dict(event, message=payload))
+            notifications.append(Notification(user_id=user_id, seq=counter.last_seq, payload=payload))
+        NotificationCounter.objects.bulk_update(counters.values(), ['last_seq'])
+        Notification.objects.bulk_create(notifications)
+    return batch
+
+
+def missed_notifications(user_id, last_seq, limit=None):
+    """
+    Уведомления после last_seq по индексу (user, seq), не больше limit.
+    """
+
+    limit = limit or inbox_setting('REPLAY_LIMIT')
+    return list(
+        Notification.objects.filter(user_id=user_id, seq__gt=last_seq)
+        .order_by('seq').values_list('payload', flat=True)[:limit]
+    )
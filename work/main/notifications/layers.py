@@ -0,0 +1,263 @@
+import asyncio
+import json
+import logging
+import random
+import select
+import string
+import threading
+import time
+from datetime import timedelta
+
+import psycopg2
+from channels.db import database_sync_to_async
+from channels.exceptions import ChannelFull
+from channels.layers import BaseChannelLayer
+from django.db import connection, connections
+from django.utils import timezone
+
+from main.models import ChannelGroupMembership, ChannelMessage
+
+logger = logging.getLogger(__name__)
+
+
+class PostgresChannelLayer(BaseChannelLayer):
+    """
+    Channel layer поверх PostgreSQL: таблица сообщений плюс LISTEN/NOTIFY.
+
+    send() и group_send() записывают сообщения в ChannelMessage и одной командой
+    делают pg_notify с именем канала. Каждый процесс держит одно отдельное
+    соединение с LISTEN и будит ожидающие receive() своих каналов. Сообщение
+    забирается DELETE ... RETURNING с SKIP LOCKED, поэтому его получает ровно один
+    читатель. Ожидающий receive() не опрашивает таблицу, а ждёт уведомления.
+    Уведомления, отправленные пока LISTEN-соединения не было, теряются, поэтому
+    после каждого (пере)подключения будятся все ожидающие receive(); на крайний
+    случай receive() перепроверяет таблицу раз в poll_interval секунд.
+
+    Членство в группах хранится в ChannelGroupMembership и истекает через
+    group_expiry секунд, как у InMemoryChannelLayer. Сообщения должны
+    сериализоваться в JSON.
+    """
+
+    extensions = ['groups', 'flush']
+    notify_channel = 'channel_layer'
+
+    def __init__(self, expiry=60, group_expiry=86400, capacity=100, channel_capacity=None,
+                 poll_interval=60.0, cleanup_interval=30, alias='default', **kwargs):
+        super().__init__(expiry=expiry, capacity=capacity, channel_capacity=channel_capacity, **kwargs)
+        self.group_expiry = group_expiry
+        self.poll_interval = poll_interval
+        self.cleanup_interval = cleanup_interval
+        self.alias = alias
+        self._waiters = {}
+        self._waiters_lock = threading.Lock()
+        self._listener = None
+        self._listener_lock = threading.Lock()
+
+    # Channel layer API
+
+    async def send(self, channel, message):
+        assert isinstance(message, dict), "message is not a dict"
+        assert self.valid_channel_name(channel), "Channel name not valid"
+        assert "__asgi_channel__" not in message
+
+        if not await database_sync_to_async(self._send)(channel, message):
+            raise ChannelFull(channel)
+
+    async def receive(self, channel):
+        assert self.valid_channel_name(channel)
+        self._ensure_listener()
+
+        event = asyncio.Event()
+        with self._waiters_lock:
+            self._waiters.setdefault(channel, []).append((asyncio.get_running_loop(), event))
+        try:
+            while True:
+                event.clear()
+                message = await database_sync_to_async(self._pop)(channel)
+                if message is not None:
+                    return message
+                try:
+                    await asyncio.wait_for(event.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            with self._waiters_lock:
+                waiters = self._waiters.get(channel, [])
+                waiters[:] = [waiter for waiter in waiters if waiter[1] is not event]
+                if not waiters:
+                    self._waiters.pop(channel, None)
+
+    async def new_channel(self, prefix="specific."):
+        return "%s.pg!%s" % (
+            prefix,
+            "".join(random.choice(string.ascii_letters) for _ in range(12)),
+        )
+
+    # Groups extension
+
+    async def group_add(self, group, channel):
+        assert self.valid_group_name(group), "Group name not valid"
+        assert self.valid_channel_name(channel), "Channel name not valid"
+        await database_sync_to_async(self._group_add)(group, channel)
+
+    async def group_discard(self, group, channel):
+        assert self.valid_channel_name(channel), "Invalid channel name"
+        assert self.valid_group_name(group), "Invalid group name"
+        await database_sync_to_async(
+            ChannelGroupMembership.objects.filter(group=group, channel=channel).delete
+        )()
+
+    async def group_send(self, group, message):
+        assert isinstance(message, dict), "Message is not a dict"
+        assert self.valid_group_name(group), "Invalid group name"
+        await database_sync_to_async(self._group_send)(group, message)
+
+    # Flush extension
+
+    async def flush(self):
+        await database_sync_to_async(self._flush)()
+
+    async def close(self):
+        pass
+
+    # Работа с базой (синхронно, в потоке database_sync_to_async)
+
+    def _send(self, channel, message):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                WITH inserted AS (
+                    INSERT INTO {ChannelMessage._meta.db_table} (channel, message, expires_at)
+                    SELECT %s, %s::jsonb, %s
+                    WHERE (
+                        SELECT count(*) FROM {ChannelMessage._meta.db_table}
+                        WHERE channel = %s AND expires_at > now()
+                    ) < %s
+                    RETURNING channel
+                )
+                SELECT pg_notify(%s, channel) FROM inserted
+                """,
+                [channel, json.dumps(message), self._expires_at(self.expiry),
+                 channel, self.get_capacity(channel), self.notify_channel],
+            )
+            return cursor.fetchone() is not None
+
+    def _pop(self, channel):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                DELETE FROM {ChannelMessage._meta.db_table}
+                WHERE id = (
+                    SELECT id FROM {ChannelMessage._meta.db_table}
+                    WHERE channel = %s AND expires_at > now()
+                    ORDER BY id
+                    LIMIT 1
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING message
+                """,
+                [channel],
+            )
+            row = cursor.fetchone()
+        if row is None:
+            return None
+        message = row[0]
+        return json.loads(message) if isinstance(message, str) else message
+
+    def _group_add(self, group, channel):
+        ChannelGroupMembership.objects.bulk_create(
+            [ChannelGroupMembership(group=group, channel=channel, expires_at=self._expires_at(self.group_expiry))],
+            update_conflicts=True,
+            unique_fields=['group', 'channel'],
+            update_fields=['expires_at'],
+        )
+
+    def _group_send(self, group, message):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                WITH inserted AS (
+                    INSERT INTO {ChannelMessage._meta.db_table} (channel, message, expires_at)
+                    SELECT channel, %s::jsonb, %s FROM {ChannelGroupMembership._meta.db_table}
+                    WHERE "group" = %s AND expires_at > now()
+                    RETURNING channel
+                )
+                SELECT count(pg_notify(%s, channel)) FROM inserted
+                """,
+                [json.dumps(message), self._expires_at(self.expiry), group, self.notify_channel],
+            )
+
+    def _flush(self):
+        ChannelMessage.objects.all().delete()
+        ChannelGroupMembership.objects.all().delete()
+
+    @staticmethod
+    def _expires_at(seconds):
+        return timezone.now() + timedelta(seconds=seconds)
+
+    # LISTEN-соединение процесса
+
+    def _ensure_listener(self):
+        if self._listener is not None and self._listener.is_alive():
+            return
+        with self._listener_lock:
+            if self._listener is not None and self._listener.is_alive():
+                return
+            self._listener = threading.Thread(target=self._listen, name='channel-layer-listener', daemon=True)
+            self._listener.start()
+
+    def _listen(self):
+        while True:
+            try:
+                self._listen_once()
+            except psycopg2.Error:
+                logger.exception("Соединение LISTEN channel layer потеряно, переподключение")
+                time.sleep(1)
+
+    def _listen_once(self):
+        params = connections[self.alias].get_connection_params()
+        listen_connection = psycopg2.connect(**params)
+        listen_connection.set_session(autocommit=True)
+        try:
+            with listen_connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {self.notify_channel}")
+            # Пока соединения не было, уведомления не доходили: будим всех ожидающих.
+            self._wake_all()
+            cleaned_at = 0
+            while True:
+                if time.monotonic() - cleaned_at > self.cleanup_interval:
+                    self._clean_expired(listen_connection)
+                    cleaned_at = time.monotonic()
+                timeout = max(0, self.cleanup_interval - (time.monotonic() - cleaned_at))
+                if select.select([listen_connection], [], [], timeout) == ([], [], []):
+                    continue
+                listen_connection.poll()
+                channels = {notify.payload for notify in listen_connection.notifies}
+                listen_connection.notifies.clear()
+                self._wake(channels)
+        finally:
+            listen_connection.close()
+
+    def _wake(self, channels):
+        with self._waiters_lock:
+            waiters = [waiter for channel in channels for waiter in self._waiters.get(channel, [])]
+        self._set_events(waiters)
+
+    def _wake_all(self):
+        with self._waiters_lock:
+            waiters = [waiter for channel_waiters in self._waiters.values() for waiter in channel_waiters]
+        self._set_events(waiters)
+
+    @staticmethod
+    def _set_events(waiters):
+        for loop, event in waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # Цикл получателя уже закрыт.
+                pass
+
+    def _clean_expired(self, listen_connection):
+        with listen_connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {ChannelMessage._meta.db_table} WHERE expires_at <= now()")
+            cursor.execute(f"DELETE FROM {ChannelGroupMembership._meta.db_table} WHERE expires_at <= now()")
@@ -0,0 +1,45 @@
+from urllib.parse import parse_qs
+
+from channels.db import database_sync_to_async
+from channels.middleware import BaseMiddleware
+from django.contrib.auth.models import AnonymousUser
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+from main.auth import CachedJWTAuthentication
+
+
+class JWTAuthMiddleware(BaseMiddleware):
+    """
+    Аутентификация WebSocket по JWT при рукопожатии.
+
+    Access-токен берётся из заголовка Authorization: Bearer <token> или, для
+    браузеров, которые не умеют задавать заголовки WebSocket, из ?token=<token>.
+    Проверка та же, что у HTTP (CachedJWTAuthentication). Без токена
+    scope['user'] остаётся как есть, с неверным токеном — AnonymousUser.
+    """
+
+    authentication = CachedJWTAuthentication()
+
+    async def __call__(self, scope, receive, send):
+        raw_token = self.get_raw_token(scope)
+        if raw_token is not None:
+            scope = dict(scope, user=await self.get_user(raw_token))
+        return await super().__call__(scope, receive, send)
+
+    @staticmethod
+    def get_raw_token(scope):
+        for name, value in scope.get('headers', []):
+            if name == b'authorization':
+                parts = value.split()
+                if len(parts) == 2 and parts[0] == b'Bearer':
+                    return parts[1]
+        token = parse_qs(scope.get('query_string', b'').decode('latin-1')).get('token')
+        return token[0].encode('latin-1') if token else None
+
+    @database_sync_to_async
+    def get_user(self, raw_token):
+        try:
+            return self.authentication.get_user(self.authentication.get_validated_token(raw_token))
+        except (InvalidToken, TokenError, AuthenticationFailed):
+            return AnonymousUser()
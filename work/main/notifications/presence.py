@@ -0,0 +1,50 @@
+from django.core.cache import caches
+
+SHARED_CACHE_ALIAS = 'shared'
+
+# Запас на случай, если воркер упал, не уменьшив счётчик: ключ истечёт сам.
+PRESENCE_TIMEOUT = 24 * 60 * 60
+
+
+def get_presence_cache():
+    return caches[SHARED_CACHE_ALIAS]
+
+
+def _key(user_id):
+    return f'presence:{user_id}'
+
+
+def user_connected(user_id):
+    """
+    Учитывает открытый сокет пользователя. Счётчик живёт в общем кэше воркеров
+    (CACHES['shared']), поэтому сокет на одном воркере виден уведомлениям,
+    отправленным с любого другого.
+
+    У DatabaseCache incr — чтение и запись, а не атомарная операция: при
+    одновременных подключениях одного пользователя к разным воркерам счётчик
+    может занизиться, и пользователь раньше времени попадёт в дайджест.
+    Уведомления при этом не теряются — они уже во входящих.
+    """
+
+    cache = get_presence_cache()
+    key = _key(user_id)
+    cache.add(key, 0, PRESENCE_TIMEOUT)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, PRESENCE_TIMEOUT)
+    cache.touch(key, PRESENCE_TIMEOUT)
+
+
+def user_disconnected(user_id):
+    cache = get_presence_cache()
+    key = _key(user_id)
+    try:
+        if cache.decr(key) <= 0:
+            cache.delete(key)
+    except ValueError:
+        pass
+
+
+def is_online(user_id):
+    return bool(get_presence_cache().get(_key(user_id)))
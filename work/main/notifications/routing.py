@@ -2,5 +2,7 @@ from django.urls import re_path
 from main.notifications.consumers import NotificationsConsumer
 
 websocket_urlpatterns = [
+    re_path(r'ws/api/v1/ws/notifications/$', NotificationsConsumer.as_asgi()),
+    # Старый адрес: user_id должен совпадать с пользователем из токена.
     re_path(r'ws/api/v1/ws/notifications/(?P<user_id>\d+)/$', NotificationsConsumer.as_asgi()),
-]
\ No newline at end of file
+]
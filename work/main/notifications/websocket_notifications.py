@@ -1,28 +1,66 @@
-from channels.layers import get_channel_layer
-from asgiref.sync import async_to_sync
+from django.db import transaction
 
+from main.metrics import timed
 
-def send_websocket_notification(user_id, message):
+from .coalescer import coalescer
+from .dispatcher import dispatcher
+
+
+def send_websocket_notification(user_id, message, task_id=None):
     """
     Отправка сообщения через WebSocket конкретному пользователю.
+
+    После фиксации текущей транзакции сообщение ставится в очередь склейки
+    (NotificationCoalescer), фоновый поток которой сохраняет его во входящие;
+    при откате не уходит.
+    Уведомления об одной задаче (task_id), пришедшие подряд, склеиваются в одно.
+    """
+
+    send_websocket_notifications([(user_id, message, task_id)])
+
+
+def send_websocket_notifications(notifications):
+    """
+    Несколько уведомлений [(user_id, message, task_id), ...] с одним сохранением во входящие.
+    """
+
+    notifications = [notification for notification in notifications if notification[0] is not None]
+    if notifications:
+        transaction.on_commit(lambda: _timed_call(coalescer.add_many, notifications))
+
+
+def send_project_event(project_id, event_type, data):
+    """
+    Событие живой ленты проекта (task.created, comment.deleted и т.п.).
+
+    Уходит одним group_send в группу project_<id>, сколько бы клиентов ни
+    смотрели доску. Как и личные уведомления, отправляется после фиксации транзакции.
     """
-    try:
-        print(f"Отправка сообщения для user_{user_id}, message={message}")
-        channel_layer = get_channel_layer()
-        group_name = f"user_{user_id}"
-        print(f"Подключен channel_layer: {channel_layer}")
-        print(f"Определена группа: {group_name}")
-
-
-        async_to_sync(channel_layer.group_send)(
-            group_name,
-            {
-                "type": "send_notification",
-                "message": {
-                    "message": message
-                },
-            },
-        )
-        print("Сообщение успешно отправлено!")
-    except Exception as e:
-        print(f"Ошибка при отправке сообщения через WebSocket: {e}")
+
+    group_name = f"project_{project_id}"
+    event = {
+        "type": "project_event",
+        "event": event_type,
+        "project": project_id,
+        "data": data,
+    }
+    transaction.on_commit(lambda: _timed_call(dispatcher.enqueue, group_name, event))
+
+
+def send_membership_revoked(user_id, project_id):
+    """
+    Отписывает сокеты пользователя от ленты проекта, из которого его исключили.
+    """
+
+    group_name = f"user_{user_id}"
+    event = {
+        "type": "membership_revoked",
+        "project": project_id,
+    }
+    transaction.on_commit(lambda: _timed_call(dispatcher.enqueue, group_name, event))
+
+
+def _timed_call(func, *args):
+    # Время постановки в очередь попадает в метрики запроса (фаза notify).
+    with timed('notify'):
+        func(*args)
@@ -0,0 +1,215 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ParseError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+from .metrics import timed
+
+
+class KeysetPagination(BasePagination):
+    """
+    Курсорная (keyset) пагинация по паре (ключ сортировки, id).
+
+    Ключ сортировки берётся из первого поля order_by() переданного queryset,
+    вторым ключом всегда идёт id в том же направлении, поэтому порядок стабилен
+    даже при совпадающих значениях ключа. Курсор непрозрачен для клиента:
+    это base64 от позиции последней (или первой) записи страницы.
+
+    Страница выбирается условием WHERE (key, id) > (value, id) и LIMIT,
+    поэтому глубокие страницы стоят столько же, сколько первая.
+    Ключ сортировки не должен принимать значение NULL.
+    """
+
+    page_size = api_settings.PAGE_SIZE or 50
+    max_page_size = 500
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.sort_field, self.sort_attr, self.descending = self.get_sort_key(queryset)
+
+        self.cursor = self.decode_cursor(request)
+        reverse = bool(self.cursor and self.cursor['r'])
+        descending = self.descending != reverse
+
+        if self.cursor is not None:
+            queryset = queryset.filter(self.position_filter(self.cursor, descending))
+
+        deferred_names, defer = queryset.query.deferred_loading
+        if (deferred_names and not defer and self.sort_field not in deferred_names
+                and self.sort_field not in queryset.query.annotations):
+            # Значение ключа нужно для курсора: не даём only() его отложить.
+            queryset = queryset.only(*deferred_names, self.sort_field)
+
+        prefix = '-' if descending else ''
+        if self.sort_field == 'id':
+            queryset = queryset.order_by(f'{prefix}id')
+        else:
+            queryset = queryset.order_by(f'{prefix}{self.sort_field}', f'{prefix}id')
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+
+        if results:
+            first, last = results[0], results[-1]
+            self.next_position = self.position(last) if (has_more or reverse) else None
+            self.previous_position = self.position(first) if (self.cursor is not None and (has_more or not reverse)) else None
+        else:
+            self.next_position = self.cursor if reverse else None
+            self.previous_position = self.cursor if (self.cursor is not None and not reverse) else None
+
+        return results
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Курсор страницы из полей next/previous.',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Количество записей на странице.',
+                'schema': {'type': 'integer'},
+            },
+        ]
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_sort_key(self, queryset):
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        if not ordering or not isinstance(ordering[0], str):
+            return 'id', 'id', True
+
+        field_name = ordering[0]
+        descending = field_name.startswith('-')
+        field_name = field_name.lstrip('-')
+        if field_name == 'pk':
+            field_name = 'id'
+
+        if field_name in queryset.query.annotations:
+            return field_name, field_name, descending
+        try:
+            field = queryset.model._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            raise ParseError(f"Ordering by '{field_name}' is not supported.")
+        if not field.concrete:
+            raise ParseError(f"Ordering by '{field_name}' is not supported.")
+        return field.name, field.attname, descending
+
+    def position(self, instance):
+        value = getattr(instance, self.sort_attr)
+        if isinstance(value, (datetime, date)):
+            value = value.isoformat()
+        elif isinstance(value, Decimal):
+            value = str(value)
+        return {'v': value, 'i': instance.pk}
+
+    def position_filter(self, cursor, descending):
+        """
+        Условие (key, id) > (value, id) (< при убывании). Избыточное key >= value
+        даёт планировщику границу индекса (key, id): без него PostgreSQL не
+        превращает OR в Index Cond и читает индекс с начала.
+        """
+
+        lookup = 'lt' if descending else 'gt'
+        if self.sort_field == 'id':
+            return Q(**{f'id__{lookup}': cursor['i']})
+        return Q(**{f'{self.sort_field}__{lookup}e': cursor['v']}) & (
+            Q(**{f'{self.sort_field}__{lookup}': cursor['v']})
+            | Q(**{self.sort_field: cursor['v'], f'id__{lookup}': cursor['i']})
+        )
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            cursor = {'v': cursor['v'], 'i': int(cursor['i']), 'r': bool(cursor.get('r'))}
+        except (TypeError, ValueError, KeyError, UnicodeEncodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(cursor['v'], (str, int, float)):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+    def encode_cursor(self, position, reverse):
+        payload = json.dumps({'v': position['v'], 'i': position['i'], 'r': reverse}, separators=(',', ':'))
+        encoded = base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return self.encode_cursor(self.next_position, reverse=False)
+
+    def get_previous_link(self):
+        if self.previous_position is None:
+            return None
+        return self.encode_cursor(self.previous_position, reverse=True)
+
+
+def paginated_response(request, queryset, serializer_class, **serializer_kwargs):
+    """
+    Пагинированный ответ для функциональных представлений и APIView.
+
+    Если у сериализатора есть prepare_queryset(), он применяется к queryset:
+    связанные объекты загружаются фиксированным числом запросов, а при
+    ?fields=/?exclude= читаются только нужные колонки.
+    """
+
+    prepare_queryset = getattr(serializer_class, 'prepare_queryset', None)
+    if prepare_queryset is not None:
+        queryset = prepare_queryset(queryset, request)
+
+    paginator = KeysetPagination()
+    page = paginator.paginate_queryset(queryset, request)
+    serializer_kwargs.setdefault('context', {'request': request})
+    serializer = serializer_class(page, many=True, **serializer_kwargs)
+    with timed('serialize'):
+        data = serializer.data
+    return paginator.get_paginated_response(data)
@@ -1,9 +1,35 @@
 from rest_framework import permissions
 
+from .auth import MetricsTokenAuthentication
+from .membership import is_participant
 
 
 class IsOwnerOrReadOnly(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         if request.method in permissions.SAFE_METHODS:
             return True
-        return obj.user == request.user
\ No newline at end of file
+        return obj.user == request.user
+
+
+class HasMetricsAccess(permissions.BasePermission):
+    """
+    Доступ к /metrics: сотрудники или сборщик метрик (MetricsTokenAuthentication).
+    """
+
+    def has_permission(self, request, view):
+        if isinstance(request.successful_authenticator, MetricsTokenAuthentication):
+            return True
+        return bool(request.user and request.user.is_staff)
+
+
+class IsProjectParticipant(permissions.BasePermission):
+    """
+    Пользователь — участник проекта из URL (project_id или pk).
+    Проверка идёт до представления, то есть и до кэша ответов.
+    """
+
+    message = 'You are not a participant of this project.'
+
+    def has_permission(self, request, view):
+        project_id = view.kwargs.get('project_id', view.kwargs.get('pk'))
+        return bool(request.user and request.user.is_authenticated and is_participant(request, project_id))
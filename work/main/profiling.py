@@ -0,0 +1,212 @@
+import cProfile
+import io
+import pstats
+import re
+import time
+import uuid
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DatabaseError, connections, transaction
+from django.utils import timezone
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+REPORT_NAME_RE = re.compile(r'^[0-9]{8}T[0-9]{6}-[0-9a-f]{8}\.txt$')
+# Счётчик окна общий для всех воркеров (см. CACHES['shared']).
+RATE_CACHE_ALIAS = 'shared'
+
+
+def profiling_setting(name):
+    defaults = {
+        'HEADER': 'X-Profile',
+        'QUERY_PARAM': '_profile',
+        'RATE_LIMIT': 10,
+        'RATE_PERIOD': 60,
+        'EXPLAIN_THRESHOLD_MS': 50,
+        'TOP_FUNCTIONS': 60,
+        'REPORT_DIR': settings.BASE_DIR / 'profiles',
+        'MAX_REPORTS': 100,
+    }
+    return getattr(settings, 'PROFILING', {}).get(name, defaults[name])
+
+
+def is_requested(request):
+    """
+    Запрошено ли профилирование: заголовок X-Profile или ?_profile=1.
+    Дешёвая проверка, которая выполняется для каждого запроса.
+    """
+
+    header = 'HTTP_' + profiling_setting('HEADER').upper().replace('-', '_')
+    return bool(request.META.get(header) or request.GET.get(profiling_setting('QUERY_PARAM')))
+
+
+def is_staff(request):
+    """
+    Сотрудник ли автор запроса. Проверяет сессию и классы аутентификации DRF,
+    потому что JWT разбирается только внутри представления.
+    """
+
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return user.is_staff
+    drf_request = Request(request)
+    for authentication_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+        try:
+            result = authentication_class().authenticate(drf_request)
+        except APIException:
+            return False
+        if result is not None:
+            return bool(result[0].is_staff)
+    return False
+
+
+def acquire_slot():
+    """
+    Ограничение частоты: не больше RATE_LIMIT профилей за RATE_PERIOD секунд на все процессы.
+
+    Счётчик лежит в общем кэше CACHES['shared']. Его incr у DatabaseCache не
+    атомарен, поэтому одновременные запросы из разных воркеров изредка могут
+    превысить лимит на единицы; для защиты от лавины профилей этого достаточно.
+    """
+
+    cache = caches[RATE_CACHE_ALIAS]
+    period = profiling_setting('RATE_PERIOD')
+    key = f"profiling:window:{int(time.time() // period)}"
+    cache.add(key, 0, period)
+    try:
+        return cache.incr(key) <= profiling_setting('RATE_LIMIT')
+    except ValueError:
+        return False
+
+
+class QueryRecorder:
+    """
+    Обёртка connection.execute_wrapper(): текст, параметры и время каждого запроса.
+    """
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append({
+                'alias': context['connection'].alias,
+                'sql': sql,
+                'params': params,
+                'many': many,
+                'duration': time.perf_counter() - started,
+            })
+
+
+class RequestProfile:
+    """
+    Профиль одного запроса: cProfile на время обработки и все SQL-запросы.
+    После обработки медленные SELECT прогоняются через EXPLAIN ANALYZE
+    (на PostgreSQL; на других базах — обычный EXPLAIN), и отчёт сохраняется
+    в REPORT_DIR, откуда его отдаёт /api/v1/profiles/<имя>/.
+    """
+
+    def __init__(self, request):
+        self.request = request
+        self.profiler = cProfile.Profile()
+        self.recorder = QueryRecorder()
+
+    def run(self, get_response):
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(self.recorder))
+            self.profiler.enable()
+            try:
+                response = get_response(self.request)
+            finally:
+                self.profiler.disable()
+        self.duration = time.perf_counter() - started
+        self.response = response
+        return response
+
+    def explain(self, query):
+        connection = connections[query['alias']]
+        if query['many'] or not query['sql'].lstrip().upper().startswith('SELECT'):
+            return None
+        if connection.vendor == 'postgresql':
+            prefix = connection.ops.explain_query_prefix(analyze=True, buffers=True)
+        else:
+            prefix = connection.ops.explain_query_prefix()
+        try:
+            with transaction.atomic(using=query['alias']), connection.cursor() as cursor:
+                cursor.execute(f"{prefix} {query['sql']}", query['params'])
+                return '\n'.join(' '.join(str(column) for column in row) for row in cursor.fetchall())
+        except DatabaseError as exc:
+            return f"EXPLAIN failed: {exc}"
+
+    def render(self):
+        match = self.request.resolver_match
+        threshold = profiling_setting('EXPLAIN_THRESHOLD_MS') / 1000
+        queries = self.recorder.queries
+        out = io.StringIO()
+        out.write(f"{self.request.method} {self.request.get_full_path()}\n")
+        out.write(f"view: {match.view_name if match else 'unmatched'}\n")
+        out.write(f"status: {self.response.status_code}\n")
+        out.write(f"time: {timezone.now().isoformat()}\n")
+        out.write(f"total: {self.duration * 1000:.1f} ms\n")
+        out.write(f"sql: {len(queries)} queries, {sum(q['duration'] for q in queries) * 1000:.1f} ms\n\n")
+
+        out.write("== Slow queries ==\n")
+        slow = sorted((q for q in queries if q['duration'] >= threshold), key=lambda q: -q['duration'])
+        if not slow:
+            out.write(f"none over {threshold * 1000:.0f} ms\n")
+        for query in slow:
+            out.write(f"\n-- {query['duration'] * 1000:.1f} ms [{query['alias']}]\n{query['sql']}\n")
+            out.write(f"params: {query['params']!r}\n")
+            plan = self.explain(query)
+            if plan:
+                out.write(f"{plan}\n")
+
+        out.write("\n== All queries ==\n")
+        for query in queries:
+            out.write(f"{query['duration'] * 1000:8.1f} ms  {query['sql']}\n")
+
+        out.write("\n== Profile (cumulative) ==\n")
+        stats = pstats.Stats(self.profiler, stream=out)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(profiling_setting('TOP_FUNCTIONS'))
+        return out.getvalue()
+
+    def save(self):
+        directory = Path(profiling_setting('REPORT_DIR'))
+        directory.mkdir(parents=True, exist_ok=True)
+        name = f"{timezone.now():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}.txt"
+        (directory / name).write_text(self.render(), encoding='utf-8')
+        prune_reports()
+        return name
+
+
+def list_reports():
+    directory = Path(profiling_setting('REPORT_DIR'))
+    if not directory.is_dir():
+        return []
+    return sorted((path for path in directory.iterdir() if REPORT_NAME_RE.match(path.name)), reverse=True)
+
+
+def report_path(name):
+    """
+    Путь к отчёту по имени или None. Имя проверяется по шаблону, чтобы из
+    запроса нельзя было выйти за пределы REPORT_DIR.
+    """
+
+    if not REPORT_NAME_RE.match(name):
+        return None
+    path = Path(profiling_setting('REPORT_DIR')) / name
+    return path if path.is_file() else None
+
+
+def prune_reports():
+    for path in list_reports()[profiling_setting('MAX_REPORTS'):]:
+        path.unlink(missing_ok=True)
@@ -0,0 +1,9 @@
+SELECT "main_project"."id", "main_project"."title", "main_project"."content", "main_project"."time_created", "main_project"."time_updated", "main_project"."status", "main_project"."owner_id" FROM "main_project" WHERE "main_project"."id" = ? LIMIT ?
+SELECT "main_userapi"."id", "main_userapi"."password", "main_userapi"."last_login", "main_userapi"."is_superuser", "main_userapi"."email", "main_userapi"."name", "main_userapi"."surname", "main_userapi"."role", "main_userapi"."is_active", "main_userapi"."is_staff", "main_userapi"."avatar" FROM "main_userapi" WHERE "main_userapi"."id" = ? LIMIT ?
+SELECT "main_userapi"."id", "main_userapi"."password", "main_userapi"."last_login", "main_userapi"."is_superuser", "main_userapi"."email", "main_userapi"."name", "main_userapi"."surname", "main_userapi"."role", "main_userapi"."is_active", "main_userapi"."is_staff", "main_userapi"."avatar" FROM "main_userapi" WHERE "main_userapi"."id" = ? LIMIT ?
+INSERT INTO "main_projectparticipant" ("user_id", "project_id", "role", "created_at", "updated_at") VALUES (?, ?, ?, ?, ?) RETURNING "main_projectparticipant"."id"
+DELETE FROM "main_shared_cache" WHERE "cache_key" IN (?)
+INSERT INTO "main_cachegeneration" ("scope", "generation") VALUES (?, ?), (?, ?) ON CONFLICT("scope") DO UPDATE SET "generation" = EXCLUDED."generation"
+UPDATE "main_project" SET "time_updated" = ? WHERE "main_project"."id" IN (?)
+SELECT "main_projectparticipant"."user_id" FROM "main_projectparticipant" WHERE "main_projectparticipant"."project_id" IN (?)
+INSERT INTO "main_cachegeneration" ("scope", "generation") VALUES (?, ?), (?, ?), (?, ?), (?, ?), (?, ?), (?, ?), (?, ?), (?, ?) ON CONFLICT("scope") DO UPDATE SET "generation" = EXCLUDED."generation"
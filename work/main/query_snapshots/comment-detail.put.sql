@@ -0,0 +1,4 @@
+SELECT "main_comment"."id", "main_comment"."task_id", "main_comment"."author_id", "main_comment"."content", "main_comment"."created_at", "main_comment"."updated_at" FROM "main_comment" WHERE ("main_comment"."id" = ? AND "main_comment"."task_id" = ?) LIMIT ?
+SELECT "main_userapi"."id", "main_userapi"."password", "main_userapi"."last_login", "main_userapi"."is_superuser", "main_userapi"."email", "main_userapi"."name", "main_userapi"."surname", "main_userapi"."role", "main_userapi"."is_active", "main_userapi"."is_staff", "main_userapi"."avatar" FROM "main_userapi" WHERE "main_userapi"."id" = ? LIMIT ?
+UPDATE "main_comment" SET "task_id" = ?, "author_id" = ?, "content" = ?, "created_at" = ?, "updated_at" = ? WHERE "main_comment"."id" = ?
+SELECT "main_task"."id", "main_task"."title", "main_task"."content", "main_task"."project_id", "main_task"."assigned_to_id", "main_task"."status", "main_task"."priority", "main_task"."created_at", "main_task"."updated_at", "main_task"."deadline", "main_task"."testing_responsible_id" FROM "main_task" WHERE "main_task"."id" = ? LIMIT ?
@@ -0,0 +1,3 @@
+SELECT COUNT("main_comment"."id") AS "count", MAX("main_comment"."updated_at") AS "updated" FROM "main_comment" WHERE "main_comment"."task_id" = ?
+SELECT "main_task"."id", "main_task"."title", "main_task"."content", "main_task"."project_id", "main_task"."assigned_to_id", "main_task"."status", "main_task"."priority", "main_task"."created_at", "main_task"."updated_at", "main_task"."deadline", "main_task"."testing_responsible_id" FROM "main_task" WHERE "main_task"."id" = ? LIMIT ?
+SELECT "main_comment"."id", "main_comment"."task_id", "main_comment"."author_id", "main_comment"."content", "main_comment"."created_at", "main_comment"."updated_at", "main_userapi"."id", "main_userapi"."password", "main_userapi"."last_login", "main_userapi"."is_superuser", "main_userapi"."email", "main_userapi"."name", "main_userapi"."surname", "main_userapi"."role", "main_userapi"."is_active", "main_userapi"."is_staff", "main_userapi"."avatar" FROM "main_comment" INNER JOIN "main_userapi" ON ("main_comment"."author_id" = "main_userapi"."id") WHERE "main_comment"."task_id" = ? ORDER BY "main_comment"."created_at" ASC, "main_comment"."id" ASC LIMIT ?
@@ -0,0 +1,3 @@
+SELECT "main_task"."id", "main_task"."title", "main_task"."content", "main_task"."project_id", "main_task"."assigned_to_id", "main_task"."status", "main_task"."priority", "main_task"."created_at", "main_task"."updated_at", "main_task"."deadline", "main_task"."testing_responsible_id" FROM "main_task" WHERE "main_task"."id" = ? LIMIT ?
+SELECT "main_task"."id", "main_task"."title", "main_task"."content", "main_task"."project_id", "main_task"."assigned_to_id", "main_task"."status", "main_task"."priority", "main_task"."created_at", "main_task"."updated_at", "main_task"."deadline", "main_task"."testing_responsible_id" FROM "main_task" WHERE "main_task"."id" = ? LIMIT ?
+INSERT INTO "main_comment" ("task_id", "author_id", "content", "created_at", "updated_at") VALUES (?, ?, ?, ?, ?) RETURNING "main_comment"."id"
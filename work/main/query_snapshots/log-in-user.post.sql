@@ -0,0 +1,2 @@
+SELECT "main_userapi"."id", "main_userapi"."password", "main_userapi"."last_login", "main_userapi"."is_superuser", "main_userapi"."email", "main_userapi"."name", "main_userapi"."surname", "main_userapi"."role", "main_userapi"."is_active", "main_userapi"."is_staff", "main_userapi"."avatar" FROM "main_userapi" WHERE "main_userapi"."email" = ? LIMIT ?
+INSERT INTO "token_blacklist_outstandingtoken" ("user_id", "jti", "token", "created_at", "expires_at") VALUES (?, ?, ?, ?, ?) RETURNING "token_blacklist_outstandingtoken"."id"
@@ -0,0 +1,6 @@
+SELECT ? AS "a" FROM "token_blacklist_blacklistedtoken" INNER JOIN "token_blacklist_outstandingtoken" ON ("token_blacklist_blacklistedtoken"."token_id" = "token_blacklist_outstandingtoken"."id") WHERE "token_blacklist_outstandingtoken"."jti" = ? LIMIT ?
+SELECT "token_blacklist_outstandingtoken"."id", "token_blacklist_outstandingtoken"."user_id", "token_blacklist_outstandingtoken"."jti", "token_blacklist_outstandingtoken"."token", "token_blacklist_outstandingtoken"."created_at", "token_blacklist_outstandingtoken"."expires_at" FROM "token_blacklist_outstandingtoken" WHERE "token_blacklist_outstandingtoken"."jti" = ? LIMIT ?
+SELECT "token_blacklist_blacklistedtoken"."id", "token_blacklist_blacklistedtoken"."token_id", "token_blacklist_blacklistedtoken"."blacklisted_at" FROM "token_blacklist_blacklistedtoken" WHERE "token_blacklist_blacklistedtoken"."token_id" = ? LIMIT ?
+SAVEPOINT "savepoint"
+INSERT INTO "token_blacklist_blacklistedtoken" ("token_id", "blacklisted_at") VALUES (?, ?) RETURNING "token_blacklist_blacklistedtoken"."id"
+RELEASE SAVEPOINT "savepoint"
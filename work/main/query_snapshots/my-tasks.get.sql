@@ -0,0 +1 @@
+SELECT "main_task"."id", "main_task"."title", "main_task"."content", "main_task"."project_id", "main_task"."assigned_to_id", "main_task"."status", "main_task"."priority", "main_task"."created_at", "main_task"."updated_at", "main_task"."deadline", "main_task"."testing_responsible_id" FROM "main_task" WHERE "main_task"."project_id" IN (SELECT U0."project_id" FROM "main_projectparticipant" U0 WHERE U0."user_id" = ?) ORDER BY "main_task"."created_at" DESC, "main_task"."id" DESC LIMIT ?
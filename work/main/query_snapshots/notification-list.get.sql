@@ -0,0 +1 @@
+SELECT "main_notification"."id", "main_notification"."user_id", "main_notification"."seq", "main_notification"."payload", "main_notification"."created_at", "main_notification"."read_at" FROM "main_notification" WHERE "main_notification"."user_id" = ? ORDER BY "main_notification"."seq" ASC, "main_notification"."id" ASC LIMIT ?
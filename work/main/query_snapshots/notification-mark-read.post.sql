@@ -0,0 +1 @@
+UPDATE "main_notification" SET "read_at" = ? WHERE ("main_notification"."read_at" IS NULL AND "main_notification"."user_id" = ? AND "main_notification"."seq" <= ?)
@@ -0,0 +1,4 @@
+SELECT "main_cachegeneration"."scope", "main_cachegeneration"."generation" FROM "main_cachegeneration" WHERE "main_cachegeneration"."scope" IN (?)
+SELECT "main_project"."id", "main_project"."title", "main_project"."content", "main_project"."time_created", "main_project"."time_updated", "main_project"."status", "main_project"."owner_id" FROM "main_project" INNER JOIN "main_projectparticipant" ON ("main_project"."id" = "main_projectparticipant"."project_id") WHERE ("main_projectparticipant"."user_id" = ? AND "main_project"."status" = ?)
+SELECT ("main_projectparticipant"."project_id") AS "_prefetch_related_val_project_id", "main_userapi"."id" FROM "main_userapi" INNER JOIN "main_projectparticipant" ON ("main_userapi"."id" = "main_projectparticipant"."user_id") WHERE "main_projectparticipant"."project_id" IN (...)
+SELECT "main_project"."id", "main_project"."title", "main_project"."content", "main_project"."time_created", "main_project"."time_updated", "main_project"."status", "main_project"."owner_id" FROM "main_project" INNER JOIN "main_projectparticipant" ON ("main_project"."id" = "main_projectparticipant"."project_id") WHERE ("main_projectparticipant"."user_id" = ? AND "main_project"."status" = ?)
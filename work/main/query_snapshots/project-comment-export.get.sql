@@ -0,0 +1,3 @@
+SELECT "main_project"."id", "main_project"."title", "main_project"."content", "main_project"."time_created", "main_project"."time_updated", "main_project"."status", "main_project"."owner_id" FROM "main_project" WHERE "main_project"."id" = ? LIMIT ?
+SELECT "cache_key", "value", "expires" FROM "main_shared_cache" WHERE "cache_key" IN (?)
+SELECT "main_comment"."id", "main_comment"."task_id", "main_comment"."author_id", "main_userapi"."name", "main_userapi"."surname", "main_comment"."content", "main_comment"."created_at", "main_comment"."updated_at" FROM "main_comment" INNER JOIN "main_task" ON ("main_comment"."task_id" = "main_task"."id") INNER JOIN "main_userapi" ON ("main_comment"."author_id" = "main_userapi"."id") WHERE "main_task"."project_id" = ? ORDER BY "main_comment"."id" ASC
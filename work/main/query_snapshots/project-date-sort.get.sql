@@ -0,0 +1 @@
+SELECT "main_project"."id", "main_project"."title", "main_project"."content", "main_project"."time_created", "main_project"."time_updated", "main_project"."status", "main_project"."owner_id" FROM "main_project" WHERE "main_project"."time_created" BETWEEN ? AND ? ORDER BY "main_project"."time_created" ASC, "main_project"."id" ASC LIMIT ?
@@ -0,0 +1,15 @@
+SELECT "main_project"."id", "main_project"."title", "main_project"."content", "main_project"."time_created", "main_project"."time_updated", "main_project"."status", "main_project"."owner_id" FROM "main_project" WHERE "main_project"."id" = ? LIMIT ?
+SELECT "main_projectparticipant"."id", "main_projectparticipant"."user_id", "main_projectparticipant"."project_id", "main_projectparticipant"."role", "main_projectparticipant"."created_at", "main_projectparticipant"."updated_at" FROM "main_projectparticipant" WHERE "main_projectparticipant"."project_id" IN (?)
+SELECT "main_task"."id", "main_task"."title", "main_task"."content", "main_task"."project_id", "main_task"."assigned_to_id", "main_task"."status", "main_task"."priority", "main_task"."created_at", "main_task"."updated_at", "main_task"."deadline", "main_task"."testing_responsible_id" FROM "main_task" WHERE "main_task"."project_id" IN (?)
+SELECT "main_projectparticipant"."user_id" FROM "main_projectparticipant" WHERE "main_projectparticipant"."project_id" = ?
+INSERT INTO "main_cachegeneration" ("scope", "generation") VALUES (?, ?) ON CONFLICT("scope") DO UPDATE SET "generation" = EXCLUDED."generation"
+INSERT INTO "main_tombstone" ("kind", "object_id", "project_id", "user_id", "deleted_at") VALUES (?, ?, ?, ?, ?) RETURNING "main_tombstone"."id"
+DELETE FROM "main_projectstats" WHERE "main_projectstats"."project_id" IN (?)
+DELETE FROM "main_projectassigneestats" WHERE "main_projectassigneestats"."project_id" IN (?)
+DELETE FROM "main_projectparticipant" WHERE "main_projectparticipant"."id" IN (?)
+DELETE FROM "main_shared_cache" WHERE "cache_key" IN (?)
+INSERT INTO "main_cachegeneration" ("scope", "generation") VALUES (?, ?), (?, ?) ON CONFLICT("scope") DO UPDATE SET "generation" = EXCLUDED."generation"
+UPDATE "main_project" SET "time_updated" = ? WHERE "main_project"."id" IN (?)
+SELECT "main_projectparticipant"."user_id" FROM "main_projectparticipant" WHERE "main_projectparticipant"."project_id" IN (?)
+DELETE FROM "main_project" WHERE "main_project"."id" IN (?)
+INSERT INTO "main_cachegeneration" ("scope", "generation") VALUES (?, ?) ON CONFLICT("scope") DO UPDATE SET "generation" = EXCLUDED."generation"
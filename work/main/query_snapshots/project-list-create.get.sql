@@ -0,0 +1,2 @@
+SELECT "main_project"."id", "main_project"."title", "main_project"."content", "main_project"."time_created", "main_project"."time_updated", "main_project"."status", "main_project"."owner_id" FROM "main_project" ORDER BY "main_project"."time_created" DESC, "main_project"."id" DESC LIMIT ?
+SELECT ("main_projectparticipant"."project_id") AS "_prefetch_related_val_project_id", "main_userapi"."id" FROM "main_userapi" INNER JOIN "main_projectparticipant" ON ("main_userapi"."id" = "main_projectparticipant"."user_id") WHERE "main_projectparticipant"."project_id" IN (...)
@@ -0,0 +1,13 @@
+SELECT "main_userapi"."id", "main_userapi"."password", "main_userapi"."last_login", "main_userapi"."is_superuser", "main_userapi"."email", "main_userapi"."name", "main_userapi"."surname", "main_userapi"."role", "main_userapi"."is_active", "main_userapi"."is_staff", "main_userapi"."avatar" FROM "main_userapi" WHERE "main_userapi"."id" = ? LIMIT ?
+SELECT "main_userapi"."id", "main_userapi"."password", "main_userapi"."last_login", "main_userapi"."is_superuser", "main_userapi"."email", "main_userapi"."name", "main_userapi"."surname", "main_userapi"."role", "main_userapi"."is_active", "main_userapi"."is_staff", "main_userapi"."avatar" FROM "main_userapi" WHERE "main_userapi"."id" = ? LIMIT ?
+INSERT INTO "main_project" ("title", "content", "time_created", "time_updated", "status", "owner_id") VALUES (?, ?, ?, ?, ?, ?) RETURNING "main_project"."id"
+INSERT INTO "main_cachegeneration" ("scope", "generation") VALUES (?, ?) ON CONFLICT("scope") DO UPDATE SET "generation" = EXCLUDED."generation"
+SELECT "main_userapi"."id" FROM "main_userapi" INNER JOIN "main_projectparticipant" ON ("main_userapi"."id" = "main_projectparticipant"."user_id") WHERE "main_projectparticipant"."project_id" = ?
+SELECT "main_projectparticipant"."user_id" FROM "main_projectparticipant" WHERE ("main_projectparticipant"."project_id" = ? AND "main_projectparticipant"."user_id" IN (?))
+INSERT INTO "main_projectparticipant" ("user_id", "project_id", "role", "created_at", "updated_at") VALUES (?, ?, ?, ?, ?) RETURNING "main_projectparticipant"."id"
+DELETE FROM "main_shared_cache" WHERE "cache_key" IN (?)
+INSERT INTO "main_cachegeneration" ("scope", "generation") VALUES (?, ?), (?, ?) ON CONFLICT("scope") DO UPDATE SET "generation" = EXCLUDED."generation"
+UPDATE "main_project" SET "time_updated" = ? WHERE "main_project"."id" IN (?)
+SELECT "main_projectparticipant"."user_id" FROM "main_projectparticipant" WHERE "main_projectparticipant"."project_id" IN (?)
+INSERT INTO "main_cachegeneration" ("scope", "generation") VALUES (?, ?) ON CONFLICT("scope") DO UPDATE SET "generation" = EXCLUDED."generation"
+SELECT "main_userapi"."id", "main_userapi"."password", "main_userapi"."last_login", "main_userapi"."is_superuser", "main_userapi"."email", "main_userapi"."name", "main_userapi"."surname", "main_userapi"."role", "main_userapi"."is_active", "main_userapi"."is_staff", "main_userapi"."avatar" FROM "main_userapi" INNER JOIN "main_projectparticipant" ON ("main_userapi"."id" = "main_projectparticipant"."user_id") WHERE "main_projectparticipant"."project_id" = ?
@@ -0,0 +1,4 @@
+SELECT "cache_key", "value", "expires" FROM "main_shared_cache" WHERE "cache_key" IN (?)
+SELECT "main_projectstats"."tasks_total", "main_projectstats"."status_grooming", "main_projectstats"."status_in_progress", "main_projectstats"."status_dev", "main_projectstats"."status_done", "main_projectstats"."priority_low", "main_projectstats"."priority_medium", "main_projectstats"."priority_high", "main_projectstats"."project_id" FROM "main_projectstats" WHERE "main_projectstats"."project_id" = ? ORDER BY "main_projectstats"."project_id" ASC LIMIT ?
+SELECT COUNT(*) AS "__count" FROM "main_task" WHERE ("main_task"."deadline" < ? AND "main_task"."project_id" = ? AND NOT ("main_task"."status" = ?))
+SELECT "main_projectassigneestats"."id", "main_projectassigneestats"."tasks_total", "main_projectassigneestats"."status_grooming", "main_projectassigneestats"."status_in_progress", "main_projectassigneestats"."status_dev", "main_projectassigneestats"."status_done", "main_projectassigneestats"."priority_low", "main_projectassigneestats"."priority_medium", "main_projectassigneestats"."priority_high", "main_projectassigneestats"."project_id", "main_projectassigneestats"."user_id" FROM "main_projectassigneestats" WHERE ("main_projectassigneestats"."project_id" = ? AND "main_projectassigneestats"."tasks_total" > ?) ORDER BY "main_projectassigneestats"."user_id" ASC
@@ -0,0 +1,3 @@
+SELECT "main_cachegeneration"."scope", "main_cachegeneration"."generation" FROM "main_cachegeneration" WHERE "main_cachegeneration"."scope" IN (?)
+SELECT ? AS "a" FROM "main_task" WHERE "main_task"."project_id" = ? LIMIT ?
+SELECT "main_task"."id", "main_task"."title", "main_task"."content", "main_task"."project_id", "main_task"."assigned_to_id", "main_task"."status", "main_task"."priority", "main_task"."created_at", "main_task"."updated_at", "main_task"."deadline", "main_task"."testing_responsible_id" FROM "main_task" WHERE "main_task"."project_id" = ? ORDER BY "main_task"."created_at" DESC, "main_task"."id" DESC LIMIT ?
@@ -0,0 +1,3 @@
+SELECT "cache_key", "value", "expires" FROM "main_shared_cache" WHERE "cache_key" IN (?)
+SELECT COUNT("main_task"."id") AS "count", MAX("main_task"."updated_at") AS "updated" FROM "main_task" WHERE "main_task"."project_id" = ?
+SELECT "main_task"."status", "main_task"."priority", (strftime(?, "main_task"."created_at") + COALESCE(CAST(substr("main_task"."created_at", ?) AS REAL), ?)) AS "epochseconds1", (strftime(?, "main_task"."updated_at") + COALESCE(CAST(substr("main_task"."updated_at", ?) AS REAL), ?)) AS "epochseconds2", (strftime(?, "main_task"."deadline") + COALESCE(CAST(substr("main_task"."deadline", ?) AS REAL), ?)) AS "epochseconds3" FROM "main_task" WHERE "main_task"."project_id" = ?
@@ -0,0 +1,6 @@
+SELECT "main_project"."id", "main_project"."title", "main_project"."content", "main_project"."time_created", "main_project"."time_updated", "main_project"."status", "main_project"."owner_id" FROM "main_project" WHERE "main_project"."id" = ? LIMIT ?
+UPDATE "main_project" SET "title" = ?, "content" = ?, "time_created" = ?, "time_updated" = ?, "status" = ?, "owner_id" = ? WHERE "main_project"."id" = ?
+INSERT INTO "main_cachegeneration" ("scope", "generation") VALUES (?, ?) ON CONFLICT("scope") DO UPDATE SET "generation" = EXCLUDED."generation"
+SELECT "main_projectparticipant"."user_id" FROM "main_projectparticipant" WHERE "main_projectparticipant"."project_id" = ?
+INSERT INTO "main_cachegeneration" ("scope", "generation") VALUES (?, ?), (?, ?), (?, ?), (?, ?) ON CONFLICT("scope") DO UPDATE SET "generation" = EXCLUDED."generation"
+SELECT "main_userapi"."id", "main_userapi"."password", "main_userapi"."last_login", "main_userapi"."is_superuser", "main_userapi"."email", "main_userapi"."name", "main_userapi"."surname", "main_userapi"."role", "main_userapi"."is_active", "main_userapi"."is_staff", "main_userapi"."avatar" FROM "main_userapi" INNER JOIN "main_projectparticipant" ON ("main_userapi"."id" = "main_projectparticipant"."user_id") WHERE "main_projectparticipant"."project_id" = ?
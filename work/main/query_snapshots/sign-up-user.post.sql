@@ -0,0 +1,4 @@
+SELECT ? AS "a" FROM "main_userapi" WHERE "main_userapi"."email" = ? LIMIT ?
+INSERT INTO "main_userapi" ("password", "last_login", "is_superuser", "email", "name", "surname", "role", "is_active", "is_staff", "avatar") VALUES (?, NULL, ?, ?, ?, ?, ?, ?, ?, ?) RETURNING "main_userapi"."id"
+INSERT INTO "main_cachegeneration" ("scope", "generation") VALUES (?, ?) ON CONFLICT("scope") DO UPDATE SET "generation" = EXCLUDED."generation"
+INSERT INTO "token_blacklist_outstandingtoken" ("user_id", "jti", "token", "created_at", "expires_at") VALUES (?, ?, ?, ?, ?) RETURNING "token_blacklist_outstandingtoken"."id"
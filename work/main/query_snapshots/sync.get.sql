@@ -0,0 +1,6 @@
+SELECT "main_projectparticipant"."project_id", "main_projectparticipant"."created_at" FROM "main_projectparticipant" WHERE "main_projectparticipant"."user_id" = ?
+SELECT "main_project"."id", "main_project"."title", "main_project"."content", "main_project"."time_created", "main_project"."time_updated", "main_project"."status", "main_project"."owner_id" FROM "main_project" WHERE ("main_project"."id" IN (...) AND "main_project"."id" > ?) ORDER BY "main_project"."id" ASC LIMIT ?
+SELECT ("main_projectparticipant"."project_id") AS "_prefetch_related_val_project_id", "main_userapi"."id" FROM "main_userapi" INNER JOIN "main_projectparticipant" ON ("main_userapi"."id" = "main_projectparticipant"."user_id") WHERE "main_projectparticipant"."project_id" IN (...)
+SELECT "main_task"."id", "main_task"."title", "main_task"."content", "main_task"."project_id", "main_task"."assigned_to_id", "main_task"."status", "main_task"."priority", "main_task"."created_at", "main_task"."updated_at", "main_task"."deadline", "main_task"."testing_responsible_id" FROM "main_task" WHERE ("main_task"."project_id" IN (...) AND "main_task"."id" > ?) ORDER BY "main_task"."id" ASC LIMIT ?
+SELECT "main_comment"."id", "main_comment"."task_id", "main_comment"."author_id", "main_comment"."content", "main_comment"."created_at", "main_comment"."updated_at", "main_userapi"."id", "main_userapi"."password", "main_userapi"."last_login", "main_userapi"."is_superuser", "main_userapi"."email", "main_userapi"."name", "main_userapi"."surname", "main_userapi"."role", "main_userapi"."is_active", "main_userapi"."is_staff", "main_userapi"."avatar" FROM "main_comment" INNER JOIN "main_task" ON ("main_comment"."task_id" = "main_task"."id") INNER JOIN "main_userapi" ON ("main_comment"."author_id" = "main_userapi"."id") WHERE ("main_task"."project_id" IN (...) AND "main_comment"."id" > ?) ORDER BY "main_comment"."id" ASC LIMIT ?
+SELECT "main_projectparticipant"."id", "main_projectparticipant"."user_id", "main_projectparticipant"."project_id", "main_projectparticipant"."role", "main_projectparticipant"."created_at", "main_projectparticipant"."updated_at" FROM "main_projectparticipant" WHERE ("main_projectparticipant"."project_id" IN (...) AND "main_projectparticipant"."id" > ?) ORDER BY "main_projectparticipant"."id" ASC LIMIT ?
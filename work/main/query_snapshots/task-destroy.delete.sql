@@ -0,0 +1,6 @@
+SELECT "main_task"."id", "main_task"."title", "main_task"."content", "main_task"."project_id", "main_task"."assigned_to_id", "main_task"."status", "main_task"."priority", "main_task"."created_at", "main_task"."updated_at", "main_task"."deadline", "main_task"."testing_responsible_id" FROM "main_task" WHERE "main_task"."id" = ? LIMIT ?
+SELECT "main_comment"."id", "main_comment"."task_id", "main_comment"."author_id", "main_comment"."content", "main_comment"."created_at", "main_comment"."updated_at" FROM "main_comment" WHERE "main_comment"."task_id" IN (?)
+DELETE FROM "main_task" WHERE "main_task"."id" IN (?)
+INSERT INTO "main_tombstone" ("kind", "object_id", "project_id", "user_id", "deleted_at") VALUES (?, ?, ?, NULL, ?) RETURNING "main_tombstone"."id"
+INSERT INTO "main_cachegeneration" ("scope", "generation") VALUES (?, ?) ON CONFLICT("scope") DO UPDATE SET "generation" = EXCLUDED."generation"
+INSERT INTO "main_projectstats" ("project_id", "tasks_total", "status_grooming", "status_in_progress", "status_dev", "status_done", "priority_low", "priority_medium", "priority_high") VALUES (?, -?, ?, ?, -?, ?, -?, ?, ?) ON CONFLICT ("project_id") DO UPDATE SET "tasks_total" = "main_projectstats"."tasks_total" + excluded."tasks_total", "status_grooming" = "main_projectstats"."status_grooming" + excluded."status_grooming", "status_in_progress" = "main_projectstats"."status_in_progress" + excluded."status_in_progress", "status_dev" = "main_projectstats"."status_dev" + excluded."status_dev", "status_done" = "main_projectstats"."status_done" + excluded."status_done", "priority_low" = "main_projectstats"."priority_low" + excluded."priority_low", "priority_medium" = "main_projectstats"."priority_medium" + excluded."priority_medium", "priority_high" = "main_projectstats"."priority_high" + excluded."priority_high"
@@ -0,0 +1,6 @@
+SELECT "main_project"."id" FROM "main_project" WHERE "main_project"."id" = ? LIMIT ?
+SELECT "cache_key", "value", "expires" FROM "main_shared_cache" WHERE "cache_key" IN (?)
+SELECT "main_project"."id", "main_project"."title", "main_project"."content", "main_project"."time_created", "main_project"."time_updated", "main_project"."status", "main_project"."owner_id" FROM "main_project" WHERE "main_project"."id" = ? LIMIT ?
+INSERT INTO "main_task" ("title", "content", "project_id", "assigned_to_id", "status", "priority", "created_at", "updated_at", "deadline", "testing_responsible_id") VALUES (?, ?, ?, NULL, ?, ?, ?, ?, NULL, NULL) RETURNING "main_task"."id"
+INSERT INTO "main_cachegeneration" ("scope", "generation") VALUES (?, ?) ON CONFLICT("scope") DO UPDATE SET "generation" = EXCLUDED."generation"
+INSERT INTO "main_projectstats" ("project_id", "tasks_total", "status_grooming", "status_in_progress", "status_dev", "status_done", "priority_low", "priority_medium", "priority_high") VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT ("project_id") DO UPDATE SET "tasks_total" = "main_projectstats"."tasks_total" + excluded."tasks_total", "status_grooming" = "main_projectstats"."status_grooming" + excluded."status_grooming", "status_in_progress" = "main_projectstats"."status_in_progress" + excluded."status_in_progress", "status_dev" = "main_projectstats"."status_dev" + excluded."status_dev", "status_done" = "main_projectstats"."status_done" + excluded."status_done", "priority_low" = "main_projectstats"."priority_low" + excluded."priority_low", "priority_medium" = "main_projectstats"."priority_medium" + excluded."priority_medium", "priority_high" = "main_projectstats"."priority_high" + excluded."priority_high"
@@ -1,19 +1,93 @@
 from django.contrib.auth import authenticate
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
 from rest_framework.generics import ListAPIView
 
-from .models import Task, UserAPI, Comment, ProjectParticipant
+from .auth import get_failed_login_cache, login_attempt_key
+from .models import Task, UserAPI, Comment, Notification, ProjectParticipant
 from django.contrib.auth import get_user_model
-from rest_framework import serializers
+from rest_framework import exceptions, serializers
 from .models import Project
 
 
+class SparseFieldsMixin:
+    """
+    Проекция полей по параметрам запроса ?fields=a,b и ?exclude=c.
+
+    Применяется только к GET-запросам: лишние поля удаляются из сериализатора,
+    а prepare_queryset() сужает SELECT через only(), поэтому невостребованные
+    колонки (например, content) не читаются из базы и не сериализуются.
+    """
+
+    fields_query_param = 'fields'
+    exclude_query_param = 'exclude'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        field_names = self.get_requested_fields(self.context.get('request'))
+        if field_names is not None:
+            for name in set(self.fields) - field_names:
+                self.fields.pop(name)
+
+    @classmethod
+    def get_requested_fields(cls, request):
+        """
+        Набор запрошенных полей или None, если проекция не задана.
+        """
+
+        if request is None or request.method != 'GET':
+            return None
+        fields = request.query_params.get(cls.fields_query_param)
+        exclude = request.query_params.get(cls.exclude_query_param)
+        if not fields and not exclude:
+            return None
+
+        field_names = set(cls.Meta.fields)
+        if fields:
+            field_names &= {name.strip() for name in fields.split(',')}
+        if exclude:
+            field_names -= {name.strip() for name in exclude.split(',')}
+        return field_names
+
+    @classmethod
+    def prepare_queryset(cls, queryset, request):
+        """
+        Загрузка связанных объектов и сужение SELECT под запрошенные поля.
+        """
+
+        field_names = cls.get_requested_fields(request)
+        queryset = cls.setup_eager_loading(queryset, field_names)
+        if field_names is None:
+            return queryset
+
+        model_fields = {'pk'}
+        declared = cls._declared_fields
+        for name in field_names:
+            field = declared.get(name)
+            if isinstance(field, serializers.SerializerMethodField):
+                # Метод может обращаться к любым атрибутам: колонки не сужаем.
+                return queryset
+            source = getattr(field, 'source', None) or name
+            try:
+                model_field = cls.Meta.model._meta.get_field(source)
+            except FieldDoesNotExist:
+                return queryset
+            if model_field.concrete:
+                model_fields.add(model_field.name)
+        return queryset.only(*model_fields)
+
+    @staticmethod
+    def setup_eager_loading(queryset, field_names=None):
+        return queryset
+
+
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = UserAPI
         fields = ['name']
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     participants = serializers.PrimaryKeyRelatedField(
         many=True,
         queryset=UserAPI.objects.all()
@@ -26,6 +100,14 @@ class ProjectSerializer(serializers.ModelSerializer):
         model = Project
         fields = ['id', 'title', 'content', 'status', 'participants', 'owner', 'time_created', 'time_updated']
 
+    @staticmethod
+    def setup_eager_loading(queryset, field_names=None):
+        if field_names is not None and 'participants' not in field_names:
+            return queryset
+        return queryset.prefetch_related(
+            Prefetch('participants', queryset=UserAPI.objects.only('id'))
+        )
+
 
 class ProjectParticipantSerializer(serializers.ModelSerializer):
     class Meta:
@@ -62,16 +144,76 @@ class ProfileUpdateSerializer(serializers.ModelSerializer):
         fields = ['name', 'surname', 'avatar', 'role']
 
 
-class TaskSerializer(serializers.ModelSerializer):
+class TaskSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Task
         fields = ['id', 'title', 'content', 'project', 'assigned_to', 'status', 'priority', 'created_at',
                   'updated_at', 'deadline', 'testing_responsible', ]
 
 
+class PreloadedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    PrimaryKeyRelatedField, который ищет объект в context['preloaded'][model]
+    вместо отдельного запроса на каждое значение.
+    """
+
+    def to_internal_value(self, data):
+        preloaded = self.context.get('preloaded', {}).get(self.get_queryset().model)
+        if preloaded is None:
+            return super().to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            instance = preloaded.get(int(data))
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        if instance is None:
+            self.fail('does_not_exist', pk_value=data)
+        return instance
+
+
+class BulkTaskSerializer(TaskSerializer):
+    """
+    Сериализатор задачи для пакетных операций.
+
+    Проекты и пользователи загружаются один раз на весь пакет и передаются
+    в context['preloaded'], поэтому проверка N задач не делает N запросов.
+    """
+
+    project = PreloadedPrimaryKeyRelatedField(queryset=Project.objects.all())
+    assigned_to = PreloadedPrimaryKeyRelatedField(queryset=UserAPI.objects.all(), allow_null=True, required=False)
+    testing_responsible = PreloadedPrimaryKeyRelatedField(
+        queryset=UserAPI.objects.all(), allow_null=True, required=False
+    )
+
+    @staticmethod
+    def preload(items):
+        """
+        Загрузка всех проектов и пользователей, на которые ссылается пакет.
+        """
+
+        def collect(*names):
+            ids = set()
+            for item in items:
+                if not isinstance(item, dict):
+                    continue
+                for name in names:
+                    value = item.get(name)
+                    if isinstance(value, int) and not isinstance(value, bool):
+                        ids.add(value)
+                    elif isinstance(value, str) and value.isdigit():
+                        ids.add(int(value))
+            return ids
+
+        return {
+            Project: Project.objects.only('id').in_bulk(collect('project')),
+            UserAPI: UserAPI.objects.only('id').in_bulk(collect('assigned_to', 'testing_responsible')),
+        }
 
 
-class CommentSerializer(serializers.ModelSerializer):
+
+
+class CommentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     task = serializers.PrimaryKeyRelatedField(queryset=Task.objects.all(), write_only=True)
     author = serializers.SerializerMethodField()
 
@@ -79,10 +221,35 @@ class CommentSerializer(serializers.ModelSerializer):
         model = Comment
         fields = ['id', 'task', 'content', 'author', 'created_at']
 
+    @staticmethod
+    def setup_eager_loading(queryset, field_names=None):
+        if field_names is not None and 'author' not in field_names:
+            return queryset
+        return queryset.select_related('author')
+
     def get_author(self, obj):
         return f"{obj.author.name} {obj.author.surname}"
 
 
+class SyncCommentSerializer(CommentSerializer):
+    task = serializers.PrimaryKeyRelatedField(read_only=True)
+
+    class Meta(CommentSerializer.Meta):
+        fields = ['id', 'task', 'content', 'author', 'created_at', 'updated_at']
+
+
+class SyncMembershipSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ProjectParticipant
+        fields = ['id', 'project', 'user', 'role', 'updated_at']
+
+
+class NotificationSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Notification
+        fields = ['seq', 'payload', 'created_at', 'read_at']
+
+
 class AssignUserToTaskSerializer(serializers.Serializer):
     user_id = serializers.IntegerField()
 
@@ -96,15 +263,26 @@ class LogSerializer(serializers.Serializer):
         password = attrs.get('password')
 
         if email and password:
+            failed_logins = get_failed_login_cache()
+            attempt_key = login_attempt_key(email, self.context.get('request'))
+            if failed_logins is not None:
+                wait = failed_logins.blocked_for(attempt_key)
+                if wait:
+                    raise exceptions.Throttled(wait=wait, detail="Too many failed login attempts.")
+
             user = authenticate(
                 request=self.context.get('request'),
                 email=email,
                 password=password
             )
             if not user:
+                if failed_logins is not None:
+                    failed_logins.add_failure(attempt_key)
                 raise serializers.ValidationError(
                     {"detail": "Invalid credentials"}
                 )
+            if failed_logins is not None:
+                failed_logins.reset(attempt_key)
         else:
             raise serializers.ValidationError(
                 {"detail": "Email and password are required"}
@@ -0,0 +1,217 @@
+from contextvars import ContextVar
+
+from django.db.models import QuerySet
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .auth import invalidate_cached_user
+from .cache import invalidate, invalidate_projects, invalidate_users, project_scope, user_scope
+from .membership import invalidate_membership
+from .notifications.websocket_notifications import send_membership_revoked, send_project_event
+from .serializers import SyncCommentSerializer, TaskSerializer
+from .stats import TASK_FIELDS, apply_task_changes, rebuild_project_stats, task_key
+from .models import Comment, Project, ProjectParticipant, Task, Tombstone, UserAPI
+from .sync import record_tombstones
+
+
+@receiver(post_save, sender=ProjectParticipant)
+@receiver(post_delete, sender=ProjectParticipant)
+def participant_changed(sender, instance, **kwargs):
+    invalidate_membership(instance.project_id, instance.user_id)
+    invalidate(project_scope(instance.project_id), user_scope(instance.user_id))
+    touch_projects([instance.project_id])
+
+
+@receiver(m2m_changed, sender=Project.participants.through)
+def participants_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear':
+        # После очистки pk_set недоступен: запоминаем затронутых заранее.
+        related = instance.project_participations if reverse else instance.participants_project
+        instance._cleared_participants = list(related.values_list('project_id', 'user_id'))
+        return
+    if action == 'post_clear':
+        pairs = getattr(instance, '_cleared_participants', [])
+    elif action in ('post_add', 'post_remove'):
+        pairs = [(pk, instance.pk) if reverse else (instance.pk, pk) for pk in pk_set]
+    else:
+        return
+    for project_id, user_id in pairs:
+        invalidate_membership(project_id, user_id)
+        invalidate(project_scope(project_id), user_scope(user_id))
+    touch_projects({project_id for project_id, _ in pairs})
+
+
+def touch_projects(project_ids):
+    """
+    Участники входят в ответ проекта, поэтому их изменение сдвигает
+    time_updated — от него считаются ETag и Last-Modified — и сбрасывает
+    закэшированные my_projects/профили всех участников.
+    """
+
+    Project.objects.filter(pk__in=project_ids).update(time_updated=timezone.now())
+    invalidate_users(ProjectParticipant.objects.filter(project_id__in=project_ids).values_list('user_id', flat=True))
+
+
+def _cascaded_from(origin, *models):
+    if isinstance(origin, QuerySet):
+        return issubclass(origin.model, models)
+    return isinstance(origin, models)
+
+
+# QuerySet, удаление которого уже обработал вызывающий код (delete_handled).
+_handled_delete = ContextVar('handled_delete', default=None)
+
+
+def delete_handled(queryset):
+    """
+    QuerySet.delete() для кода, который сам записал надгробия, события ленты и
+    счётчики (пакетный DELETE /task/bulk/): построчные сигналы задач его
+    пропускают. Любое другое массовое удаление (админка, shell) по-прежнему
+    обрабатывается сигналами по каждой строке.
+    """
+
+    token = _handled_delete.set(queryset)
+    try:
+        return queryset.delete()
+    finally:
+        _handled_delete.reset(token)
+
+
+def _delete_handled(origin):
+    return origin is not None and origin is _handled_delete.get()
+
+
+@receiver(pre_delete, sender=Project)
+def project_deleted(sender, instance, **kwargs):
+    # После удаления проект уже не связан с участниками, поэтому надгробие
+    # адресуется каждому из них.
+    user_ids = list(ProjectParticipant.objects.filter(project=instance).values_list('user_id', flat=True))
+    invalidate_users(user_ids)
+    Tombstone.objects.bulk_create([
+        Tombstone(kind=Tombstone.Kind.PROJECT, object_id=instance.pk, project_id=instance.pk, user_id=user_id)
+        for user_id in user_ids
+    ])
+    send_project_event(instance.pk, 'project.deleted', {'id': instance.pk})
+
+
+@receiver(post_delete, sender=Task)
+def task_deleted(sender, instance, origin=None, **kwargs):
+    # Задачи удалённого проекта покрывает надгробие проекта, а пакетное
+    # удаление через delete_handled() пишет надгробия и событие само.
+    if _cascaded_from(origin, Project) or _delete_handled(origin):
+        return
+    record_tombstones(Tombstone.Kind.TASK, [instance])
+    send_project_event(instance.project_id, 'task.deleted', {'id': instance.pk})
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, origin=None, **kwargs):
+    if _cascaded_from(origin, Project, Task):
+        return
+    record_tombstones(Tombstone.Kind.COMMENT, [instance], project_id=lambda comment: comment.task.project_id)
+    send_project_event(instance.task.project_id, 'comment.deleted', {'id': instance.pk, 'task': instance.task_id})
+
+
+@receiver(post_delete, sender=ProjectParticipant)
+def participant_deleted(sender, instance, origin=None, **kwargs):
+    send_membership_revoked(instance.user_id, instance.project_id)
+    if _cascaded_from(origin, Project, UserAPI):
+        return
+    # user_id: исключённый участник больше не видит надгробия проекта,
+    # но должен узнать, что его убрали.
+    record_tombstones(Tombstone.Kind.MEMBERSHIP, [instance], user_id=lambda participant: participant.user_id)
+
+
+
+# Живые ленты проектов (группы project_<id>).
+
+@receiver(post_save, sender=Task)
+def task_saved(sender, instance, created, **kwargs):
+    loaded_project_id = getattr(instance, '_loaded_values', {}).get('project_id', instance.project_id)
+    if loaded_project_id != instance.project_id:
+        # Для участников старого проекта задача удалена: и в ленте, и в /sync/.
+        record_tombstones(Tombstone.Kind.TASK, [instance], project_id=lambda task: loaded_project_id)
+        send_project_event(loaded_project_id, 'task.deleted', {'id': instance.pk})
+        created = True
+    send_project_event(instance.project_id, 'task.created' if created else 'task.updated',
+                       dict(TaskSerializer(instance).data))
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, **kwargs):
+    send_project_event(instance.task.project_id, 'comment.created' if created else 'comment.updated',
+                       dict(SyncCommentSerializer(instance).data))
+
+
+# Кэш ответов (main.cache). Комментарии в закэшированные ответы не входят.
+
+@receiver(post_save, sender=Project)
+def project_saved(sender, instance, created, **kwargs):
+    invalidate_projects([instance.pk])
+    if not created:
+        # Проект входит в my_projects и профиль каждого участника.
+        invalidate_users(ProjectParticipant.objects.filter(project=instance).values_list('user_id', flat=True))
+
+
+@receiver(post_delete, sender=Project)
+def project_removed(sender, instance, **kwargs):
+    invalidate_projects([instance.pk])
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def task_changed(sender, instance, **kwargs):
+    project_ids = {instance.project_id}
+    loaded = getattr(instance, '_loaded_values', {})
+    if 'project_id' in loaded:
+        project_ids.add(loaded['project_id'])
+    invalidate_projects(project_ids)
+
+
+@receiver(post_save, sender=UserAPI)
+def user_saved(sender, instance, update_fields=None, **kwargs):
+    invalidate_cached_user(instance.pk)
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    invalidate_users([instance.pk])
+
+
+@receiver(post_delete, sender=UserAPI)
+def user_deleted(sender, instance, **kwargs):
+    invalidate_cached_user(instance.pk)
+
+
+# Счётчики задач проектов (main.stats).
+
+@receiver(post_save, sender=Task)
+def task_counted(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields is not None and not {name.removesuffix('_id') for name in update_fields} & {
+            name.removesuffix('_id') for name in TASK_FIELDS}:
+        return
+    if created:
+        apply_task_changes(added=[task_key(instance)])
+        return
+    loaded = getattr(instance, '_loaded_values', {})
+    old = task_key(instance, loaded)
+    if old is None:
+        # Прежние значения не загружались (only()/defer()): пересчитываем проекты целиком.
+        rebuild_project_stats({instance.project_id, loaded.get('project_id', instance.project_id)})
+        return
+    new = task_key(instance)
+    if old != new:
+        apply_task_changes(removed=[old], added=[new])
+
+
+@receiver(post_delete, sender=Task)
+def task_uncounted(sender, instance, origin=None, **kwargs):
+    # Счётчики удалённого проекта удаляются каскадом, а delete_handled()
+    # обновляет их сам, как и надгробия.
+    if _cascaded_from(origin, Project, UserAPI) or _delete_handled(origin):
+        return
+    loaded = getattr(instance, '_loaded_values', {})
+    key = task_key(instance, loaded)
+    if key is None:
+        rebuild_project_stats({loaded.get('project_id', instance.project_id)})
+        return
+    apply_task_changes(removed=[key])
@@ -0,0 +1,156 @@
+from collections import Counter, defaultdict
+
+from django.db import connection, transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import Project, ProjectAssigneeStats, ProjectStats, Task, TaskCounters
+
+STATUS_FIELDS = {
+    'Grooming': 'status_grooming',
+    'In Progress': 'status_in_progress',
+    'Dev': 'status_dev',
+    'Done': 'status_done',
+}
+PRIORITY_FIELDS = {
+    'Low': 'priority_low',
+    'Medium': 'priority_medium',
+    'High': 'priority_high',
+}
+COUNTER_FIELDS = [field.name for field in TaskCounters._meta.fields]
+# Значения задачи, от которых зависят счётчики.
+TASK_FIELDS = ('project_id', 'assigned_to_id', 'status', 'priority')
+
+
+def task_key(task, values=None):
+    """
+    Кортеж значений TASK_FIELDS: из values (например, Task._loaded_values) или из самой задачи.
+    None, если в values не хватает полей.
+    """
+
+    if values is None:
+        return tuple(getattr(task, name) for name in TASK_FIELDS)
+    if not all(name in values for name in TASK_FIELDS):
+        return None
+    return tuple(values[name] for name in TASK_FIELDS)
+
+
+def _counters(status, priority):
+    fields = ['tasks_total']
+    if status in STATUS_FIELDS:
+        fields.append(STATUS_FIELDS[status])
+    if priority in PRIORITY_FIELDS:
+        fields.append(PRIORITY_FIELDS[priority])
+    return fields
+
+
+def apply_task_changes(removed=(), added=()):
+    """
+    Применяет к счётчикам удалённые и добавленные задачи (кортежи task_key).
+
+    Изменения сводятся по строкам счётчиков и записываются одним
+    INSERT ... ON CONFLICT DO UPDATE SET поле = поле + excluded.поле на таблицу:
+    пакет задач стоит не больше двух запросов, недостающие строки создаются
+    тем же запросом, а параллельные изменения не теряются.
+    Вызывается внутри транзакции, которая меняет задачи.
+    """
+
+    projects = defaultdict(Counter)
+    assignees = defaultdict(Counter)
+    for sign, keys in ((-1, removed), (1, added)):
+        for project_id, assigned_to_id, status, priority in keys:
+            for field in _counters(status, priority):
+                projects[(project_id,)][field] += sign
+                if assigned_to_id is not None:
+                    assignees[(project_id, assigned_to_id)][field] += sign
+
+    # Строка проекта блокируется и тогда, когда меняются только строки исполнителей:
+    # rebuild_project_stats пересоздаёт их под блокировкой строк проектов.
+    touched = {(project_id,) for (project_id, _), delta in assignees.items() if any(delta.values())}
+    _upsert(ProjectStats, ['project_id'], projects, touched)
+    _upsert(ProjectAssigneeStats, ['project_id', 'user_id'], assignees)
+
+
+def _upsert(model, key_columns, deltas, keep=()):
+    # Строки идут по возрастанию ключа: конкурирующие запросы блокируют их в одном порядке.
+    rows = [list(key) + [delta[field] for field in COUNTER_FIELDS]
+            for key, delta in sorted(deltas.items()) if any(delta.values()) or key in keep]
+    if not rows:
+        return
+    qn = connection.ops.quote_name
+    table = qn(model._meta.db_table)
+    columns = key_columns + COUNTER_FIELDS
+    values = ', '.join(['(' + ', '.join(['%s'] * len(columns)) + ')'] * len(rows))
+    updates = ', '.join(f'{qn(field)} = {table}.{qn(field)} + excluded.{qn(field)}' for field in COUNTER_FIELDS)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} ({', '.join(qn(column) for column in columns)}) VALUES {values} "
+            f"ON CONFLICT ({', '.join(qn(column) for column in key_columns)}) DO UPDATE SET {updates}",
+            [value for row in rows for value in row],
+        )
+
+
+def _aggregates():
+    counts = {'tasks_total': Count('id')}
+    counts.update({name: Count('id', filter=Q(status=value)) for value, name in STATUS_FIELDS.items()})
+    counts.update({name: Count('id', filter=Q(priority=value)) for value, name in PRIORITY_FIELDS.items()})
+    return counts
+
+
+def rebuild_project_stats(project_ids):
+    """
+    Пересчитывает счётчики проектов с нуля двумя агрегирующими запросами.
+
+    Блокируются только строки ProjectStats этих проектов (недостающие создаются
+    тем же запросом): изменения задач других проектов не ждут, а изменения задач
+    этих проектов ждут конца пересчёта в apply_task_changes, поэтому счётчики
+    не расходятся. Строки проектов обновляются по месту, строки исполнителей
+    пересоздаются.
+    """
+
+    project_ids = sorted(Project.objects.filter(id__in=list(project_ids)).values_list('id', flat=True))
+    if not project_ids:
+        return
+    with transaction.atomic():
+        _upsert(ProjectStats, ['project_id'], {(project_id,): Counter() for project_id in project_ids},
+                keep={(project_id,) for project_id in project_ids})
+        tasks = Task.objects.filter(project_id__in=project_ids).order_by()
+        by_project = {row.pop('project_id'): row for row in tasks.values('project_id').annotate(**_aggregates())}
+        by_assignee = tasks.filter(assigned_to__isnull=False).values('project_id', 'assigned_to_id').annotate(
+            **_aggregates())
+
+        ProjectStats.objects.bulk_update([
+            ProjectStats(project_id=project_id, **{field: by_project.get(project_id, {}).get(field, 0)
+                                                   for field in COUNTER_FIELDS})
+            for project_id in project_ids
+        ], COUNTER_FIELDS)
+        ProjectAssigneeStats.objects.filter(project_id__in=project_ids).delete()
+        ProjectAssigneeStats.objects.bulk_create([
+            ProjectAssigneeStats(project_id=row.pop('project_id'), user_id=row.pop('assigned_to_id'), **row)
+            for row in by_assignee
+        ])
+
+
+def _counters_data(row):
+    data = {'total': row.tasks_total, 'open': row.tasks_total - row.status_done}
+    data['by_status'] = {value: getattr(row, name) for value, name in STATUS_FIELDS.items()}
+    data['by_priority'] = {value: getattr(row, name) for value, name in PRIORITY_FIELDS.items()}
+    return data
+
+
+def project_stats(project_id):
+    """
+    Сводка для дашборда: строка ProjectStats, строки исполнителей и число
+    просроченных задач (последнее зависит от текущего времени, поэтому не
+    хранится, а считается по частичному индексу task_project_deadline_idx).
+    """
+
+    row = ProjectStats.objects.filter(project_id=project_id).first() or ProjectStats(project_id=project_id)
+    data = {'project': project_id, **_counters_data(row)}
+    data['overdue'] = Task.objects.filter(project_id=project_id, deadline__lt=timezone.now()).exclude(
+        status='Done').count()
+    data['assignees'] = [
+        {'user': assignee.user_id, **_counters_data(assignee)}
+        for assignee in ProjectAssigneeStats.objects.filter(project_id=project_id, tasks_total__gt=0).order_by('user_id')
+    ]
+    return data
@@ -0,0 +1,144 @@
+import base64
+import binascii
+import json
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.exceptions import ParseError
+
+from .models import Comment, Project, ProjectParticipant, Task, Tombstone
+
+
+# Выборки, которые отдаются страницами; deleted — надгробия.
+PAGED_KINDS = ('projects', 'tasks', 'comments', 'memberships', 'deleted')
+
+
+def sync_setting(name):
+    defaults = {'OVERLAP_SECONDS': 5, 'TOMBSTONE_RETENTION_DAYS': 30, 'PAGE_SIZE': 500, 'MAX_PAGE_SIZE': 5000}
+    return getattr(settings, 'SYNC', {}).get(name, defaults[name])
+
+
+def encode_cursor(moment, until=None, after=None):
+    """
+    Курсор синхронизации. С until и after — курсор продолжения: те же изменения
+    после moment (уже с учётом окна перекрытия; None — полная выгрузка), начиная
+    с объектов, чьи id больше after[вид]; until — момент, который станет
+    курсором, когда страницы кончатся.
+    """
+
+    payload = {'t': moment and moment.isoformat()}
+    if until is not None:
+        payload.update(u=until.isoformat(), a=after)
+    payload = json.dumps(payload, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def _parse_moment(value):
+    moment = datetime.fromisoformat(value)
+    if timezone.is_naive(moment):
+        raise ValueError(value)
+    return moment
+
+
+def decode_cursor(encoded):
+    """
+    Разбирает курсор в (since, until, after): момент, с которого нужно отдать
+    изменения, с учётом окна перекрытия, и для курсора продолжения — until и
+    позиции по видам (для обычного курсора None и {}). Окно вычитается только
+    из обычного курсора: в курсор продолжения since попадает уже сдвинутым.
+
+    updated_at проставляется до коммита транзакции, поэтому запись, закоммиченная
+    чуть позже выдачи курсора, может иметь более раннее время. Окно
+    OVERLAP_SECONDS захватывает такие записи; повторно пришедшие объекты клиент
+    просто перезаписывает.
+    """
+
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+        since = payload['t'] and _parse_moment(payload['t'])
+        until = 'u' in payload and _parse_moment(payload['u']) or None
+        after = payload.get('a') or {}
+        if (since is None and until is None) or not isinstance(after, dict) or any(
+                kind not in PAGED_KINDS or type(value) is not int for kind, value in after.items()):
+            raise ValueError(encoded)
+    except (TypeError, ValueError, KeyError, AttributeError, UnicodeEncodeError, binascii.Error):
+        raise ParseError('Invalid cursor.')
+    if since is not None and until is None:
+        since -= timedelta(seconds=sync_setting('OVERLAP_SECONDS'))
+    return since, until, after
+
+
+def cursor_expired(since):
+    return since < timezone.now() - timedelta(days=sync_setting('TOMBSTONE_RETENTION_DAYS'))
+
+
+def collect_changes(user, since, after=None):
+    """
+    Объекты, созданные или изменённые после since, и надгробия удалённых
+    (QuerySet'ы по возрастанию id, deleted — кортежей (id, kind, object_id)).
+
+    Для проектов, в которые пользователь добавлен после since, отдаётся всё
+    содержимое: клиент их ещё не видел. Остальные выборки идут по индексам
+    (project, updated_at), поэтому их стоимость зависит от числа изменений,
+    а не от размера проектов. since=None означает полную выгрузку. after —
+    позиции курсора продолжения: id, после которых продолжается каждая выборка.
+    """
+
+    after = after or {}
+
+    memberships = list(ProjectParticipant.objects.filter(user=user).values_list('project_id', 'created_at'))
+    new_ids = [project_id for project_id, created_at in memberships if since is None or created_at > since]
+    known_ids = [project_id for project_id, created_at in memberships if since is not None and created_at <= since]
+
+    def changed(prefix, updated_field):
+        condition = Q(**{f'{prefix}__in': new_ids})
+        if known_ids:
+            condition |= Q(**{f'{prefix}__in': known_ids, f'{updated_field}__gt': since})
+        return condition
+
+    changes = {
+        'projects': Project.objects.filter(changed('id', 'time_updated')),
+        'tasks': Task.objects.filter(changed('project_id', 'updated_at')),
+        'comments': Comment.objects.filter(changed('task__project_id', 'updated_at')),
+        'memberships': ProjectParticipant.objects.filter(changed('project_id', 'updated_at')),
+        # Надгробие задачи, перенесённой в другой проект пользователя, не отдаётся:
+        # сама задача приходит в tasks, и клиент не должен её удалить.
+        'deleted': Tombstone.objects.filter(
+            Q(project_id__in=known_ids) | Q(user_id=user.id), deleted_at__gt=since
+        ).exclude(
+            kind=Tombstone.Kind.TASK,
+            object_id__in=Task.objects.filter(project_id__in=new_ids + known_ids).values('id'),
+        ).values_list('id', 'kind', 'object_id') if since is not None else Tombstone.objects.none(),
+    }
+    return {kind: queryset.filter(id__gt=after.get(kind, 0)).order_by('id') for kind, queryset in changes.items()}
+
+
+def take_page(changes, limit, after=None):
+    """
+    Берёт из каждой выборки collect_changes (уже готовой к сериализации) не больше
+    limit объектов. Возвращает (страницу, позиции после неё, есть ли ещё объекты);
+    надгробия на странице разложены по видам в page['deleted'].
+    """
+
+    page, after, has_more = {}, dict(after or {}), False
+    for kind in PAGED_KINDS:
+        rows = list(changes[kind][:limit + 1])
+        has_more = has_more or len(rows) > limit
+        page[kind] = rows[:limit]
+        if page[kind]:
+            last = page[kind][-1]
+            after[kind] = last[0] if kind == 'deleted' else last.pk
+    deleted = {f'{kind}s': [] for kind in Tombstone.Kind.values}
+    for _, kind, object_id in page['deleted']:
+        deleted[f'{kind}s'].append(object_id)
+    page['deleted'] = deleted
+    return page, after, has_more
+
+
+def record_tombstones(kind, objects, project_id=lambda obj: obj.project_id, user_id=lambda obj: None):
+    Tombstone.objects.bulk_create([
+        Tombstone(kind=kind, object_id=obj.pk, project_id=project_id(obj), user_id=user_id(obj))
+        for obj in objects
+    ])
@@ -1,9 +1,65 @@
+import asyncio
+import csv
+import functools
+import importlib
+import io
+import json
+import time
+from datetime import timedelta, timezone as dt_timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest import skipUnless
+
+import msgpack
+import numpy as np
+import orjson
+from asgiref.sync import async_to_sync
+from asgiref.testing import ApplicationCommunicator
+from channels.exceptions import ChannelFull
+from channels.layers import get_channel_layer
+from channels.routing import URLRouter
+from django.apps import apps as django_apps
+from django.core.cache import cache
+from django.core.cache.backends.db import DatabaseCache
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import F
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
-from .models import Project, Task, UserAPI, Comment
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+from .analytics import load_columns
+from .auth import get_failed_login_cache, get_revoked_tokens
+from . import urls as main_urls
+from .budgets import get_budgets, latency_factor, normalize_sql
+from .cache import get_response_cache, project_scope, stats as cache_stats
+from .metrics import clear_metrics
+from .models import (Project, Task, UserAPI, Comment, ChannelMessage, ChannelGroupMembership, Notification,
+                     CacheGeneration, ProjectAssigneeStats, ProjectParticipant, ProjectStats, Tombstone)
+from .membership import get_participant_roles, invalidate_membership
+from .notifications.coalescer import NotificationCoalescer, coalescer
+from .notifications.inbox import store_notifications
+from .notifications.dispatcher import NotificationDispatcher, dispatcher
+from .notifications.presence import is_online, user_connected, user_disconnected
+from .notifications.layers import PostgresChannelLayer
+from .notifications.middleware import JWTAuthMiddleware
+from .notifications.routing import websocket_urlpatterns
+from .management.commands.loadtest import Command as LoadTestCommand
+from .pagination import KeysetPagination
+from .renderers import MessagePackRenderer, NDJSONRenderer, ORJSONRenderer
+from .profiling import acquire_slot as acquire_profiling_slot
+from .sync import encode_cursor
+import difflib
 import os
+import statistics
+import tempfile
+from pathlib import Path
+from unittest import mock
 import django
+from django.contrib.auth import authenticate
 from django.conf import settings
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'work.settings')
 django.setup()
@@ -38,6 +94,60 @@ class AuthTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn('access', response.data['data'])
 
+    def test_login_authenticates_once(self):
+        login_data = {
+            'email': 'testuser@example.com',
+            'password': 'testpassword123'
+        }
+        with mock.patch('main.serializers.authenticate', wraps=authenticate) as patched:
+            response = self.client.post(reverse('log-in-user'), data=login_data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(patched.call_count, 1)
+
+    def test_failed_logins_are_blocked_before_hashing(self):
+        get_failed_login_cache().clear()
+        self.addCleanup(get_failed_login_cache().clear)
+        login_data = {
+            'email': 'testuser@example.com',
+            'password': 'wrongpassword'
+        }
+        for _ in range(settings.LOGIN_FAILURE_CACHE['MAX_ATTEMPTS']):
+            response = self.client.post(reverse('log-in-user'), data=login_data, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        with mock.patch('main.serializers.authenticate') as patched:
+            response = self.client.post(reverse('log-in-user'), data=login_data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        patched.assert_not_called()
+
+        # С другого адреса владелец аккаунта по-прежнему входит.
+        login_data['password'] = 'testpassword123'
+        response = self.client.post(reverse('log-in-user'), data=login_data, format='json', REMOTE_ADDR='10.0.0.2')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_jwt_requests_skip_auth_queries_and_logout_revokes_access(self):
+        get_revoked_tokens().clear()
+        response = self.client.post(reverse('log-in-user'), format='json',
+                                    data={'email': 'testuser@example.com', 'password': 'testpassword123'})
+        tokens = response.data['data']
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        self.assertEqual(self.client.get(reverse('my-tasks')).status_code, status.HTTP_200_OK)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(reverse('my-tasks')).status_code, status.HTTP_200_OK)
+        self.assertFalse([query for query in queries.captured_queries
+                          if 'main_userapi' in query['sql'] or 'token_blacklist' in query['sql']])
+
+        response = self.client.post(reverse('log-out-user'), data={'refresh': tokens['refresh']}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get(reverse('my-tasks')).status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.client.credentials()
+        self.user.is_active = False
+        self.user.save()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(self.user).access_token}")
+        self.assertEqual(self.client.get(reverse('my-tasks')).status_code, status.HTTP_401_UNAUTHORIZED)
+
 class ProjectTests(APITestCase):
     def setUp(self):
         self.user = UserAPI.objects.create_user(
@@ -135,6 +245,41 @@ class TaskTests(APITestCase):
         self.assertEqual(response.data['title'], 'Updated Task')
 
 
+    def test_my_tasks_filters_without_duplicates(self):
+        other = UserAPI.objects.create_user(email='other@example.com', name='Other', surname='User',
+                                            password='testpassword123')
+        self.project.participants.add(other)
+        foreign = Project.objects.create(title='Foreign', content='Text', owner=other)
+        foreign.participants.add(other)
+        mine = Task.objects.create(project=self.project, title='Mine', content='', status='Done', priority='Low',
+                                   assigned_to=self.user)
+        Task.objects.create(project=self.project, title='Theirs', content='', status='Dev', priority='Low',
+                            assigned_to=other)
+        Task.objects.create(project=foreign, title='Hidden', content='', status='Done', priority='Low')
+
+        url = reverse('my-tasks')
+        titles = lambda response: [item['title'] for item in response.data['results']]
+        self.assertEqual(titles(self.client.get(url)), ['Theirs', 'Mine'])
+        self.assertEqual(titles(self.client.get(url, {'assigned_to': 'me'})), ['Mine'])
+        self.assertEqual(titles(self.client.get(url, {'status': 'Done'})), [mine.title])
+        self.assertEqual(self.client.get(url, {'assigned_to': other.id}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_retrieve_not_modified(self):
+        task = Task.objects.create(project=self.project, **{k: v for k, v in self.task_data.items() if k != 'project'})
+        url = reverse('task-retrieve', kwargs={'pk': task.id})
+        etag = self.client.get(url)['ETag']
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(len(queries), 1)
+
+        self.client.patch(reverse('task-update', kwargs={'pk': task.id}), data={'title': 'New'}, format='json')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+
 class ParticipantTests(APITestCase):
     def setUp(self):
         self.owner = UserAPI.objects.create_user(
@@ -158,6 +303,7 @@ class ParticipantTests(APITestCase):
             owner=self.owner,
             status='AC'
         )
+        cache.clear()
 
     def test_add_participant(self):
         data = {
@@ -172,6 +318,45 @@ class ParticipantTests(APITestCase):
         self.assertEqual(response.data['user'], self.participant.id)
         self.assertEqual(response.data['role'], 'Frontend')
 
+    def test_membership_cache_follows_participant_changes(self):
+        task_data = {'title': 'Task', 'content': 'Text', 'project': self.project.id,
+                     'status': 'Dev', 'priority': 'Low'}
+        participant_client = self.client_class()
+        participant_client.force_authenticate(self.participant)
+
+        response = participant_client.post(reverse('task-list-create'), data=task_data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.post(reverse('add-participant', kwargs={'project_id': self.project.id}),
+                         data={'user': self.participant.id, 'role': 'Frontend'}, format='json')
+        response = participant_client.post(reverse('task-list-create'), data=task_data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        with CaptureQueriesContext(connection) as queries:
+            participant_client.post(reverse('task-list-create'), data=task_data, format='json')
+        self.assertFalse(any('main_projectparticipant' in query['sql'] for query in queries.captured_queries))
+
+        self.client.delete(reverse('remove-participant', kwargs={'project_id': self.project.id,
+                                                                 'user_id': self.participant.id}))
+        response = participant_client.post(reverse('task-list-create'), data=task_data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_membership_invalidation_reaches_other_workers(self):
+        # Два независимых экземпляра кэша — как в двух процессах воркеров.
+        worker_a, worker_b = DatabaseCache('main_shared_cache', {}), DatabaseCache('main_shared_cache', {})
+        ProjectParticipant.objects.create(project=self.project, user=self.participant, role='Frontend')
+        membership_cache = 'main.membership.get_membership_cache'
+        with mock.patch(membership_cache, return_value=worker_a):
+            roles = get_participant_roles(SimpleNamespace(user=self.participant), [self.project.id])
+        self.assertEqual(roles, {self.project.id: 'Frontend'})
+        # update() не шлёт сигналов: сбрасывает кэш только явный вызов во «втором воркере».
+        ProjectParticipant.objects.filter(project=self.project, user=self.participant).update(role='Backend')
+        with mock.patch(membership_cache, return_value=worker_b):
+            invalidate_membership(self.project.id, self.participant.id)
+        with mock.patch(membership_cache, return_value=worker_a):
+            roles = get_participant_roles(SimpleNamespace(user=self.participant), [self.project.id])
+        self.assertEqual(roles, {self.project.id: 'Backend'})
+
 
 class CommentTests(APITestCase):
     def setUp(self):
@@ -209,6 +394,14 @@ class CommentTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(response.data['content'], self.comment_data['content'])
 
+    def test_comment_list_etag(self):
+        url = reverse('comment-list-create', kwargs={'task_id': self.task.id})
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.client.post(url, data=self.comment_data, format='json')
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+
     def test_update_comment(self):
 
         comment = Comment.objects.create(task=self.task, author=self.user, content='Original Comment')
@@ -221,3 +414,1276 @@ class CommentTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['content'], 'Updated Comment')
 
+
+class PaginationTests(APITestCase):
+    def setUp(self):
+        self.user = UserAPI.objects.create_user(
+            email='testuser@example.com',
+            name='Test',
+            surname='User',
+            password='testpassword123',
+            role='Backend'
+        )
+        self.client.force_authenticate(self.user)
+        self.project = Project.objects.create(
+            title='Test Project',
+            content='Project description',
+            owner=self.user
+        )
+        self.project.participants.add(self.user)
+        self.tasks = [
+            Task.objects.create(
+                title=f'Task {i}',
+                content='Task description',
+                project=self.project,
+                status='In Progress',
+                priority='Medium'
+            )
+            for i in range(5)
+        ]
+        Task.objects.update(created_at=self.tasks[0].created_at)
+
+    def test_cursor_walks_all_pages(self):
+        url = reverse('task-list-create') + '?page_size=2'
+        seen = []
+        pages = 0
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen.extend(task['id'] for task in response.data['results'])
+            url = response.data['next']
+            pages += 1
+        self.assertEqual(pages, 3)
+        self.assertEqual(seen, sorted((task.id for task in self.tasks), reverse=True))
+
+    def test_previous_link_returns_previous_page(self):
+        first = self.client.get(reverse('task-list-create') + '?page_size=2')
+        second = self.client.get(first.data['next'])
+        back = self.client.get(second.data['previous'])
+        self.assertEqual(back.data['results'], first.data['results'])
+        self.assertIsNone(first.data['previous'])
+
+    def test_case_insensitive_title_ordering(self):
+        for task, title in zip(self.tasks, ['beta', 'Alpha', 'gamma', 'Delta', 'epsilon']):
+            task.title = title
+            task.save()
+        url = reverse('task-filter') + '?ordering=lower_title&page_size=2'
+        seen = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen.extend(task['title'] for task in response.data['results'])
+            url = response.data['next']
+        self.assertEqual(seen, ['Alpha', 'beta', 'Delta', 'epsilon', 'gamma'])
+
+    def test_deep_page_is_an_index_range(self):
+        pagination = KeysetPagination()
+        pagination.sort_field = 'created_at'
+        cursor = {'v': self.tasks[0].created_at.isoformat(), 'i': self.tasks[2].id}
+        queryset = Task.objects.filter(pagination.position_filter(cursor, True)).order_by('-created_at', '-id')
+        plan = queryset[:2].explain()
+        # Одна граница индекса (created_at, id), без объединения двух поисков по OR и сортировки.
+        if connection.vendor == 'postgresql':
+            self.assertIn('Index Cond', plan)
+            self.assertNotIn('BitmapOr', plan)
+        else:
+            self.assertRegex(plan, r'SEARCH main_task USING (COVERING )?INDEX task_created_idx \(created_at<\?\)')
+            self.assertNotIn('MULTI-INDEX OR', plan)
+        self.assertEqual(list(queryset), sorted(self.tasks[:2], key=lambda task: -task.id))
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse('task-list-create') + '?cursor=garbage')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+class QueryCountTests(APITestCase):
+    """
+    Число запросов списочных эндпоинтов не должно зависеть от объёма данных.
+    """
+
+    def setUp(self):
+        self.user = UserAPI.objects.create_user(
+            email='testuser@example.com',
+            name='Test',
+            surname='User',
+            password='testpassword123',
+            role='Backend'
+        )
+        self.client.force_authenticate(self.user)
+        self.members = [
+            UserAPI.objects.create_user(
+                email=f'member{i}@example.com',
+                name='Member',
+                surname=str(i),
+                password='testpassword123'
+            )
+            for i in range(3)
+        ]
+        for i in range(5):
+            project = Project.objects.create(title=f'Project {i}', content='Description', owner=self.user)
+            project.participants.add(self.user, *self.members)
+            for j in range(4):
+                task = Task.objects.create(
+                    title=f'Task {i}.{j}',
+                    content='Task description',
+                    project=project,
+                    status='In Progress',
+                    priority='Medium'
+                )
+                for member in self.members:
+                    Comment.objects.create(task=task, author=member, content='Comment')
+        self.project = project
+        self.task = task
+
+    def assertMaxQueries(self, limit, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertLessEqual(
+            len(queries), limit,
+            '\n'.join(query['sql'] for query in queries.captured_queries)
+        )
+
+    def test_project_lists(self):
+        self.assertMaxQueries(2, reverse('project-list-create'))
+        # Кэшируемые списки читают ещё поколения кэша ответов (CacheGeneration).
+        self.assertMaxQueries(3, reverse('my-projects'))
+        self.assertMaxQueries(2, reverse('filter-symbol') + '?sort_by=title')
+        self.assertMaxQueries(2, reverse('project-date-sort') + '?start_date=2000-01-01&end_date=2100-01-01')
+
+    def test_task_lists(self):
+        self.assertMaxQueries(1, reverse('task-list-create'))
+        self.assertMaxQueries(1, reverse('my-tasks'))
+        self.assertMaxQueries(3, reverse('project-tasks', kwargs={'pk': self.project.id}))
+        self.assertMaxQueries(1, reverse('task-filter'))
+        self.assertMaxQueries(1, reverse('project-task-filter', kwargs={'project_id': self.project.id})
+                              + '?start_date=2000-01-01&end_date=2100-01-01')
+
+    def test_comment_list(self):
+        # Третий запрос — агрегат для ETag; при совпадении If-None-Match он единственный.
+        self.assertMaxQueries(3, reverse('comment-list-create', kwargs={'task_id': self.task.id}))
+
+    def test_profile(self):
+        self.assertMaxQueries(4, reverse('profile-view'))
+
+class NotificationDispatchTests(APITestCase):
+    def setUp(self):
+        self.user = UserAPI.objects.create_user(
+            email='testuser@example.com',
+            name='Test',
+            surname='User',
+            password='testpassword123',
+            role='Backend'
+        )
+        self.client.force_authenticate(self.user)
+        self.project = Project.objects.create(
+            title='Test Project',
+            content='Project description',
+            owner=self.user
+        )
+        self.task = Task.objects.create(
+            title='Test Task',
+            content='Task description',
+            project=self.project,
+            status='In Progress',
+            priority='Medium'
+        )
+
+    @override_settings(NOTIFICATIONS={'COALESCE_WINDOW': 0, 'DIGEST_INTERVAL': 0})
+    def test_notification_is_enqueued_after_commit(self):
+        # Фоновый поток склейки не видит транзакцию теста: очередь дописывает flush().
+        with mock.patch.object(dispatcher, 'enqueue') as enqueue, \
+                mock.patch.object(coalescer, '_ensure_started'):
+            with self.captureOnCommitCallbacks() as callbacks:
+                response = self.client.patch(
+                    reverse('assign_user_to_task', kwargs={'task_id': self.task.id}),
+                    data={'user_id': self.user.id}, format='json'
+                )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            enqueue.assert_not_called()
+            for callback in callbacks:
+                callback()
+            coalescer.flush()
+        enqueue.assert_any_call(f'user_{self.user.id}', {
+            'type': 'send_notification',
+            'message': {'message': f"Вы назначены ответственным за задачу '{self.task.title}'.", 'seq': 1},
+        })
+        groups = [call.args[0] for call in enqueue.call_args_list]
+        self.assertEqual(sorted(groups), sorted([f'user_{self.user.id}', f'project_{self.project.id}']))
+
+    @override_settings(CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}})
+    def test_dispatcher_delivers_to_channel_layer(self):
+        channel_layer = get_channel_layer()
+        channel = async_to_sync(channel_layer.new_channel)()
+        async_to_sync(channel_layer.group_add)('user_1', channel)
+
+        notifications = NotificationDispatcher(batch_size=10)
+        event = {'type': 'send_notification', 'message': {'message': 'hello'}}
+        for _ in range(3):
+            notifications.enqueue('user_1', event)
+        notifications.flush()
+
+        for _ in range(3):
+            self.assertEqual(async_to_sync(channel_layer.receive)(channel), event)
+
+
+class NotificationCoalescerTests(TransactionTestCase):
+    # Входящие пишет фоновый поток склейки: ему нужны зафиксированные данные.
+    def setUp(self):
+        self.events = []
+        self.coalescer = NotificationCoalescer(sink=lambda group, event: self.events.append((group, event)))
+        self.online = UserAPI.objects.create_user(email='online@example.com', name='On', surname='Line',
+                                                  password='testpassword123')
+        self.offline = UserAPI.objects.create_user(email='offline@example.com', name='Off', surname='Line',
+                                                   password='testpassword123')
+
+    @override_settings(NOTIFICATIONS={'COALESCE_WINDOW': 60, 'DIGEST_INTERVAL': 300, 'DIGEST_SIZE': 20})
+    def test_burst_for_one_task_is_merged(self):
+        user_connected(self.online.id)
+        for i in range(3):
+            self.coalescer.add(self.online.id, f'Edit {i}', task_id=10)
+        self.coalescer.add(self.online.id, 'Other task', task_id=11)
+        self.assertEqual(self.events, [])
+
+        self.coalescer.flush()
+        messages = {event['message'].get('task'): event['message'] for _, event in self.events}
+        self.assertEqual(len(self.events), 2)
+        self.assertEqual(messages[10]['count'], 3)
+        self.assertEqual(messages[10]['message'], 'Edit 2')
+        self.assertEqual(messages[10]['seq'], 3)
+        self.assertEqual(messages[None], {'message': 'Other task', 'seq': 4})
+
+    @override_settings(NOTIFICATIONS={'COALESCE_WINDOW': 0.01, 'DIGEST_INTERVAL': 300, 'DIGEST_SIZE': 2})
+    def test_offline_user_gets_single_digest(self):
+        # Присутствие проверяет фоновый поток.
+        with mock.patch('main.notifications.coalescer.is_online', return_value=False):
+            for i in range(5):
+                self.coalescer.add(self.offline.id, f'Edit {i}', task_id=i % 2)
+            time.sleep(0.1)
+        self.assertEqual(self.events, [])
+
+        self.coalescer.flush()
+        self.assertEqual(len(self.events), 1)
+        group, event = self.events[0]
+        self.assertEqual(group, f'user_{self.offline.id}')
+        self.assertTrue(event['message']['digest'])
+        self.assertEqual(event['message']['count'], 5)
+        self.assertEqual(len(event['message']['messages']), 2)
+        self.assertEqual(event['message']['seq'], 5)
+
+    @override_settings(NOTIFICATIONS={'COALESCE_WINDOW': 60, 'DIGEST_INTERVAL': 300, 'DIGEST_SIZE': 2})
+    def test_inbox_is_written_before_coalescing(self):
+        self.coalescer.add_many([(self.offline.id, f'Edit {i}', 1) for i in range(5)])
+        deadline = time.monotonic() + 5
+        while Notification.objects.filter(user=self.offline).count() < 5 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.events, [])
+        self.assertEqual(
+            list(Notification.objects.filter(user=self.offline).order_by('seq').values_list('payload', flat=True)),
+            [{'message': f'Edit {i}', 'seq': i + 1} for i in range(5)],
+        )
+
+
+class PresenceTests(TestCase):
+    def test_presence_is_shared_between_workers(self):
+        # Два независимых экземпляра кэша — как в двух процессах воркеров.
+        worker_a, worker_b = DatabaseCache('main_shared_cache', {}), DatabaseCache('main_shared_cache', {})
+        presence_cache = 'main.notifications.presence.get_presence_cache'
+        with mock.patch(presence_cache, return_value=worker_a):
+            user_connected(7)
+            user_connected(7)
+        with mock.patch(presence_cache, return_value=worker_b):
+            self.assertTrue(is_online(7))
+            user_disconnected(7)
+        with mock.patch(presence_cache, return_value=worker_a):
+            self.assertTrue(is_online(7))
+            user_disconnected(7)
+            self.assertFalse(is_online(7))
+
+
+@skipUnless(connection.vendor == 'postgresql', 'PostgresChannelLayer требует PostgreSQL')
+class PostgresChannelLayerTests(TestCase):
+    def setUp(self):
+        self.layer = PostgresChannelLayer(poll_interval=0.1)
+
+    def test_group_send_reaches_members_only(self):
+        member = async_to_sync(self.layer.new_channel)()
+        outsider = async_to_sync(self.layer.new_channel)()
+        async_to_sync(self.layer.group_add)('project_1', member)
+
+        async_to_sync(self.layer.group_send)('project_1', {'type': 'send_notification', 'message': 'hi'})
+
+        self.assertEqual(async_to_sync(self.layer.receive)(member), {'type': 'send_notification', 'message': 'hi'})
+        self.assertFalse(ChannelMessage.objects.filter(channel=outsider).exists())
+
+    def test_group_discard_and_expiry(self):
+        channel = async_to_sync(self.layer.new_channel)()
+        async_to_sync(self.layer.group_add)('user_1', channel)
+        async_to_sync(self.layer.group_discard)('user_1', channel)
+        async_to_sync(self.layer.group_send)('user_1', {'type': 'send_notification'})
+        self.assertFalse(ChannelMessage.objects.exists())
+
+        async_to_sync(self.layer.group_add)('user_1', channel)
+        ChannelGroupMembership.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        async_to_sync(self.layer.group_send)('user_1', {'type': 'send_notification'})
+        self.assertFalse(ChannelMessage.objects.exists())
+
+    def test_send_respects_capacity(self):
+        layer = PostgresChannelLayer(capacity=1)
+        channel = async_to_sync(layer.new_channel)()
+        async_to_sync(layer.send)(channel, {'type': 'a'})
+        with self.assertRaises(ChannelFull):
+            async_to_sync(layer.send)(channel, {'type': 'b'})
+
+
+class PostgresChannelLayerWakeupTests(TestCase):
+    def test_receive_waits_for_notify_instead_of_polling(self):
+        layer = PostgresChannelLayer()
+        channel = async_to_sync(layer.new_channel)()
+        messages = iter([None, {'type': 'a'}])
+        # Таблицу receive() читает только при старте и после пробуждения.
+        with mock.patch.object(layer, '_ensure_listener'), \
+                mock.patch.object(layer, '_pop', side_effect=lambda name: next(messages)) as pop:
+            async def scenario():
+                receiving = asyncio.ensure_future(layer.receive(channel))
+                while pop.call_count < 1 or channel not in layer._waiters:
+                    await asyncio.sleep(0.01)
+                await asyncio.sleep(1.5)
+                self.assertEqual(pop.call_count, 1)
+                await asyncio.get_running_loop().run_in_executor(None, layer._wake, {channel})
+                return await asyncio.wait_for(receiving, 5)
+
+            self.assertEqual(async_to_sync(scenario)(), {'type': 'a'})
+        self.assertEqual(pop.call_count, 2)
+        self.assertEqual(layer._waiters, {})
+
+
+class SparseFieldsTests(APITestCase):
+    def setUp(self):
+        self.user = UserAPI.objects.create_user(
+            email='testuser@example.com',
+            name='Test',
+            surname='User',
+            password='testpassword123',
+            role='Backend'
+        )
+        self.client.force_authenticate(self.user)
+        self.project = Project.objects.create(
+            title='Test Project',
+            content='Project description',
+            owner=self.user
+        )
+        self.project.participants.add(self.user)
+        self.task = Task.objects.create(
+            title='Test Task',
+            content='Task description',
+            project=self.project,
+            status='In Progress',
+            priority='Medium'
+        )
+
+    def test_fields_narrow_payload_and_select(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('task-list-create') + '?fields=id,title,status,priority')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data['results'][0]), {'id', 'title', 'status', 'priority'})
+        self.assertNotIn('"content"', queries.captured_queries[-1]['sql'])
+
+    def test_exclude_skips_participants_prefetch(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('project-list-create') + '?exclude=participants,content')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('participants', response.data['results'][0])
+        self.assertNotIn('content', response.data['results'][0])
+        self.assertEqual(len(queries), 1)
+
+    def test_fields_on_retrieve(self):
+        response = self.client.get(reverse('task-retrieve', kwargs={'pk': self.task.id}) + '?fields=id,title')
+        self.assertEqual(response.data, {'id': self.task.id, 'title': 'Test Task'})
+
+
+class RendererTests(APITestCase):
+    def setUp(self):
+        self.user = UserAPI.objects.create_user(
+            email='testuser@example.com',
+            name='Test',
+            surname='User',
+            password='testpassword123',
+            role='Backend'
+        )
+        self.client.force_authenticate(self.user)
+        self.project = Project.objects.create(
+            title='Test Project',
+            content='Project description',
+            owner=self.user
+        )
+        self.task = Task.objects.create(
+            title='Test Task',
+            content='Task description',
+            project=self.project,
+            status='In Progress',
+            priority='Medium'
+        )
+
+    def test_msgpack_selected_by_accept_header(self):
+        response = self.client.get(
+            reverse('task-retrieve', kwargs={'pk': self.task.id}),
+            HTTP_ACCEPT='application/msgpack'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        self.assertEqual(msgpack.unpackb(response.content)['title'], 'Test Task')
+
+    def test_json_is_default(self):
+        response = self.client.get(reverse('task-retrieve', kwargs={'pk': self.task.id}))
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(orjson.loads(response.content)['id'], self.task.id)
+
+    def test_datetime_and_decimal(self):
+        moment = timezone.now()
+        data = {'at': moment, 'amount': Decimal('1.50')}
+        self.assertEqual(orjson.loads(ORJSONRenderer().render(data)),
+                         {'at': moment.isoformat(), 'amount': 1.5})
+        self.assertEqual(msgpack.unpackb(MessagePackRenderer().render(data))['amount'], 1.5)
+
+    def test_msgpack_request_body(self):
+        body = msgpack.packb({'title': 'Packed Task', 'content': 'Body', 'project': self.project.id,
+                              'status': 'Dev', 'priority': 'Low'})
+        self.project.participants.add(self.user)
+        response = self.client.post(reverse('task-list-create'), data=body, content_type='application/msgpack')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_msgpack_unhashable_map_key_is_bad_request(self):
+        # {{}: 1}: словарь в роли ключа; без strict_map_key msgpack бросает TypeError.
+        body = b'\x81\x80\x01'
+        self.project.participants.add(self.user)
+        lenient = functools.partial(msgpack.unpackb, strict_map_key=False)
+        for unpackb in (msgpack.unpackb, lenient):
+            with mock.patch('main.renderers.msgpack.unpackb', unpackb):
+                response = self.client.post(reverse('task-list-create'), data=body,
+                                            content_type='application/msgpack')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ExportTests(APITestCase):
+    def setUp(self):
+        self.user = UserAPI.objects.create_user(
+            email='testuser@example.com',
+            name='Test',
+            surname='User',
+            password='testpassword123',
+            role='Backend'
+        )
+        self.client.force_authenticate(self.user)
+        self.project = Project.objects.create(
+            title='Test Project',
+            content='Project description',
+            owner=self.user
+        )
+        self.project.participants.add(self.user)
+        for i, task_status in enumerate(['Dev', 'Dev', 'Done']):
+            task = Task.objects.create(
+                title=f'Task {i}',
+                content='Task description',
+                project=self.project,
+                status=task_status,
+                priority='Medium'
+            )
+            Comment.objects.create(task=task, author=self.user, content=f'Comment {i}')
+
+    def test_tasks_ndjson_with_filter(self):
+        url = reverse('project-task-export', kwargs={'project_id': self.project.id})
+        response = self.client.get(url + '?status=Dev')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).splitlines()
+        self.assertEqual([orjson.loads(line)['title'] for line in lines], ['Task 0', 'Task 1'])
+
+    def test_comments_csv(self):
+        url = reverse('project-comment-export', kwargs={'project_id': self.project.id})
+        response = self.client.get(url + '?format=csv')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        rows = list(csv.reader(b''.join(response.streaming_content).decode().splitlines()))
+        self.assertEqual(rows[0][:3], ['id', 'task', 'author'])
+        self.assertEqual(len(rows), 4)
+
+    async def test_asgi_export_is_streamed_in_chunks(self):
+        token = str(AccessToken.for_user(self.user))
+        url = reverse('project-task-export', kwargs={'project_id': self.project.id})
+        with mock.patch.object(NDJSONRenderer, 'rows_per_chunk', 1):
+            response = await self.async_client.get(url, headers={'Authorization': f'Bearer {token}'})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertTrue(response.is_async)
+            chunks = [chunk async for chunk in response.streaming_content]
+        self.assertEqual([orjson.loads(chunk)['title'] for chunk in chunks], ['Task 0', 'Task 1', 'Task 2'])
+
+    def test_export_requires_membership(self):
+        outsider = UserAPI.objects.create_user(
+            email='outsider@example.com', name='Out', surname='Sider', password='testpassword123'
+        )
+        self.client.force_authenticate(outsider)
+        response = self.client.get(reverse('project-task-export', kwargs={'project_id': self.project.id}))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class TaskBulkTests(APITestCase):
+    def setUp(self):
+        self.user = UserAPI.objects.create_user(
+            email='testuser@example.com',
+            name='Test',
+            surname='User',
+            password='testpassword123',
+            role='Backend'
+        )
+        self.client.force_authenticate(self.user)
+        self.project = Project.objects.create(
+            title='Test Project',
+            content='Project description',
+            owner=self.user
+        )
+        self.project.participants.add(self.user)
+        self.foreign_project = Project.objects.create(
+            title='Foreign Project',
+            content='Project description',
+            owner=self.user
+        )
+
+    def task_payload(self, i, project=None):
+        return {
+            'title': f'Task {i}',
+            'content': 'Task description',
+            'project': (project or self.project).id,
+            'status': 'Dev',
+            'priority': 'Low',
+            'assigned_to': self.user.id,
+        }
+
+    def test_bulk_create_in_fixed_queries(self):
+        payload = [self.task_payload(i) for i in range(20)]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('task-bulk'), data=payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Task.objects.count(), 20)
+        # 6 из них — запись роли в общий кэш членства (DatabaseCache) при холодном кэше.
+        self.assertLessEqual(len(queries), 15)
+
+    def test_bulk_create_reports_item_errors(self):
+        payload = [self.task_payload(0), {'title': 'No project'}, self.task_payload(2, self.foreign_project)]
+        response = self.client.post(reverse('task-bulk'), data=payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([error['index'] for error in response.data['errors']], [1, 2])
+        self.assertFalse(Task.objects.exists())
+
+    def test_bulk_update_and_delete(self):
+        tasks = Task.objects.bulk_create([
+            Task(title=f'Task {i}', content='', project=self.project, status='Dev', priority='Low')
+            for i in range(3)
+        ])
+        payload = [{'id': task.id, 'status': 'Done'} for task in tasks]
+        response = self.client.patch(reverse('task-bulk'), data=payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(Task.objects.values_list('status', flat=True)), {'Done'})
+
+        response = self.client.delete(reverse('task-bulk'), data=[task.id for task in tasks], format='json')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Task.objects.exists())
+
+    def test_bulk_update_rejects_duplicate_ids(self):
+        task = Task.objects.create(title='Task', content='', project=self.project, status='Dev', priority='Low')
+        payload = [{'id': task.id, 'status': 'Done'}, {'id': task.id, 'priority': 'High'}]
+        response = self.client.patch(reverse('task-bulk'), data=payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([error['index'] for error in response.data['errors']], [1])
+        task.refresh_from_db()
+        self.assertEqual((task.status, task.priority), ('Dev', 'Low'))
+
+    def test_bulk_update_rejects_invalid_ids(self):
+        task = Task.objects.create(title='Task', content='', project=self.project, status='Dev', priority='Low')
+        payload = [{'id': [task.id], 'status': 'Done'}, {'id': {'pk': task.id}}, {'status': 'Done'},
+                   {'id': True}, 'text', {'id': task.id, 'status': 'Done'}]
+        response = self.client.patch(reverse('task-bulk'), data=payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([error['index'] for error in response.data['errors']], [0, 1, 2, 3, 4])
+        self.assertEqual(Task.objects.get().status, 'Dev')
+
+
+@override_settings(SYNC={'OVERLAP_SECONDS': 0, 'TOMBSTONE_RETENTION_DAYS': 30})
+class SyncTests(APITestCase):
+    def setUp(self):
+        self.user = UserAPI.objects.create_user(email='sync@example.com', name='Sync', surname='User',
+                                                password='testpassword123')
+        self.colleague = UserAPI.objects.create_user(email='colleague@example.com', name='Col', surname='League',
+                                                     password='testpassword123')
+        self.client.force_authenticate(self.user)
+        self.project = Project.objects.create(title='Project', content='Text', owner=self.user)
+        self.project.participants.add(self.user, self.colleague)
+        self.task = Task.objects.create(title='Task', content='', project=self.project, status='Dev', priority='Low')
+        self.comment = Comment.objects.create(task=self.task, author=self.user, content='Comment')
+
+    def sync(self, cursor=None, client=None, **params):
+        if cursor:
+            params['since'] = cursor
+        response = (client or self.client).get(reverse('sync'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_full_then_delta(self):
+        full = self.sync()
+        self.assertEqual([task['id'] for task in full['tasks']], [self.task.id])
+        self.assertEqual(len(full['memberships']), 2)
+
+        delta = self.sync(full['cursor'])
+        self.assertEqual(delta['tasks'], [])
+        self.assertEqual(delta['comments'], [])
+
+        untouched = Task.objects.create(title='Old', content='', project=self.project, status='Dev', priority='Low')
+        cursor = self.sync(full['cursor'])['cursor']
+        new_task = Task.objects.create(title='New', content='', project=self.project, status='Dev', priority='Low')
+        comment_id = self.comment.id
+        self.comment.delete()
+        delta = self.sync(cursor)
+        self.assertEqual([task['id'] for task in delta['tasks']], [new_task.id])
+        self.assertNotIn(untouched.id, [task['id'] for task in delta['tasks']])
+        self.assertEqual(delta['deleted']['comments'], [comment_id])
+
+    def test_removed_member_and_deleted_project(self):
+        colleague_client = self.client_class()
+        colleague_client.force_authenticate(self.colleague)
+        cursor = self.sync(client=colleague_client)['cursor']
+
+        self.project.participants.remove(self.colleague)
+        delta = self.sync(cursor, client=colleague_client)
+        self.assertEqual(len(delta['deleted']['memberships']), 1)
+        self.assertEqual(delta['tasks'], [])
+
+        cursor = self.sync()['cursor']
+        project_id = self.project.id
+        self.project.delete()
+        self.assertEqual(self.sync(cursor)['deleted']['projects'], [project_id])
+
+    def test_queryset_and_bulk_deletes_leave_tombstones(self):
+        cursor = self.sync()['cursor']
+        bulk_task = Task.objects.create(title='Bulk', content='', project=self.project, status='Dev', priority='Low')
+        task_id = self.task.id
+        Task.objects.filter(pk=task_id).delete()
+        self.client.delete(reverse('task-bulk'), data=[bulk_task.id], format='json')
+        self.assertEqual(sorted(self.sync(cursor)['deleted']['tasks']), sorted([task_id, bulk_task.id]))
+        self.assertEqual(Tombstone.objects.filter(kind='task', object_id=bulk_task.id).count(), 1)
+
+    def test_pages_until_caught_up(self):
+        cursor = self.sync()['cursor']
+        tasks = [Task.objects.create(title=f'T{i}', content='', project=self.project, status='Dev', priority='Low')
+                 for i in range(5)]
+        deleted_ids = [task.id for task in tasks[3:]]
+        Task.objects.filter(id__in=deleted_ids).delete()
+
+        pages = []
+        while True:
+            page = self.sync(cursor, limit=2)
+            pages.append(page)
+            cursor = page['cursor']
+            if not page['has_more']:
+                break
+        self.assertEqual([[task['id'] for task in page['tasks']] for page in pages],
+                         [[tasks[0].id, tasks[1].id], [tasks[2].id]])
+        self.assertEqual(sorted(task_id for page in pages for task_id in page['deleted']['tasks']), deleted_ids)
+        self.assertEqual(self.sync(cursor)['tasks'], [])
+
+    def test_moved_task_is_deleted_for_old_project_members(self):
+        other = Project.objects.create(title='Other', content='Text', owner=self.user)
+        other.participants.add(self.user)
+        bulk_task = Task.objects.create(title='Bulk', content='', project=self.project, status='Dev', priority='Low')
+        colleague_client = self.client_class()
+        colleague_client.force_authenticate(self.colleague)
+        colleague_cursor = self.sync(client=colleague_client)['cursor']
+        cursor = self.sync()['cursor']
+
+        self.client.patch(reverse('task-update', kwargs={'pk': self.task.id}), data={'project': other.id},
+                          format='json')
+        self.client.patch(reverse('task-bulk'), data=[{'id': bulk_task.id, 'project': other.id}], format='json')
+
+        delta = self.sync(colleague_cursor, client=colleague_client)
+        self.assertEqual(sorted(delta['deleted']['tasks']), sorted([self.task.id, bulk_task.id]))
+        # Участник обоих проектов получает задачи в новом проекте, а не их удаление.
+        delta = self.sync(cursor)
+        self.assertEqual(delta['deleted']['tasks'], [])
+        self.assertEqual(sorted(task['id'] for task in delta['tasks']), sorted([self.task.id, bulk_task.id]))
+
+    def test_invalid_and_expired_cursor(self):
+        response = self.client.get(reverse('sync'), {'since': 'garbage'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        forged = encode_cursor(timezone.now(), timezone.now(), {'tasks': 'x'})
+        self.assertEqual(self.client.get(reverse('sync'), {'since': forged}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(reverse('sync'), {'limit': 0}).status_code, status.HTTP_400_BAD_REQUEST)
+        old = encode_cursor(timezone.now() - timedelta(days=31))
+        self.assertEqual(self.client.get(reverse('sync'), {'since': old}).status_code, status.HTTP_410_GONE)
+
+
+class ResponseCacheTests(APITestCase):
+    def setUp(self):
+        self.user = UserAPI.objects.create_user(email='cache@example.com', name='Cache', surname='User',
+                                                password='testpassword123')
+        self.colleague = UserAPI.objects.create_user(email='cache2@example.com', name='Col', surname='League',
+                                                     password='testpassword123')
+        self.client.force_authenticate(self.user)
+        self.project = Project.objects.create(title='Project', content='Text', owner=self.user)
+        self.project.participants.add(self.user)
+        Task.objects.create(title='Task', content='', project=self.project, status='Dev', priority='Low')
+        cache_stats.clear()
+
+    def test_project_retrieve_hit_and_invalidation(self):
+        url = reverse('project-retrieve', kwargs={'pk': self.project.id})
+        self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+
+        self.project.title = 'Renamed'
+        self.project.save()
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['title'], 'Renamed')
+        self.assertEqual(cache_stats.snapshot()['project_retrieve'], {'hits': 1, 'misses': 2})
+
+    def test_invalidation_reaches_other_workers(self):
+        url = reverse('project-retrieve', kwargs={'pk': self.project.id})
+        self.client.get(url)
+        # Так сбрасывает поколение invalidate() в другом воркере: локальный кэш этого не видит.
+        CacheGeneration.objects.filter(scope=project_scope(self.project.id)).update(generation='other-worker')
+        self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+
+    def test_membership_and_task_writes_invalidate(self):
+        my_projects = reverse('my-projects')
+        tasks = reverse('project-tasks', kwargs={'pk': self.project.id})
+        self.client.get(my_projects)
+        self.client.get(tasks)
+
+        self.project.participants.add(self.colleague)
+        response = self.client.get(my_projects)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertIn(self.colleague.id, response.data['results'][0]['participants'])
+
+        self.client.post(reverse('task-bulk'), data=[{'title': 'Bulk', 'content': 'Text', 'project': self.project.id,
+                                                      'status': 'Dev', 'priority': 'Low'}], format='json')
+        response = self.client.get(tasks)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(len(response.data['results']), 2)
+
+    def test_stats_endpoint_is_admin_only(self):
+        self.assertEqual(self.client.get(reverse('response-cache-stats')).status_code, status.HTTP_403_FORBIDDEN)
+
+
+class ProjectStatsTests(APITestCase):
+    def setUp(self):
+        self.user = UserAPI.objects.create_user(email='stats@example.com', name='Stats', surname='User',
+                                                password='testpassword123')
+        self.other = UserAPI.objects.create_user(email='stats2@example.com', name='Other', surname='User',
+                                                 password='testpassword123')
+        self.client.force_authenticate(self.user)
+        self.project = Project.objects.create(title='Project', content='Text', owner=self.user)
+        self.second = Project.objects.create(title='Second', content='Text', owner=self.user)
+        self.project.participants.add(self.user, self.other)
+        self.second.participants.add(self.user)
+
+    def counters(self):
+        fields = ['tasks_total', 'status_done', 'status_dev', 'priority_low', 'priority_high']
+        return (
+            sorted(ProjectStats.objects.filter(tasks_total__gt=0).values_list('project_id', *fields)),
+            sorted(ProjectAssigneeStats.objects.filter(tasks_total__gt=0).values_list('project_id', 'user_id', *fields)),
+        )
+
+    def assertMatchesRebuild(self):
+        maintained = self.counters()
+        call_command('rebuild_project_stats', stdout=io.StringIO())
+        self.assertEqual(maintained, self.counters())
+
+    def test_counters_follow_task_changes(self):
+        task = Task.objects.create(project=self.project, title='A', content='', status='Dev', priority='Low',
+                                   assigned_to=self.user)
+        Task.objects.create(project=self.project, title='B', content='', status='Done', priority='High',
+                            deadline=timezone.now() - timedelta(days=1))
+        Task.objects.create(project=self.project, title='C', content='', status='Dev', priority='High',
+                            deadline=timezone.now() - timedelta(days=1))
+        self.assertMatchesRebuild()
+
+        self.client.patch(reverse('task-update', kwargs={'pk': task.id}),
+                          data={'status': 'Done', 'assigned_to': self.other.id}, format='json')
+        task.refresh_from_db()
+        task.project = self.second
+        task.save()
+        task.priority = 'High'
+        task.save()
+        self.assertMatchesRebuild()
+
+        response = self.client.get(reverse('project-stats', kwargs={'pk': self.project.id}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data['total'], response.data['open'], response.data['overdue']), (2, 1, 1))
+        self.assertEqual(response.data['by_priority'], {'Low': 0, 'Medium': 0, 'High': 2})
+
+        task.delete()
+        self.assertMatchesRebuild()
+
+    def test_bulk_paths_update_counters(self):
+        bulk = reverse('task-bulk')
+        items = [{'title': f'T{i}', 'content': 'Text', 'project': self.project.id, 'status': 'Dev',
+                  'priority': 'Low', 'assigned_to': self.other.id} for i in range(3)]
+        ids = [item['id'] for item in self.client.post(bulk, data=items, format='json').data]
+        self.assertMatchesRebuild()
+
+        self.client.patch(bulk, data=[{'id': ids[0], 'status': 'Done'}, {'id': ids[1], 'project': self.second.id}],
+                          format='json')
+        self.assertMatchesRebuild()
+
+        self.client.delete(bulk, data=ids[1:], format='json')
+        self.assertMatchesRebuild()
+        self.assertEqual(ProjectStats.objects.get(project=self.project).tasks_total, 1)
+
+    def test_queryset_delete_updates_counters(self):
+        # Так удаляет задачи действие «delete selected» в админке.
+        for title in 'ABC':
+            Task.objects.create(project=self.project, title=title, content='', status='Dev', priority='Low',
+                                assigned_to=self.other)
+        Task.objects.filter(project=self.project, title__in=['A', 'B']).delete()
+        self.assertMatchesRebuild()
+        self.assertEqual(ProjectStats.objects.get(project=self.project).tasks_total, 1)
+
+    def test_migration_backfills_existing_projects(self):
+        Task.objects.create(project=self.project, title='A', content='', status='Done', priority='High',
+                            assigned_to=self.other)
+        Task.objects.create(project=self.second, title='B', content='', status='Dev', priority='Low')
+        expected = self.counters()
+        ProjectStats.objects.all().delete()
+        ProjectAssigneeStats.objects.all().delete()
+
+        migration = importlib.import_module('main.migrations.0007_project_stats')
+        migration.backfill_project_stats(django_apps, SimpleNamespace(connection=connection))
+        self.assertEqual(self.counters(), expected)
+        self.assertEqual(ProjectStats.objects.count(), Project.objects.count())
+
+    def test_overdue_follows_current_time(self):
+        Task.objects.create(project=self.project, title='A', content='', status='Dev', priority='Low',
+                            deadline=timezone.now() + timedelta(hours=1))
+        url = reverse('project-stats', kwargs={'pk': self.project.id})
+        self.assertEqual(self.client.get(url).data['overdue'], 0)
+
+        later = timezone.now() + timedelta(hours=2)
+        with mock.patch('main.stats.timezone.now', return_value=later):
+            self.assertEqual(self.client.get(url).data['overdue'], 1)
+
+    def test_stats_require_participation(self):
+        outsider = Project.objects.create(title='Outsider', content='Text', owner=self.other)
+        response = self.client.get(reverse('project-stats', kwargs={'pk': outsider.id}))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class ProjectAnalyticsTests(APITestCase):
+    def setUp(self):
+        get_response_cache().clear()
+        self.user = UserAPI.objects.create_user(email='analytics@example.com', name='Analytics', surname='User',
+                                                password='testpassword123')
+        self.client.force_authenticate(self.user)
+        self.project = Project.objects.create(title='Project', content='Text', owner=self.user)
+        self.project.participants.add(self.user)
+
+        now = timezone.now()
+        self.open_task = self.create_task('Open', 'Dev', 'High', now - timedelta(days=3), now - timedelta(days=3),
+                                          deadline=now - timedelta(days=1))
+        self.create_task('Fast', 'Done', 'High', now - timedelta(days=5), now - timedelta(days=4))
+        self.create_task('Slow', 'Done', 'Low', now - timedelta(days=10), now - timedelta(days=8))
+        self.create_task('Old', 'Done', 'Low', now - timedelta(days=210), now - timedelta(days=200))
+
+    def create_task(self, title, task_status, priority, created_at, updated_at, **kwargs):
+        task = Task.objects.create(project=self.project, title=title, content='', status=task_status,
+                                   priority=priority, **kwargs)
+        Task.objects.filter(pk=task.pk).update(created_at=created_at, updated_at=updated_at)
+        return task
+
+    def get(self, name, **params):
+        return self.client.get(reverse(name, kwargs={'pk': self.project.id}), params)
+
+    def test_columns_keep_microseconds_and_nulls(self):
+        columns = load_columns(self.project.id)
+        for column, field in ((columns.created, 'created_at'), (columns.deadline, 'deadline')):
+            values = Task.objects.filter(project=self.project).values_list(field, flat=True)
+            expected = sorted(np.datetime64(value.astimezone(dt_timezone.utc).replace(tzinfo=None), 'us')
+                              for value in values if value is not None)
+            self.assertEqual(list(np.sort(column[~np.isnat(column)])), expected)
+        self.assertEqual(int(np.count_nonzero(np.isnat(columns.deadline))), 3)
+
+    def test_cycle_time_percentiles(self):
+        response = self.get('project-cycle-time', weeks=12, percentiles='50,100')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['completed'], 2)
+        self.assertEqual(response.data['mean_hours'], 36.0)
+        self.assertEqual(response.data['percentiles'], {'50': 36.0, '100': 48.0})
+        self.assertEqual(response.data['by_priority']['Low'], {'completed': 1, 'percentiles': {'50': 48.0, '100': 48.0}})
+        self.assertEqual(response.data['by_priority']['Medium']['percentiles'], {'50': None, '100': None})
+
+    def test_throughput_and_burndown(self):
+        weeks = self.get('project-throughput', weeks=3).data['weeks']
+        self.assertEqual(len(weeks), 3)
+        self.assertEqual(sum(week['created'] for week in weeks), 3)
+        self.assertEqual(sum(week['completed'] for week in weeks), 2)
+
+        points = self.get('project-burndown', days=30).data['points']
+        self.assertEqual(len(points), 30)
+        self.assertEqual(points[0], {'date': points[0]['date'], 'scope': 1, 'remaining': 0, 'overdue': 0})
+        self.assertEqual(points[-1]['date'], timezone.localdate().isoformat())
+        self.assertEqual((points[-1]['scope'], points[-1]['remaining'], points[-1]['overdue']), (4, 1, 1))
+
+    def test_results_are_cached_until_tasks_change(self):
+        self.get('project-burndown')
+        with CaptureQueriesContext(connection) as queries:
+            self.get('project-burndown')
+        self.assertFalse(any('"main_task"."created_at"' in query['sql'] for query in queries.captured_queries))
+
+        self.client.patch(reverse('task-update', kwargs={'pk': self.open_task.id}), data={'status': 'Done'},
+                          format='json')
+        last = self.get('project-burndown').data['points'][-1]
+        self.assertEqual((last['remaining'], last['overdue']), (0, 0))
+
+    def test_invalid_parameters_and_access(self):
+        self.assertEqual(self.get('project-throughput', weeks=0).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.get('project-burndown', days='x').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.get('project-cycle-time', percentiles='50,abc').status_code,
+                         status.HTTP_400_BAD_REQUEST)
+
+        outsider = UserAPI.objects.create_user(email='outsider@example.com', name='Out', surname='Sider',
+                                               password='testpassword123')
+        self.client.force_authenticate(outsider)
+        self.assertEqual(self.get('project-burndown').status_code, status.HTTP_403_FORBIDDEN)
+
+
+class SeedDataTests(TestCase):
+    def test_seed_data_builds_consistent_dataset(self):
+        call_command('seed_data', users=20, projects=5, tasks=300, comments=500, batch_size=100,
+                     stdout=io.StringIO())
+        self.assertEqual(UserAPI.objects.filter(email__startswith='seed-').count(), 20)
+        self.assertEqual(Task.objects.count(), 300)
+        self.assertEqual(Comment.objects.count(), 500)
+        # Исполнители и авторы комментариев — участники проекта задачи.
+        self.assertFalse(Task.objects.filter(assigned_to__isnull=False)
+                         .exclude(project__participants=F('assigned_to')).exists())
+        self.assertFalse(Comment.objects.exclude(task__project__participants=F('author')).exists())
+
+
+class PerformanceBudgetTests(APITestCase):
+    """
+    Бюджеты запросов и задержки маршрутов main/urls.py (@performance_budget у представлений).
+
+    Данные — seed_data небольшого масштаба, запросы — сценарии loadtest плюс
+    удаляющие маршруты ниже. Каждый замер идёт с пустыми кэшами. При
+    превышении бюджета тест печатает дифф SQL против снимка из
+    main/query_snapshots/; обновить снимки:
+        UPDATE_QUERY_SNAPSHOTS=1 python manage.py test main.tests.PerformanceBudgetTests
+    """
+
+    snapshot_dir = Path(__file__).resolve().parent / 'query_snapshots'
+    runs = 3
+    # Маршруты без бюджета: WebSocket и скачивание файла отчёта без обращений к базе.
+    exempt = {'ws-notifications', 'profile-report'}
+    staff_routes = {'response-cache-stats', 'profile-report-list'}
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_data', users=30, projects=5, tasks=250, comments=500, batch_size=250,
+                     stdout=io.StringIO())
+
+    def setUp(self):
+        loadtest = LoadTestCommand()
+        self.context = loadtest.build_context(password='seedpassword123')
+        self.user = self.context['user']
+        self.staff = UserAPI.objects.create_user(email='budget-staff@example.com', name='Staff', surname='User',
+                                                 password='testpassword123', is_staff=True)
+        self.scenarios = {name: dict(variants) for name, variants in loadtest.scenarios(self.context).items()}
+        self.scenarios.update(self.destructive_scenarios())
+
+    def destructive_scenarios(self):
+        user, project = self.user, self.context['project']
+
+        def fresh_project():
+            fresh = Project.objects.create(title='Budget', content='Text', owner=user)
+            fresh.participants.add(user)
+            return fresh
+
+        def fresh_task(**kwargs):
+            return Task.objects.create(title='Budget', content='Text', project=project, status='Dev', priority='Low',
+                                       **kwargs)
+
+        def outsider():
+            return UserAPI.objects.create_user(email=f'budget-{time.time_ns()}@example.com', name='Out',
+                                               surname='Sider', password='testpassword123')
+
+        def remove_participant():
+            member = outsider()
+            project.participants.add(member)
+            return reverse('remove-participant', kwargs={'project_id': project.id, 'user_id': member.id}), None
+
+        return {
+            'project-destroy': {'DELETE': lambda: (reverse('project-destroy', kwargs={'pk': fresh_project().id}), None)},
+            'task-destroy': {'DELETE': lambda: (reverse('task-destroy', kwargs={'pk': fresh_task().id}), None)},
+            'unassign_user_from_task': {'DELETE': lambda: (
+                reverse('unassign_user_from_task', kwargs={'pk': fresh_task(assigned_to=user).id}), None)},
+            'add-participant': {'POST': lambda: (reverse('add-participant', kwargs={'project_id': project.id}),
+                                                 {'user': outsider().id, 'role': 'developer'})},
+            'remove-participant': {'DELETE': remove_participant},
+            'log-out-user': {'POST': lambda: (reverse('log-out-user'), {'refresh': str(RefreshToken.for_user(user))})},
+            'response-cache-stats': {'GET': lambda: (reverse('response-cache-stats'), None)},
+            'profile-report-list': {'GET': lambda: (reverse('profile-report-list'), None)},
+        }
+
+    def test_every_route_declares_budget(self):
+        missing = [pattern.name for pattern in main_urls.urlpatterns
+                   if pattern.name not in self.exempt and not get_budgets(pattern.callback)]
+        self.assertEqual(missing, [])
+
+    def test_routes_within_budget(self):
+        for pattern in main_urls.urlpatterns:
+            for method, budget in get_budgets(pattern.callback).items():
+                with self.subTest(route=pattern.name, method=method):
+                    self.check_budget(pattern.name, method, budget)
+
+    def call(self, name, method):
+        path, body = self.scenarios[name][method]()
+        cache.clear()
+        get_response_cache().clear()
+        self.client.force_authenticate(self.staff if name in self.staff_routes else self.user)
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = getattr(self.client, method.lower())(path, data=body, format='json')
+            elapsed = (time.perf_counter() - started) * 1000
+            if response.streaming:
+                b''.join(response.streaming_content)
+        self.assertLess(response.status_code, 400, f'{method} {path}: {response.status_code}')
+        return [normalize_sql(query['sql']) for query in captured.captured_queries], elapsed
+
+    def check_budget(self, name, method, budget):
+        self.assertIn(method, self.scenarios.get(name, {}), f'Нет сценария для {method} {name}')
+        self.call(name, method)
+        queries, timings = None, []
+        for _ in range(self.runs):
+            queries, elapsed = self.call(name, method)
+            timings.append(elapsed)
+
+        snapshot = self.snapshot_dir / f'{name}.{method.lower()}.sql'
+        if os.environ.get('UPDATE_QUERY_SNAPSHOTS'):
+            self.snapshot_dir.mkdir(exist_ok=True)
+            snapshot.write_text(''.join(f'{query}\n' for query in queries), encoding='utf-8')
+
+        if len(queries) > budget.queries:
+            expected = snapshot.read_text(encoding='utf-8').splitlines() if snapshot.exists() else []
+            diff = '\n'.join(difflib.unified_diff(expected, queries, 'snapshot', 'actual', lineterm=''))
+            self.fail(f'{method} {name}: {len(queries)} запросов при бюджете {budget.queries}\n'
+                      f"{diff or chr(10).join(queries)}")
+
+        latency = statistics.median(timings)
+        limit = budget.latency_ms * latency_factor()
+        self.assertLessEqual(latency, limit, f'{method} {name}: {latency:.1f} мс при бюджете {limit:.0f} мс')
+
+
+class MetricsTests(APITestCase):
+    def setUp(self):
+        self.user = UserAPI.objects.create_user(email='metrics@example.com', name='Metrics', surname='User',
+                                                password='testpassword123')
+        self.client.force_authenticate(self.user)
+        self.project = Project.objects.create(title='Project', content='Text', owner=self.user)
+        self.project.participants.add(self.user)
+        Task.objects.create(title='Task', content='', project=self.project, status='Dev', priority='Low')
+        clear_metrics()
+
+    def test_server_timing_and_histograms(self):
+        response = self.client.get(reverse('project-tasks', kwargs={'pk': self.project.id}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        timing = response['Server-Timing']
+        self.assertRegex(timing, r'^total;dur=[\d.]+, db;dur=[\d.]+;desc="\d+ queries", serialize;dur=[\d.]+$')
+
+        self.user.is_staff = True
+        self.user.save()
+        body = self.client.get('/metrics').content.decode()
+        self.assertIn('api_requests_total{view="project-tasks",method="GET",status="200"} 1', body)
+        self.assertIn('api_request_duration_seconds_count{view="project-tasks",method="GET"} 1', body)
+        self.assertIn('api_request_db_queries_bucket{view="project-tasks",method="GET",le="+Inf"} 1', body)
+
+    def test_metrics_access(self):
+        self.assertEqual(self.client.get('/metrics').status_code, status.HTTP_403_FORBIDDEN)
+        self.client.force_authenticate(None)
+        with override_settings(METRICS={'TOKEN': 'scrape'}):
+            response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer scrape')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+
+
+class ProfilingTests(APITestCase):
+    def setUp(self):
+        self.staff = UserAPI.objects.create_user(email='staff@example.com', name='Staff', surname='User',
+                                                 password='testpassword123', is_staff=True)
+        self.user = UserAPI.objects.create_user(email='plain@example.com', name='Plain', surname='User',
+                                                password='testpassword123')
+        self.project = Project.objects.create(title='Project', content='Text', owner=self.staff)
+        self.project.participants.add(self.staff, self.user)
+        self.url = reverse('project-retrieve', kwargs={'pk': self.project.id})
+        report_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(report_dir.cleanup)
+        settings_override = override_settings(PROFILING={'REPORT_DIR': report_dir.name, 'RATE_LIMIT': 1,
+                                                         'EXPLAIN_THRESHOLD_MS': 0})
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        cache.clear()
+
+    def get(self, user, **extra):
+        token = str(RefreshToken.for_user(user).access_token)
+        return self.client.get(self.url, HTTP_AUTHORIZATION=f'Bearer {token}', **extra)
+
+    def test_rate_limit_is_shared_between_workers(self):
+        self.assertTrue(acquire_profiling_slot())
+        # Другой воркер со своим подключением к общему кэшу видит тот же счётчик.
+        with mock.patch('main.profiling.caches', {'shared': DatabaseCache('main_shared_cache', {})}):
+            self.assertFalse(acquire_profiling_slot())
+
+    def test_staff_request_is_profiled_and_rate_limited(self):
+        self.assertNotIn('X-Profile-Report', self.get(self.user, HTTP_X_PROFILE='1'))
+        self.assertNotIn('X-Profile-Report', self.get(self.staff))
+
+        name = self.get(self.staff, HTTP_X_PROFILE='1')['X-Profile-Report']
+        self.assertEqual(self.get(self.staff, HTTP_X_PROFILE='1')['X-Profile-Report'], 'rate-limited')
+
+        self.client.force_authenticate(self.staff)
+        listing = self.client.get(reverse('profile-report-list'))
+        self.assertEqual([item['name'] for item in listing.data], [name])
+        report = b''.join(self.client.get(reverse('profile-report', kwargs={'name': name})).streaming_content)
+        self.assertIn(b'view: project-retrieve', report)
+        self.assertIn(b'== Slow queries ==', report)
+        self.assertIn(b'cumulative', report)
+        self.assertEqual(self.client.get(reverse('profile-report', kwargs={'name': '..evil'})).status_code,
+                         status.HTTP_404_NOT_FOUND)
+
+
+@override_settings(CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}})
+class NotificationsConsumerTests(TestCase):
+    def setUp(self):
+        self.user = UserAPI.objects.create_user(email='ws@example.com', name='Ws', surname='User',
+                                                password='testpassword123')
+        self.project = Project.objects.create(title='Board', content='Text', owner=self.user)
+        self.project.participants.add(self.user)
+        self.foreign_project = Project.objects.create(title='Foreign', content='Text', owner=self.user)
+        self.application = JWTAuthMiddleware(URLRouter(websocket_urlpatterns))
+        self.token = str(RefreshToken.for_user(self.user).access_token)
+
+    async def connect(self, path='', token=None):
+        # channels.testing требует daphne, поэтому рукопожатие собрано вручную.
+        communicator = ApplicationCommunicator(self.application, {
+            'type': 'websocket',
+            'path': f'/ws/api/v1/ws/notifications/{path}',
+            'query_string': f'token={token}'.encode() if token else b'',
+            'headers': [],
+            'subprotocols': [],
+        })
+        await communicator.send_input({'type': 'websocket.connect'})
+        return communicator, await communicator.receive_output()
+
+    @staticmethod
+    async def send_json_to(communicator, data):
+        await communicator.send_input({'type': 'websocket.receive', 'text': json.dumps(data)})
+
+    @staticmethod
+    async def receive_json_from(communicator):
+        return json.loads((await communicator.receive_output())['text'])
+
+    def test_handshake_requires_jwt(self):
+        async def scenario():
+            _, message = await self.connect()
+            self.assertEqual(message, {'type': 'websocket.close', 'code': 4401})
+
+            _, message = await self.connect(f'{self.user.id + 1}/', token=self.token)
+            self.assertEqual(message, {'type': 'websocket.close', 'code': 4403})
+        async_to_sync(scenario)()
+
+    def test_project_subscription(self):
+        async def scenario():
+            communicator, message = await self.connect(token=self.token)
+            self.assertEqual(message['type'], 'websocket.accept')
+
+            await self.send_json_to(communicator, {'action': 'subscribe', 'project': self.foreign_project.id})
+            self.assertEqual((await self.receive_json_from(communicator))['type'], 'error')
+
+            await self.send_json_to(communicator, {'action': 'subscribe', 'project': self.project.id})
+            self.assertEqual(await self.receive_json_from(communicator), {'type': 'subscribed', 'project': self.project.id})
+
+            await get_channel_layer().group_send(f'project_{self.project.id}', {
+                'type': 'project_event', 'event': 'task.updated', 'project': self.project.id, 'data': {'id': 1},
+            })
+            self.assertEqual(await self.receive_json_from(communicator),
+                             {'type': 'task.updated', 'project': self.project.id, 'data': {'id': 1}})
+
+            await get_channel_layer().group_send(f'user_{self.user.id}', {
+                'type': 'membership_revoked', 'project': self.project.id,
+            })
+            self.assertEqual((await self.receive_json_from(communicator))['type'], 'membership_revoked')
+            await get_channel_layer().group_send(f'project_{self.project.id}', {
+                'type': 'project_event', 'event': 'task.updated', 'project': self.project.id, 'data': {'id': 2},
+            })
+            self.assertTrue(await communicator.receive_nothing())
+            await communicator.send_input({'type': 'websocket.disconnect', 'code': 1000})
+            await communicator.wait()
+        async_to_sync(scenario)()
+
+
+class NotificationInboxTests(APITestCase):
+    def setUp(self):
+        self.user = UserAPI.objects.create_user(email='inbox@example.com', name='In', surname='Box',
+                                                password='testpassword123')
+        self.other = UserAPI.objects.create_user(email='inbox2@example.com', name='Out', surname='Box',
+                                                 password='testpassword123')
+        self.client.force_authenticate(self.user)
+
+    def notify(self, user, text):
+        return ('user_%d' % user.id, {'type': 'send_notification', 'message': {'message': text}})
+
+    def test_batch_gets_per_user_sequence(self):
+        project_event = ('project_1', {'type': 'project_event', 'event': 'task.updated', 'project': 1, 'data': {}})
+        batch = [self.notify(self.user, 'a'), project_event, self.notify(self.other, 'b'), self.notify(self.user, 'c')]
+        with CaptureQueriesContext(connection) as queries:
+            stored = store_notifications(batch)
+        self.assertLessEqual(len(queries), 6)
+        self.assertEqual([event.get('message', {}).get('seq') for _, event in stored], [1, None, 1, 2])
+        self.assertEqual(stored[1], project_event)
+        stored = store_notifications([self.notify(self.user, 'd')])
+        self.assertEqual(stored[0][1]['message']['seq'], 3)
+
+    def test_list_mark_read_and_compact(self):
+        store_notifications([self.notify(self.user, str(i)) for i in range(5)])
+        response = self.client.get(reverse('notification-list'), {'after_seq': 2})
+        self.assertEqual([item['seq'] for item in response.data['results']], [3, 4, 5])
+
+        response = self.client.post(reverse('notification-mark-read'), data={'up_to_seq': 3}, format='json')
+        self.assertEqual(response.data, {'updated': 3})
+        response = self.client.get(reverse('notification-list'), {'unread': 'true'})
+        self.assertEqual([item['seq'] for item in response.data['results']], [4, 5])
+
+        with override_settings(NOTIFICATIONS={'INBOX_MAX_PER_USER': 2}):
+            call_command('compact_notifications', stdout=io.StringIO())
+        self.assertEqual(list(Notification.objects.values_list('seq', flat=True).order_by('seq')), [4, 5])
+
+    @override_settings(CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}},
+                       NOTIFICATIONS={'REPLAY_LIMIT': 2})
+    def test_consumer_replays_gap(self):
+        store_notifications([self.notify(self.user, str(i)) for i in range(4)])
+        token = str(RefreshToken.for_user(self.user).access_token)
+        application = JWTAuthMiddleware(URLRouter(websocket_urlpatterns))
+
+        async def scenario():
+            communicator = ApplicationCommunicator(application, {
+                'type': 'websocket',
+                'path': '/ws/api/v1/ws/notifications/',
+                'query_string': f'token={token}&last_seq=1'.encode(),
+                'headers': [],
+                'subprotocols': [],
+            })
+            await communicator.send_input({'type': 'websocket.connect'})
+            self.assertEqual((await communicator.receive_output())['type'], 'websocket.accept')
+            received = [json.loads((await communicator.receive_output())['text']) for _ in range(3)]
+            await communicator.send_input({'type': 'websocket.disconnect', 'code': 1000})
+            await communicator.wait()
+            return received
+
+        received = async_to_sync(scenario)()
+        self.assertEqual([item['message']['seq'] for item in received[:2]], [2, 3])
+        self.assertEqual(received[2], {'type': 'replay_truncated', 'seq': 3})
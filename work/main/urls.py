@@ -15,6 +15,10 @@ urlpatterns = [
     path('projects/update/<int:pk>/', project_update, name='project-update'),
     path('projects/delete/<int:pk>/', project_destroy, name='project-destroy'),
     path('project/<int:pk>/tasks/', ProjectTaskListView.as_view(), name='project-tasks'),
+    path('projects/<int:pk>/stats/', project_stats, name='project-stats'),
+    path('projects/<int:pk>/analytics/cycle-time/', project_cycle_time, name='project-cycle-time'),
+    path('projects/<int:pk>/analytics/throughput/', project_throughput, name='project-throughput'),
+    path('projects/<int:pk>/analytics/burndown/', project_burndown, name='project-burndown'),
 
 
     path('projects/<int:project_id>/add-participant/', add_participant, name='add-participant'),
@@ -30,6 +34,7 @@ urlpatterns = [
     path('tasks/<int:task_id>/assign/', assign_user_to_task, name='assign_user_to_task'),
     path('tasks/<int:pk>/unassign/', unassign_user_from_task, name='unassign_user_from_task'),
     path('task/filter/', TaskFilterView.as_view(), name='task-filter'),
+    path('task/bulk/', task_bulk, name='task-bulk'),
 
 
     path('signup/', sign_up_user, name='sign-up-user'),
@@ -47,6 +52,18 @@ urlpatterns = [
     path('projects/filter/date/', ProjectDateRangeFilterView.as_view(), name='project-date-sort'),
 
 
+    path('projects/<int:project_id>/tasks/export/', ProjectTaskExportView.as_view(), name='project-task-export'),
+    path('projects/<int:project_id>/comments/export/', ProjectCommentExportView.as_view(), name='project-comment-export'),
+
+
+    path('sync/', sync, name='sync'),
+    path('notifications/', notification_list, name='notification-list'),
+    path('notifications/read/', notification_mark_read, name='notification-mark-read'),
+    path('cache/stats/', response_cache_stats, name='response-cache-stats'),
+    path('profiles/', profile_report_list, name='profile-report-list'),
+    path('profiles/<str:name>/', profile_report_download, name='profile-report'),
+
+
     path('ws/notifications/', NotificationsConsumer.as_asgi(), name='ws-notifications'),
 ]
 
@@ -1,28 +1,52 @@
 from datetime import datetime
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
 from django.db.models.functions import Lower
 from django_filters import FilterSet
-from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
+from rest_framework.settings import api_settings
+from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
 from rest_framework.generics import get_object_or_404
-from rest_framework_simplejwt.tokens import RefreshToken
-from .permissions import IsOwnerOrReadOnly
+from rest_framework_simplejwt.tokens import RefreshToken, Token
+from .auth import MetricsTokenAuthentication, revoke_token
+from .permissions import HasMetricsAccess, IsOwnerOrReadOnly, IsProjectParticipant
 from .serializers import *
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, generics
 from django.shortcuts import get_object_or_404
-from channels.layers import get_channel_layer
-from asgiref.sync import async_to_sync
-from .models import Task, UserAPI
+from .models import Notification, Task, Tombstone, UserAPI
 from rest_framework.filters import OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
 from .serializers import TaskSerializer
 from django.db.models import Q
-from .notifications.websocket_notifications import send_websocket_notification
-
-
-
-
+from .notifications.websocket_notifications import (send_project_event, send_websocket_notification,
+                                                    send_websocket_notifications)
+from .pagination import KeysetPagination, paginated_response
+from .filters import CommentFilter
+from .membership import is_participant, member_project_ids
+from .conditional import comments_condition, project_condition, task_condition
+from .budgets import performance_budget
+from .cache import cached_response, invalidate_projects, project_scope, stats as cache_stats, user_scope
+from .analytics import analytics_setting, project_analytics
+from .signals import delete_handled
+from .stats import apply_task_changes, project_stats as build_project_stats, task_key
+from .sync import (collect_changes, cursor_expired, decode_cursor, encode_cursor, record_tombstones, sync_setting,
+                   take_page)
+from .renderers import CSVRenderer, NDJSONRenderer
+from .metrics import render_metrics
+from .profiling import list_reports, report_path
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.db import transaction
+from django.urls import reverse
+from django.utils.decorators import method_decorator
+from django.utils import timezone
+
+
+
+
+@performance_budget(queries=2, latency_ms=100)
+@performance_budget('POST', queries=13, latency_ms=100)
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
 def project_list_create(request):
@@ -42,9 +66,8 @@ def project_list_create(request):
     """
 
     if request.method == 'GET':
-        projects = Project.objects.all()
-        serializer = ProjectSerializer(projects, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        projects = Project.objects.order_by('-time_created')
+        return paginated_response(request, projects, ProjectSerializer)
 
     if request.method == 'POST':
         data = request.data.copy()
@@ -57,8 +80,10 @@ def project_list_create(request):
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
+@performance_budget(queries=3, latency_ms=100)
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cached_response('my_projects', lambda request: [user_scope(request.user.pk)])
 def my_projects(request):
     """
     Получение списка проектов, в которых участвует пользователь.
@@ -67,16 +92,17 @@ def my_projects(request):
     Возвращает список проектов текущего пользователя.
     """
 
-    projects = Project.objects.filter(participants=request.user)
-    serializer = ProjectSerializer(projects, many=True)
-    return Response(serializer.data)
+    projects = Project.objects.filter(participants=request.user).order_by('-time_created')
+    return paginated_response(request, projects, ProjectSerializer)
 
 
+@performance_budget(queries=3, latency_ms=100)
 class ProjectTaskListView(APIView):
     """
        Фильтрация задач проекта по дате создания, обновления или дедлайну.
        """
 
+    @method_decorator(cached_response('project_tasks', lambda request, pk, *args, **kwargs: [project_scope(pk)]))
     def get(self, request, pk, *args, **kwargs):
         """
             GET:
@@ -95,12 +121,165 @@ class ProjectTaskListView(APIView):
         if not tasks.exists():
             return Response({"message": "No tasks found for this project."}, status=status.HTTP_404_NOT_FOUND)
 
-        serializer = TaskSerializer(tasks, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return paginated_response(request, tasks.order_by('-created_at'), TaskSerializer)
+
+
+@performance_budget(queries=4, latency_ms=100)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsProjectParticipant])
+def project_stats(request, pk):
+    """
+    Сводка задач проекта для дашборда.
+
+    GET:
+    Параметры:
+    - pk (int): ID проекта.
+
+    Счётчики хранятся в ProjectStats/ProjectAssigneeStats и обновляются при
+    изменении задач, поэтому ответ не зависит от числа задач в проекте.
+    Ответ не кэшируется (cached_response): overdue зависит от текущего времени,
+    а чтение счётчиков стоит столько же, сколько проверка поколений кэша.
+    Пример ответа:
+    {
+        "project": 1, "total": 120, "open": 80, "overdue": 3,
+        "by_status": {"Grooming": 10, "In Progress": 30, "Dev": 40, "Done": 40},
+        "by_priority": {"Low": 50, "Medium": 50, "High": 20},
+        "assignees": [{"user": 2, "total": 12, "open": 5, "by_status": {...}, "by_priority": {...}}]
+    }
+
+    Ответы:
+    - 200: Сводка.
+    - 403: Пользователь не участник проекта.
+    """
+
+    return Response(build_project_stats(pk), status=status.HTTP_200_OK)
+
+
+def _bounded_int_param(request, name, default, maximum):
+    """
+    Целый параметр запроса от 1 до maximum; None, если значение некорректно.
+    """
+
+    value = request.query_params.get(name)
+    if value is None:
+        return default
+    try:
+        value = int(value)
+    except ValueError:
+        return None
+    return value if 1 <= value <= maximum else None
+
+
+def _invalid_param(name, maximum):
+    return Response({"error": f"Invalid {name} parameter. Use an integer from 1 to {maximum}."},
+                    status=status.HTTP_400_BAD_REQUEST)
+
+
+@performance_budget(queries=3, latency_ms=100)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsProjectParticipant])
+def project_cycle_time(request, pk):
+    """
+    Время выполнения задач проекта (от создания до перехода в Done), в часах.
 
+    GET:
+    Параметры:
+    - pk (int): ID проекта.
+    - weeks (int): Учитываются задачи, завершённые за последние weeks недель (по умолчанию 12).
+    - percentiles (str): Перцентили через запятую (по умолчанию "50,85,95").
 
+    Метрики считаются в main.analytics векторно по колонкам задач и кэшируются
+    до следующего изменения задач проекта.
+    Пример ответа:
+    {
+        "project": 1, "since": "2026-07-27", "completed": 120, "mean_hours": 51.2,
+        "percentiles": {"50": 30.5, "85": 80.0, "95": 120.25},
+        "by_priority": {"Low": {"completed": 40, "percentiles": {...}}, ...}
+    }
+
+    Ответы:
+    - 200: Метрика.
+    - 400: Некорректный параметр.
+    - 403: Пользователь не участник проекта.
+    """
+
+    max_weeks = analytics_setting('MAX_WEEKS')
+    weeks = _bounded_int_param(request, 'weeks', 12, max_weeks)
+    if weeks is None:
+        return _invalid_param('weeks', max_weeks)
+    try:
+        percentiles = sorted({float(value) for value in request.query_params.get('percentiles', '50,85,95').split(',')})
+    except ValueError:
+        percentiles = None
+    if not percentiles or not all(0 <= value <= 100 for value in percentiles):
+        return Response({"error": "Invalid percentiles parameter. Use comma-separated numbers from 0 to 100."},
+                        status=status.HTTP_400_BAD_REQUEST)
+
+    data = project_analytics(pk, 'cycle_time', weeks=weeks, percentiles=percentiles)
+    return Response(data, status=status.HTTP_200_OK)
+
+
+@performance_budget(queries=3, latency_ms=100)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsProjectParticipant])
+def project_throughput(request, pk):
+    """
+    Число созданных и завершённых задач проекта по неделям (с понедельника).
+
+    GET:
+    Параметры:
+    - pk (int): ID проекта.
+    - weeks (int): Сколько последних недель, включая текущую (по умолчанию 12).
+
+    Пример ответа:
+    {"project": 1, "weeks": [{"week": "2026-10-12", "created": 14, "completed": 9}, ...]}
+
+    Ответы:
+    - 200: Метрика.
+    - 400: Некорректный параметр.
+    - 403: Пользователь не участник проекта.
+    """
+
+    max_weeks = analytics_setting('MAX_WEEKS')
+    weeks = _bounded_int_param(request, 'weeks', 12, max_weeks)
+    if weeks is None:
+        return _invalid_param('weeks', max_weeks)
+    return Response(project_analytics(pk, 'throughput', weeks=weeks), status=status.HTTP_200_OK)
+
+
+@performance_budget(queries=3, latency_ms=100)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsProjectParticipant])
+def project_burndown(request, pk):
+    """
+    Burndown проекта по дням: объём, незавершённые и просроченные задачи на конец дня.
+
+    GET:
+    Параметры:
+    - pk (int): ID проекта.
+    - days (int): Сколько последних дней, включая сегодня (по умолчанию 30).
+
+    Пример ответа:
+    {"project": 1, "points": [{"date": "2026-10-16", "scope": 120, "remaining": 45, "overdue": 3}, ...]}
+
+    Ответы:
+    - 200: Метрика.
+    - 400: Некорректный параметр.
+    - 403: Пользователь не участник проекта.
+    """
+
+    max_days = analytics_setting('MAX_DAYS')
+    days = _bounded_int_param(request, 'days', 30, max_days)
+    if days is None:
+        return _invalid_param('days', max_days)
+    return Response(project_analytics(pk, 'burndown', days=days), status=status.HTTP_200_OK)
+
+
+@performance_budget(queries=4, latency_ms=100)
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@project_condition
+@cached_response('project_retrieve', lambda request, pk: [project_scope(pk)])
 def project_retrieve(request, pk):
     """
     Получение информации о проекте по его ID.
@@ -109,16 +288,20 @@ def project_retrieve(request, pk):
     Параметры:
     - pk (int): ID проекта.
 
+    Поддерживает условные запросы по ETag и Last-Modified (time_updated).
+
     Ответы:
     - 200: Детали проекта.
+    - 304: Проект не изменился.
     - 404: Проект не найден.
     """
 
-    project = get_object_or_404(Project, pk=pk)
-    serializer = ProjectSerializer(project)
+    project = get_object_or_404(ProjectSerializer.prepare_queryset(Project.objects.all(), request), pk=pk)
+    serializer = ProjectSerializer(project, context={'request': request})
     return Response(serializer.data, status=status.HTTP_200_OK)
 
 
+@performance_budget('PATCH', queries=6, latency_ms=100)
 @api_view(['PUT', 'PATCH'])
 @permission_classes([IsOwnerOrReadOnly])
 def project_update(request, pk):
@@ -152,6 +335,7 @@ def project_update(request, pk):
 
 
 
+@performance_budget('DELETE', queries=15, latency_ms=100)
 @api_view(['DELETE'])
 @permission_classes([IsOwnerOrReadOnly])
 def project_destroy(request, pk):
@@ -172,6 +356,7 @@ def project_destroy(request, pk):
     return Response({'detail': 'Project deleted successfully'}, status=status.HTTP_204_NO_CONTENT)
 
 
+@performance_budget('POST', queries=9, latency_ms=100)
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def add_participant(request, project_id):
@@ -210,6 +395,7 @@ def add_participant(request, project_id):
     return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
+@performance_budget('PATCH', queries=4, latency_ms=100)
 @api_view(['PATCH'])
 def assign_user_to_task(request, task_id):
     """
@@ -225,19 +411,17 @@ def assign_user_to_task(request, task_id):
     task.assigned_to = user
     task.save()
 
-    channel_layer = get_channel_layer()
-    async_to_sync(channel_layer.group_send)(
-        f"user_{user_id}",
-        {
-            "type": "send_notification",
-            "message": f"Вы назначены ответственным за задачу '{task.title}'."
-        }
+    send_websocket_notification(
+        user_id=user.id,
+        message=f"Вы назначены ответственным за задачу '{task.title}'.",
+        task_id=task.id,
     )
 
     serializer = TaskSerializer(task)
     return Response(serializer.data, status=status.HTTP_200_OK)
 
 
+@performance_budget('DELETE', queries=10, latency_ms=100)
 @api_view(['DELETE'])
 @permission_classes([IsAuthenticated])
 def remove_participant(request, project_id, user_id):
@@ -264,6 +448,7 @@ def remove_participant(request, project_id, user_id):
     return Response({'message': 'Participant removed.'}, status=status.HTTP_204_NO_CONTENT)
 
 
+@performance_budget('PATCH', queries=9, latency_ms=100)
 @api_view(['PATCH'])
 @permission_classes([IsAuthenticated])
 def update_participant_role(request, project_id, user_id):
@@ -297,6 +482,8 @@ def update_participant_role(request, project_id, user_id):
     return Response(serializer.data, status=status.HTTP_200_OK)
 
 
+@performance_budget(queries=1, latency_ms=100)
+@performance_budget('POST', queries=6, latency_ms=100)
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
 def task_list_create(request):
@@ -322,18 +509,17 @@ def task_list_create(request):
     """
 
     if request.method == 'GET':
-        tasks = Task.objects.all()
-        serializer = TaskSerializer(tasks, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        tasks = Task.objects.order_by('-created_at')
+        return paginated_response(request, tasks, TaskSerializer)
 
     if request.method == 'POST':
         project_id = request.data.get('project')
         if not project_id:
             return Response({"error": "Project ID is required."}, status=status.HTTP_400_BAD_REQUEST)
 
-        project = get_object_or_404(Project, pk=project_id)
+        project = get_object_or_404(Project.objects.only('id'), pk=project_id)
 
-        if request.user not in project.participants.all():
+        if not is_participant(request, project.id):
             return Response({"error": "You are not a participant of this project."}, status=status.HTTP_403_FORBIDDEN)
 
         serializer = TaskSerializer(data=request.data)
@@ -342,6 +528,7 @@ def task_list_create(request):
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
+@performance_budget(queries=1, latency_ms=100)
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def my_tasks(request):
@@ -349,16 +536,38 @@ def my_tasks(request):
     Получение списка задач, в которых участвует пользователь.
 
     GET:
-    Возвращает список задач для текущего пользователя.
+    Возвращает задачи проектов, где пользователь — участник, новые первыми.
+    Параметры:
+    - assigned_to (str): "me" — только задачи, назначенные текущему пользователю.
+    - status (str): Фильтр по статусу задачи.
+
+    Проекты пользователя выбираются подзапросом project_id IN (...) по
+    ProjectParticipant, а не JOIN с DISTINCT по всем колонкам задачи:
+    строки не дублируются, и список идёт по индексу task_created_idx.
     """
 
-    tasks = Task.objects.filter(project__participants=request.user).distinct()
-    serializer = TaskSerializer(tasks, many=True)
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    tasks = Task.objects.filter(
+        project_id__in=ProjectParticipant.objects.filter(user=request.user).values('project_id')
+    )
+
+    assigned_to = request.query_params.get('assigned_to')
+    if assigned_to is not None:
+        if assigned_to != 'me':
+            return Response({"error": "Invalid assigned_to parameter. Use 'me'."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        tasks = tasks.filter(assigned_to=request.user)
 
+    task_status = request.query_params.get('status')
+    if task_status:
+        tasks = tasks.filter(status=task_status)
 
+    return paginated_response(request, tasks.order_by('-created_at'), TaskSerializer)
+
+
+@performance_budget(queries=2, latency_ms=100)
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@task_condition
 def task_retrieve(request, pk):
     """
     Получение информации о задаче по ее ID.
@@ -367,16 +576,20 @@ def task_retrieve(request, pk):
     Параметры:
     - pk (int): ID задачи.
 
+    Поддерживает условные запросы по ETag и Last-Modified (updated_at).
+
     Ответы:
     - 200: Детали задачи.
+    - 304: Задача не изменилась.
     - 404: Задача не найдена.
     """
 
-    task = get_object_or_404(Task, pk=pk)
-    serializer = TaskSerializer(task)
+    task = get_object_or_404(TaskSerializer.prepare_queryset(Task.objects.all(), request), pk=pk)
+    serializer = TaskSerializer(task, context={'request': request})
     return Response(serializer.data, status=status.HTTP_200_OK)
 
 
+@performance_budget('PATCH', queries=3, latency_ms=100)
 @api_view(['PUT', 'PATCH'])
 @permission_classes([IsOwnerOrReadOnly])
 def task_update(request, pk):
@@ -404,13 +617,15 @@ def task_update(request, pk):
         serializer.is_valid(raise_exception=True)
         updated_task = serializer.save()
         send_websocket_notification(
-            user_id=updated_task.assigned_to,
-            message=f"Статус задачи '{updated_task.title}' был изменен на '{updated_task.status}'."
+            user_id=updated_task.assigned_to_id,
+            message=f"Статус задачи '{updated_task.title}' был изменен на '{updated_task.status}'.",
+            task_id=updated_task.id,
         )
 
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
+@performance_budget('DELETE', queries=6, latency_ms=100)
 @api_view(['DELETE'])
 @permission_classes([IsOwnerOrReadOnly])
 def task_destroy(request, pk):
@@ -431,8 +646,212 @@ def task_destroy(request, pk):
     return Response({'detail': 'Task deleted successfully'}, status=status.HTTP_204_NO_CONTENT)
 
 
+TASK_BULK_LIMIT = 1000
+
+
+def _bulk_items(request):
+    items = request.data
+    if not isinstance(items, list) or not items:
+        return None, Response({"error": "A non-empty list is required."}, status=status.HTTP_400_BAD_REQUEST)
+    if len(items) > TASK_BULK_LIMIT:
+        return None, Response({"error": f"At most {TASK_BULK_LIMIT} items per request."},
+                              status=status.HTTP_400_BAD_REQUEST)
+    return items, None
+
+
+def _bulk_id_errors(items):
+    """
+    Ошибки поля "id" у элементов PATCH: ID должен быть целым и не повторяться в пакете.
+    """
+
+    errors = []
+    seen = set()
+    for index, item in enumerate(items):
+        task_id = item.get('id') if isinstance(item, dict) else None
+        if not isinstance(task_id, int) or isinstance(task_id, bool):
+            errors.append({"index": index, "errors": {"id": ["A valid integer is required."]}})
+        elif task_id in seen:
+            errors.append({"index": index, "errors": {"id": ["Duplicate id in the batch."]}})
+        else:
+            seen.add(task_id)
+    return errors
+
+
+def _notify_assignees(tasks, message):
+    """
+    Одно уведомление на исполнителя за весь пакет вместо уведомления на задачу.
+    """
+
+    titles = {}
+    for task in tasks:
+        if task.assigned_to_id:
+            titles.setdefault(task.assigned_to_id, []).append(task.title)
+    send_websocket_notifications([
+        (user_id, message.format(count=len(user_titles), titles=', '.join(f"'{title}'" for title in user_titles)), None)
+        for user_id, user_titles in titles.items()
+    ])
+
+
+def _publish_tasks(event_type, tasks, items, project_id=lambda task: task.project_id):
+    """
+    Одно событие ленты на проект за весь пакет: bulk-операции не посылают сигналы модели.
+    """
+
+    by_project = {}
+    for task, item in zip(tasks, items):
+        by_project.setdefault(project_id(task), []).append(item)
+    for task_project_id, project_items in by_project.items():
+        send_project_event(task_project_id, event_type, project_items)
+
+
+@performance_budget('POST', queries=7, latency_ms=150)
+@api_view(['POST', 'PATCH', 'DELETE'])
+@permission_classes([IsAuthenticated])
+def task_bulk(request):
+    """
+    Пакетное создание, обновление и удаление задач в одной транзакции.
+
+    POST:
+    Создает задачи. Тело запроса — список задач в формате task_list_create.
+
+    PATCH:
+    Частично обновляет задачи. Тело запроса — список объектов с обязательным "id":
+    [{"id": 1, "status": "Done"}, {"id": 2, "priority": "High"}]
+    Каждая задача может встречаться в пакете только один раз.
+
+    DELETE:
+    Удаляет задачи. Тело запроса — список ID: [1, 2, 3]
+
+    Участие пользователя проверяется одним запросом на все проекты пакета.
+    Если хотя бы один элемент не прошел проверку, ничего не сохраняется.
+
+    Ответы:
+    - 200: Задачи обновлены.
+    - 201: Задачи созданы.
+    - 204: Задачи удалены.
+    - 400: Ошибки по элементам: {"errors": [{"index": 0, "errors": {...}}]}.
+    """
+
+    items, error_response = _bulk_items(request)
+    if error_response is not None:
+        return error_response
+
+    if request.method == 'DELETE':
+        return _task_bulk_delete(request, items)
+
+    if request.method == 'PATCH':
+        # Повтор ID применил бы оба элемента к одной задаче и дважды учёл её в счётчиках.
+        errors = _bulk_id_errors(items)
+        if errors:
+            return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+    with transaction.atomic():
+        instances = {}
+        if request.method == 'PATCH':
+            instances = Task.objects.select_for_update().in_bulk([item['id'] for item in items])
+
+        context = {'request': request, 'preloaded': BulkTaskSerializer.preload(items)}
+        serializers_ = []
+        errors = []
+        for index, item in enumerate(items):
+            if request.method == 'PATCH':
+                instance = instances.get(item['id'])
+                if instance is None:
+                    errors.append({"index": index, "errors": {"id": ["Task not found."]}})
+                    serializers_.append(None)
+                    continue
+                serializer = BulkTaskSerializer(instance, data=item, partial=True, context=context)
+            else:
+                serializer = BulkTaskSerializer(data=item, context=context)
+            if not serializer.is_valid():
+                errors.append({"index": index, "errors": serializer.errors})
+            serializers_.append(serializer)
+
+        touched_projects = {}
+        for index, serializer in enumerate(serializers_):
+            if serializer is None or serializer.errors:
+                continue
+            touched = set()
+            if serializer.instance is not None:
+                touched.add(serializer.instance.project_id)
+            if 'project' in serializer.validated_data:
+                touched.add(serializer.validated_data['project'].id)
+            touched_projects[index] = touched
+
+        member_ids = member_project_ids(request, set().union(*touched_projects.values()))
+        for index, touched in touched_projects.items():
+            if not touched <= member_ids:
+                errors.append({"index": index, "errors": {"project": ["You are not a participant of this project."]}})
+
+        if errors:
+            errors.sort(key=lambda error: error["index"])
+            return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        if request.method == 'POST':
+            tasks = Task.objects.bulk_create([Task(**serializer.validated_data) for serializer in serializers_])
+            # bulk_create/bulk_update не посылают сигналы модели.
+            apply_task_changes(added=[task_key(task) for task in tasks])
+            invalidate_projects(set().union(*touched_projects.values()))
+            _notify_assignees(tasks, "Вам назначено задач: {count} ({titles}).")
+            data = TaskSerializer(tasks, many=True).data
+            _publish_tasks('tasks.created', tasks, data)
+            return Response(data, status=status.HTTP_201_CREATED)
+
+        tasks = []
+        fields = {'updated_at'}
+        now = timezone.now()
+        removed, added = [], []
+        for serializer in serializers_:
+            task = serializer.instance
+            removed.append(task_key(task, task._loaded_values))
+            for attr, value in serializer.validated_data.items():
+                setattr(task, attr, value)
+                fields.add(attr)
+            task.updated_at = now
+            tasks.append(task)
+            added.append(task_key(task))
+        Task.objects.bulk_update(tasks, sorted(fields))
+        apply_task_changes(removed=removed, added=added)
+        invalidate_projects(set().union(*touched_projects.values()))
+        _notify_assignees(tasks, "Обновлено задач, где вы ответственный: {count} ({titles}).")
+        data = TaskSerializer(tasks, many=True).data
+        moved = [task for task in tasks if task._loaded_values.get('project_id', task.project_id) != task.project_id]
+        record_tombstones(Tombstone.Kind.TASK, moved, project_id=lambda task: task._loaded_values['project_id'])
+        _publish_tasks('tasks.deleted', moved, [{'id': task.id} for task in moved],
+                       project_id=lambda task: task._loaded_values['project_id'])
+        _publish_tasks('tasks.updated', tasks, data)
+        return Response(data, status=status.HTTP_200_OK)
+
+
+def _task_bulk_delete(request, ids):
+    if not all(isinstance(task_id, int) and not isinstance(task_id, bool) for task_id in ids):
+        return Response({"error": "A list of task IDs is required."}, status=status.HTTP_400_BAD_REQUEST)
+
+    with transaction.atomic():
+        tasks = Task.objects.select_for_update().only(
+            'id', 'project_id', 'assigned_to_id', 'status', 'priority').in_bulk(ids)
+        member_ids = member_project_ids(request, {task.project_id for task in tasks.values()})
+        errors = []
+        for index, task_id in enumerate(ids):
+            task = tasks.get(task_id)
+            if task is None:
+                errors.append({"index": index, "errors": {"id": ["Task not found."]}})
+            elif task.project_id not in member_ids:
+                errors.append({"index": index, "errors": {"project": ["You are not a participant of this project."]}})
+        if errors:
+            return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        record_tombstones(Tombstone.Kind.TASK, tasks.values())
+        apply_task_changes(removed=[task_key(task) for task in tasks.values()])
+        _publish_tasks('tasks.deleted', tasks.values(), [{'id': task_id} for task_id in tasks])
+        delete_handled(Task.objects.filter(id__in=tasks))
+    return Response({'detail': f'{len(tasks)} tasks deleted successfully'}, status=status.HTTP_204_NO_CONTENT)
+
+
+@performance_budget(queries=4, latency_ms=100)
 @api_view(['GET', 'PUT'])
 @permission_classes([IsAuthenticated])
+@cached_response('profile', lambda request: [user_scope(request.user.pk)])
 def profile_view(request):
     """
     Получение или обновление профиля пользователя.
@@ -455,8 +874,9 @@ def profile_view(request):
     user = request.user
 
     if request.method == 'GET':
-        active_projects = Project.objects.filter(participants=user, status=Project.Status.ACTIVE)
-        archive_projects = Project.objects.filter(participants=user, status=Project.Status.ARCHIVE)
+        projects = ProjectSerializer.setup_eager_loading(Project.objects.filter(participants=user))
+        active_projects = projects.filter(status=Project.Status.ACTIVE)
+        archive_projects = projects.filter(status=Project.Status.ARCHIVE)
 
         active_projects_serializer = ProjectSerializer(active_projects, many=True)
         archive_projects_serializer = ProjectSerializer(archive_projects, many=True)
@@ -479,6 +899,7 @@ def profile_view(request):
 
 
 
+@performance_budget('POST', queries=2, latency_ms=1500)
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def log_in_user(request):
@@ -494,23 +915,13 @@ def log_in_user(request):
 
     Ответы:
     - 200: Авторизация успешна, возвращены токены доступа и обновления.
-    - 401: Ошибка авторизации.
+    - 400: Неверные учетные данные.
+    - 429: Слишком много неудачных попыток входа.
     """
 
-    serializer = LogSerializer(data=request.data)
+    serializer = LogSerializer(data=request.data, context={'request': request})
     serializer.is_valid(raise_exception=True)
-
-    username = serializer.validated_data['email']
-    password = serializer.validated_data['password']
-
-    user = authenticate(username=username, password=password)
-
-    if user is None:
-        return Response(
-            {"error": {"code": status.HTTP_401_UNAUTHORIZED,
-                       "message": "Authentication failed"}},
-            status=status.HTTP_401_UNAUTHORIZED
-        )
+    user = serializer.validated_data['user']
 
     refresh = RefreshToken.for_user(user)
     return Response(
@@ -522,6 +933,7 @@ def log_in_user(request):
     )
 
 
+@performance_budget('POST', queries=4, latency_ms=1500)
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def sign_up_user(request):
@@ -557,11 +969,14 @@ def sign_up_user(request):
     )
 
 
+@performance_budget('POST', queries=6, latency_ms=100)
 @api_view(['POST'])
 def log_out_user(request):
     """
     Выход пользователя из системы путем аннулирования токена обновления.
 
+    Если запрос подписан access-токеном JWT, он тоже отзывается.
+
     POST:
     Пример тела запроса:
     {
@@ -576,7 +991,9 @@ def log_out_user(request):
     try:
         refresh_token = request.data["refresh"]
         token = RefreshToken(refresh_token)
-        token.blacklist()
+        revoke_token(token)
+        if isinstance(request.auth, Token):
+            revoke_token(request.auth)
         return Response(
             {"data": {"message": "Logout successful"}},
             status=status.HTTP_200_OK
@@ -589,8 +1006,11 @@ def log_out_user(request):
         )
 
 
+@performance_budget(queries=3, latency_ms=100)
+@performance_budget('POST', queries=3, latency_ms=100)
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
+@comments_condition
 def comment_list_create(request, task_id):
     """
     Получение списка комментариев или создание нового комментария.
@@ -606,8 +1026,12 @@ def comment_list_create(request, task_id):
     Параметры:
     - task_id (int): ID задачи (обязательно).
 
+    GET поддерживает If-None-Match: ETag считается по числу комментариев задачи
+    и последнему updated_at.
+
     Ответы:
     - 200: Успешное получение списка комментариев.
+    - 304: Комментарии не изменились.
     - 201: Успешное создание комментария.
     - 400: Ошибка валидации данных.
     - 404: Указанная задача не найдена.
@@ -621,21 +1045,22 @@ def comment_list_create(request, task_id):
         serializer.is_valid(raise_exception=True)
         comment = serializer.save(author=request.user)
 
-        if task.assigned_to:
+        if task.assigned_to_id:
             send_websocket_notification(
-                user_id=task.assigned_to.id,
-                message=f"Комментарий добавлен к задаче '{task.title}': {comment.content}"
+                user_id=task.assigned_to_id,
+                message=f"Комментарий добавлен к задаче '{task.title}': {comment.content}",
+                task_id=task.id,
             )
 
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
     elif request.method == 'GET':
-        comments = Comment.objects.filter(task=task)
-        serializer = CommentSerializer(comments, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        comments = Comment.objects.filter(task=task).order_by('created_at')
+        return paginated_response(request, comments, CommentSerializer)
 
 
+@performance_budget('DELETE', queries=6, latency_ms=100)
 @api_view(['DELETE'])
 def unassign_user_from_task(request, pk):
     """
@@ -657,7 +1082,8 @@ def unassign_user_from_task(request, pk):
 
     send_websocket_notification(
         user_id=user_id,
-        message=f"Вы больше не являетесь ответственным за задачу '{task.title}'."
+        message=f"Вы больше не являетесь ответственным за задачу '{task.title}'.",
+        task_id=task.id,
     )
     print(f"WebSocket уведомление отправлено для user_id={user_id}: Пользователь удалён из задачи '{task.title}'.")
 
@@ -665,6 +1091,7 @@ def unassign_user_from_task(request, pk):
     return Response(serializer.data, status=status.HTTP_200_OK)
 
 
+@performance_budget('PUT', queries=4, latency_ms=100)
 @api_view(['PUT', 'DELETE'])
 @permission_classes([IsAuthenticated])
 def comment_detail(request, task_id, pk):
@@ -703,6 +1130,7 @@ def comment_detail(request, task_id, pk):
         return Response({'message': 'Comment deleted successfully'}, status=status.HTTP_204_NO_CONTENT)
 
 
+@performance_budget(queries=2, latency_ms=100)
 class ProjectSymbolFilterView(APIView):
     """
     Сортировка проектов от А до Я, от Я до А
@@ -730,10 +1158,10 @@ class ProjectSymbolFilterView(APIView):
         else:
             return Response({"error": "Missing sort_by parameter"}, status=status.HTTP_400_BAD_REQUEST)
 
-        serializer = ProjectSerializer(projects, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return paginated_response(request, projects, ProjectSerializer)
 
 
+@performance_budget(queries=1, latency_ms=100)
 class ProjectTaskFilterView(APIView):
     """
     Фильтрация задач проекта по дате создания, обновления или дедлайну с сортировкой.
@@ -796,10 +1224,10 @@ class ProjectTaskFilterView(APIView):
             Q(project_id=project_id) & Q(**{f"{filter_field}__range": (start_date, end_date)})
         ).order_by(f"{sort_order}{filter_field}")
 
-        serializer = TaskSerializer(tasks, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return paginated_response(request, tasks, TaskSerializer)
 
 
+@performance_budget(queries=1, latency_ms=100)
 class ProjectDateRangeFilterView(APIView):
     """
     Фильтрация проектов по дате создания в указанном диапазоне.
@@ -829,10 +1257,9 @@ class ProjectDateRangeFilterView(APIView):
             return Response({"error": "Invalid date format. Use YYYY-MM-DD."},
                             status=status.HTTP_400_BAD_REQUEST)
 
-        projects = Project.objects.filter(time_created__range=(start_date, end_date))
+        projects = Project.objects.filter(time_created__range=(start_date, end_date)).order_by('time_created')
 
-        serializer = ProjectSerializer(projects, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return paginated_response(request, projects, ProjectSerializer)
 
 
 
@@ -865,6 +1292,7 @@ class TaskFilter(FilterSet):
 
 
 
+@performance_budget(queries=1, latency_ms=100)
 class TaskFilterView(generics.ListAPIView):
     """
     Фильтрация и сортировка задач.
@@ -872,7 +1300,9 @@ class TaskFilterView(generics.ListAPIView):
     GET:
     Параметры:
     - ordering (str): Поле для сортировки ("title" для сортировки по названию).
-      Возможны значения "title", "-title" и другие доступные поля.
+      Возможны значения "title", "-title" и другие доступные поля;
+      "lower_title" и "-lower_title" сортируют по названию без учёта регистра
+      (страницы читаются по индексу task_lower_title_idx).
 
     Ответы:
     - 200: Список отсортированных задач.
@@ -882,8 +1312,151 @@ class TaskFilterView(generics.ListAPIView):
     serializer_class = TaskSerializer
     filter_backends = (DjangoFilterBackend, OrderingFilter)
     filterset_class = TaskFilter
-    ordering_fields = ['title', 'created_at', 'updated_at', 'status', 'priority']
+    ordering_fields = ['title', 'lower_title', 'created_at', 'updated_at', 'status', 'priority']
     ordering = ['created_at']
+    pagination_class = KeysetPagination
+
+    def get_queryset(self):
+        return TaskSerializer.prepare_queryset(super().get_queryset(), self.request)
+
+
+
+_STREAM_END = object()
+
+
+async def _async_chunks(chunks):
+    """
+    Асинхронная обёртка над синхронным потоком выгрузки: каждый кусок читается
+    из курсора и рендерится в sync_to_async (в том же потоке, что и остальная
+    работа с базой), а event loop отдаёт его клиенту сразу.
+    """
+
+    try:
+        while True:
+            chunk = await sync_to_async(next)(chunks, _STREAM_END)
+            if chunk is _STREAM_END:
+                return
+            yield chunk
+    finally:
+        await sync_to_async(chunks.close)()
+
+
+class ExportView(APIView):
+    """
+    Базовое представление потоковой выгрузки.
+
+    Строки читаются курсором на стороне сервера (.iterator(chunk_size=...)) в виде
+    кортежей values_list() и сразу пишутся в StreamingHttpResponse, поэтому память
+    не растёт с размером проекта. Формат выбирается параметром format или Accept.
+
+    Под ASGI ответ получает асинхронный итератор (_async_chunks): синхронный
+    генератор Django дочитал бы там до конца и отдал одним куском.
+    """
+
+    renderer_classes = [NDJSONRenderer, CSVRenderer]
+    chunk_size = 2000
+    filterset_class = None
+    export_fields = ()
+    export_name = 'export'
+
+    def get_export_queryset(self, project):
+        raise NotImplementedError
+
+    def get(self, request, project_id, *args, **kwargs):
+        project = get_object_or_404(Project, pk=project_id)
+        if not is_participant(request, project.id):
+            return Response({"error": "You are not a participant of this project."}, status=status.HTTP_403_FORBIDDEN)
+
+        filterset = self.filterset_class(request.query_params, queryset=self.get_export_queryset(project))
+        if not filterset.is_valid():
+            return Response(filterset.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        columns = [name for name, _ in self.export_fields]
+        rows = filterset.qs.order_by('id').values_list(
+            *(lookup for _, lookup in self.export_fields)
+        ).iterator(chunk_size=self.chunk_size)
+
+        renderer = request.accepted_renderer
+        chunks = renderer.stream(rows, columns)
+        if isinstance(request._request, ASGIRequest):
+            chunks = _async_chunks(chunks)
+        response = StreamingHttpResponse(chunks, content_type=request.accepted_media_type)
+        response['Content-Disposition'] = (
+            f'attachment; filename="project-{project.id}-{self.export_name}.{renderer.format}"'
+        )
+        return response
+
+
+@performance_budget(queries=3, latency_ms=100)
+class ProjectTaskExportView(ExportView):
+    """
+    Потоковая выгрузка задач проекта.
+
+    GET:
+    Параметры:
+    - project_id (int): ID проекта.
+    - format (str): "ndjson" (по умолчанию) или "csv".
+    - status, priority, assigned_to, created_at__gte, created_at__lte, updated_at__gte,
+      updated_at__lte, title__icontains: те же фильтры, что у TaskFilter.
+
+    Ответы:
+    - 200: Поток задач в выбранном формате.
+    - 400: Ошибка в параметрах фильтрации.
+    - 403: Пользователь не является участником проекта.
+    """
+
+    filterset_class = TaskFilter
+    export_name = 'tasks'
+    export_fields = (
+        ('id', 'id'),
+        ('title', 'title'),
+        ('content', 'content'),
+        ('project', 'project_id'),
+        ('assigned_to', 'assigned_to_id'),
+        ('status', 'status'),
+        ('priority', 'priority'),
+        ('created_at', 'created_at'),
+        ('updated_at', 'updated_at'),
+        ('deadline', 'deadline'),
+        ('testing_responsible', 'testing_responsible_id'),
+    )
+
+    def get_export_queryset(self, project):
+        return Task.objects.filter(project=project)
+
+
+@performance_budget(queries=3, latency_ms=100)
+class ProjectCommentExportView(ExportView):
+    """
+    Потоковая выгрузка комментариев ко всем задачам проекта.
+
+    GET:
+    Параметры:
+    - project_id (int): ID проекта.
+    - format (str): "ndjson" (по умолчанию) или "csv".
+    - task, author, created_at_after, created_at_before: фильтры CommentFilter.
+
+    Ответы:
+    - 200: Поток комментариев в выбранном формате.
+    - 400: Ошибка в параметрах фильтрации.
+    - 403: Пользователь не является участником проекта.
+    """
+
+    filterset_class = CommentFilter
+    export_name = 'comments'
+    export_fields = (
+        ('id', 'id'),
+        ('task', 'task_id'),
+        ('author', 'author_id'),
+        ('author_name', 'author__name'),
+        ('author_surname', 'author__surname'),
+        ('content', 'content'),
+        ('created_at', 'created_at'),
+        ('updated_at', 'updated_at'),
+    )
+
+    def get_export_queryset(self, project):
+        return Comment.objects.filter(task__project=project)
 
 
 
@@ -909,20 +1482,201 @@ def assign_to_project(user_id, project_id):
 def assign_task(user_id, task_id):
     send_websocket_notification(
         user_id=user_id,
-        message=f"Вы назначены ответственным за задачу с ID {task_id}"
+        message=f"Вы назначены ответственным за задачу с ID {task_id}",
+        task_id=task_id,
     )
 
 
 def change_task_status(user_id, task_id, status):
     send_websocket_notification(
         user_id=user_id,
-        message=f"Статус задачи с ID {task_id} был изменен на {status}"
+        message=f"Статус задачи с ID {task_id} был изменен на {status}",
+        task_id=task_id,
     )
 
 
 def add_comment(user_id, task_id, comment_text):
     send_websocket_notification(
         user_id=user_id,
-        message=f"Комментарий к задаче с ID {task_id}: {comment_text}"
+        message=f"Комментарий к задаче с ID {task_id}: {comment_text}",
+        task_id=task_id,
     )
 
+
+
+@performance_budget(queries=7, latency_ms=500)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def sync(request):
+    """
+    Дельта-синхронизация клиента.
+
+    GET:
+    Параметры:
+    - since (str, необязательно): курсор из предыдущего ответа. Без него
+      возвращаются все проекты пользователя целиком.
+    - limit (int, необязательно): сколько объектов каждого вида (проектов,
+      задач, комментариев, участников, удалённых) отдать за раз, по умолчанию
+      SYNC['PAGE_SIZE'], не больше SYNC['MAX_PAGE_SIZE'].
+
+    Ответ содержит проекты, задачи, комментарии и участников, созданные или
+    изменённые после курсора, идентификаторы удалённых объектов в deleted,
+    новый курсор и флаг has_more. Пока has_more равен true, клиент запрашивает
+    следующую страницу с since=cursor; последняя страница возвращает обычный
+    курсор. Объекты на границе курсора могут прийти повторно.
+
+    Ответы:
+    - 200: Изменения и новый курсор.
+    - 400: Некорректный курсор или limit.
+    - 410: Курсор старше срока хранения надгробий, нужна полная синхронизация.
+    """
+
+    max_limit = sync_setting('MAX_PAGE_SIZE')
+    limit = _bounded_int_param(request, 'limit', sync_setting('PAGE_SIZE'), max_limit)
+    if limit is None:
+        return _invalid_param('limit', max_limit)
+    since, until, after = decode_cursor(request.query_params['since']) if request.query_params.get('since') \
+        else (None, None, {})
+    if since is not None and cursor_expired(since):
+        return Response({"error": "Cursor expired, full resync required."}, status=status.HTTP_410_GONE)
+
+    # Конец выгрузки фиксируется на первой странице и переносится в курсоры продолжения.
+    until = until or timezone.now()
+    changes = collect_changes(request.user, since, after)
+    changes['projects'] = ProjectSerializer.setup_eager_loading(changes['projects'])
+    changes['comments'] = SyncCommentSerializer.setup_eager_loading(changes['comments'])
+    page, after, has_more = take_page(changes, limit, after)
+    context = {'request': request}
+    cursor = encode_cursor(since, until, after) if has_more else encode_cursor(until)
+    return Response({
+        'projects': ProjectSerializer(page['projects'], many=True, context=context).data,
+        'tasks': TaskSerializer(page['tasks'], many=True, context=context).data,
+        'comments': SyncCommentSerializer(page['comments'], many=True, context=context).data,
+        'memberships': SyncMembershipSerializer(page['memberships'], many=True, context=context).data,
+        'deleted': page['deleted'],
+        'cursor': cursor,
+        'has_more': has_more,
+    }, status=status.HTTP_200_OK)
+
+
+@performance_budget(queries=0, latency_ms=100)
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def response_cache_stats(request):
+    """
+    Счётчики попаданий и промахов кэша ответов в текущем процессе.
+
+    GET:
+    Возвращает {"<представление>": {"hits": int, "misses": int}}.
+    """
+
+    return Response(cache_stats.snapshot(), status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@authentication_classes([MetricsTokenAuthentication, *api_settings.DEFAULT_AUTHENTICATION_CLASSES])
+@permission_classes([HasMetricsAccess])
+def metrics_view(request):
+    """
+    Метрики запросов текущего процесса в текстовом формате Prometheus.
+
+    GET:
+    Гистограммы времени ответа, числа и времени запросов к базе, сериализации
+    и отправки уведомлений по каждому представлению, счётчик запросов по статусам.
+    """
+
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+@performance_budget(queries=0, latency_ms=100)
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def profile_report_list(request):
+    """
+    Сохранённые отчёты профилирования запросов (заголовок X-Profile), новые первыми.
+
+    GET:
+    Возвращает [{"name": str, "size": int, "url": str}].
+    """
+
+    reports = [
+        {
+            'name': path.name,
+            'size': path.stat().st_size,
+            'url': request.build_absolute_uri(reverse('profile-report', kwargs={'name': path.name})),
+        }
+        for path in list_reports()
+    ]
+    return Response(reports, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def profile_report_download(request, name):
+    """
+    Скачивание отчёта профилирования в виде текстового файла.
+    """
+
+    path = report_path(name)
+    if path is None:
+        raise Http404
+    return FileResponse(path.open('rb'), as_attachment=True, filename=name, content_type='text/plain; charset=utf-8')
+
+
+@performance_budget(queries=1, latency_ms=100)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def notification_list(request):
+    """
+    Входящие уведомления пользователя по возрастанию seq.
+
+    GET:
+    Параметры:
+    - after_seq (int, необязательно): только уведомления с seq больше указанного.
+    - unread (bool, необязательно): только непрочитанные.
+    """
+
+    notifications = Notification.objects.filter(user=request.user).order_by('seq')
+    after_seq = request.query_params.get('after_seq')
+    if after_seq is not None:
+        try:
+            notifications = notifications.filter(seq__gt=int(after_seq))
+        except ValueError:
+            return Response({"error": "after_seq must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+    if request.query_params.get('unread') in ('1', 'true', 'True'):
+        notifications = notifications.filter(read_at__isnull=True)
+    return paginated_response(request, notifications, NotificationSerializer)
+
+
+@performance_budget('POST', queries=1, latency_ms=100)
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def notification_mark_read(request):
+    """
+    Пакетная отметка уведомлений прочитанными одним UPDATE.
+
+    POST:
+    Пример тела запроса:
+    {
+        "up_to_seq": 120
+    }
+    или
+    {
+        "seqs": [118, 119, 120]
+    }
+
+    Ответы:
+    - 200: {"updated": <число отмеченных уведомлений>}.
+    - 400: Не передан up_to_seq или seqs.
+    """
+
+    notifications = Notification.objects.filter(user=request.user, read_at__isnull=True)
+    up_to_seq = request.data.get('up_to_seq')
+    seqs = request.data.get('seqs')
+    if isinstance(up_to_seq, int) and not isinstance(up_to_seq, bool):
+        notifications = notifications.filter(seq__lte=up_to_seq)
+    elif isinstance(seqs, list) and all(isinstance(seq, int) and not isinstance(seq, bool) for seq in seqs):
+        notifications = notifications.filter(seq__in=seqs)
+    else:
+        return Response({"error": "up_to_seq or a list of seqs is required."}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({"updated": notifications.update(read_at=timezone.now())}, status=status.HTTP_200_OK)
@@ -1,20 +1,26 @@
-
 import os
 from channels.routing import ProtocolTypeRouter, URLRouter
 from channels.auth import AuthMiddlewareStack
 from django.core.asgi import get_asgi_application
-from main.notifications.routing import websocket_urlpatterns
 
 
 
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'work.settings')
 
+# Приложение Django инициализируется до импорта consumers, которые используют модели.
+django_asgi_app = get_asgi_application()
+
+from main.notifications.middleware import JWTAuthMiddleware  # noqa: E402
+from main.notifications.routing import websocket_urlpatterns  # noqa: E402
+
 application = ProtocolTypeRouter({
-    "http": get_asgi_application(),
+    "http": django_asgi_app,
     "websocket": AuthMiddlewareStack(
-        URLRouter(
-            websocket_urlpatterns
+        JWTAuthMiddleware(
+            URLRouter(
+                websocket_urlpatterns
+            )
         )
     ),
 })
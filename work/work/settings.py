@@ -52,6 +52,8 @@ ASGI_APPLICATION = 'work.asgi.application'
 
 
 MIDDLEWARE = [
+    'main.middleware.PerformanceMiddleware',
+    'main.middleware.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -100,12 +102,35 @@ DATABASES = {
     }
 }
 
+# Общий для всех процессов channel layer на той же базе PostgreSQL (LISTEN/NOTIFY).
 CHANNEL_LAYERS = {
     "default": {
-        "BACKEND": "channels.layers.InMemoryChannelLayer",
+        "BACKEND": "main.notifications.layers.PostgresChannelLayer",
+        "CONFIG": {
+            "expiry": 60,
+            "group_expiry": 86400,
+        },
     },
 }
 
+# Фоновая отправка WebSocket-уведомлений (main.notifications.dispatcher).
+NOTIFICATIONS = {
+    'BATCH_SIZE': 100,
+    'QUEUE_SIZE': 10000,
+    # Окно склейки уведомлений об одной задаче и период дайджестов для
+    # пользователей без открытых сокетов (секунды; 0 отключает).
+    'COALESCE_WINDOW': 2.0,
+    'DIGEST_INTERVAL': 300,
+    'DIGEST_SIZE': 20,
+    # Сколько раз поток склейки повторяет неудачную запись во входящие.
+    'STORE_RETRIES': 3,
+    # Входящие: сколько пропущенных уведомлений отдаётся при переподключении,
+    # срок хранения прочитанных и предел на пользователя (compact_notifications).
+    'REPLAY_LIMIT': 500,
+    'INBOX_RETENTION_DAYS': 30,
+    'INBOX_MAX_PER_USER': 1000,
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -148,9 +173,8 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
+        'main.auth.CachedJWTAuthentication',
         'rest_framework.authentication.TokenAuthentication',
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
-
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -160,6 +184,19 @@ REST_FRAMEWORK = {
         'rest_framework.filters.OrderingFilter'
     ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_RENDERER_CLASSES': [
+        'main.renderers.ORJSONRenderer',
+        'main.renderers.MessagePackRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'main.renderers.ORJSONParser',
+        'main.renderers.MessagePackParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'main.pagination.KeysetPagination',
+    'PAGE_SIZE': 50,
 
 }
 
@@ -185,3 +222,96 @@ MEDIA_ROOT = BASE_DIR / 'media'
 
 AUTH_USER_MODEL = 'main.UserAPI'
 
+# Неудачные попытки входа, после которых пара (email, адрес клиента) временно
+# блокируется без проверки пароля.
+LOGIN_FAILURE_CACHE = {
+    'MAX_ENTRIES': 10000,
+    'MAX_ATTEMPTS': 5,
+    'TIMEOUT': 300,
+}
+
+# default — локальный кэш процесса (неудачные входы).
+# responses — данные ответов main.cache в процессе: LocMemCache вытесняет по LRU при
+# MAX_ENTRIES; поколения, которыми они сбрасываются, общие и хранятся в CacheGeneration.
+# shared — общий для всех воркеров кэш: роли в проектах (main.membership), присутствие
+# пользователей в сети и окно ограничения частоты профилирования (main.profiling). По умолчанию
+# это таблица в PostgreSQL (создаётся миграцией 0008_shared_cache); при появлении
+# Redis или Memcached достаточно сменить BACKEND, у них incr к тому же атомарен.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'main_shared_cache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 100000,
+        },
+    },
+    'responses': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'responses',
+        'TIMEOUT': 300,
+        'OPTIONS': {
+            'MAX_ENTRIES': 5000,
+            'CULL_FREQUENCY': 10,
+        },
+    },
+}
+
+# CachedJWTAuthentication: TTL кэша пользователя и период синхронизации
+# отозванных JTI с таблицей token_blacklist (секунды). Оба кэша свои у каждого
+# воркера, поэтому это же и предельные задержки, с которыми остальные воркеры
+# видят блокировку пользователя и отзыв токена.
+JWT_AUTH_CACHE = {
+    'USER_TIMEOUT': 10,
+    'REVOKED_SYNC_INTERVAL': 5,
+}
+
+# Сколько секунд кэшируется роль пользователя в проекте (main.membership, CACHES['shared']).
+MEMBERSHIP_CACHE_TIMEOUT = 30
+
+# Дельта-синхронизация (/api/v1/sync/): окно перекрытия курсора, срок хранения надгробий
+# и размер страницы (объектов каждого вида за ответ) по умолчанию и максимальный.
+SYNC = {
+    'OVERLAP_SECONDS': 5,
+    'TOMBSTONE_RETENTION_DAYS': 30,
+    'PAGE_SIZE': 500,
+    'MAX_PAGE_SIZE': 5000,
+}
+
+# Аналитика проектов (main.analytics): срок жизни кэша метрик и предельные окна в неделях/днях.
+ANALYTICS = {
+    'CACHE_TIMEOUT': 300,
+    'MAX_WEEKS': 104,
+    'MAX_DAYS': 365,
+}
+
+
+# Метрики запросов (main.middleware.PerformanceMiddleware, /metrics). Гистограммы
+# хранятся в памяти процесса: при нескольких воркерах каждый собирается отдельно.
+# TOKEN — bearer-токен сборщика метрик; без него /metrics доступен только сотрудникам.
+METRICS = {
+    'TOKEN': '',
+}
+
+# Профилирование запроса по требованию (main.middleware.ProfilingMiddleware):
+# заголовок X-Profile: 1 или ?_profile=1 от сотрудника. Не чаще RATE_LIMIT раз
+# за RATE_PERIOD секунд; запросы дольше EXPLAIN_THRESHOLD_MS получают EXPLAIN ANALYZE.
+# Отчёты лежат в REPORT_DIR, хранятся последние MAX_REPORTS.
+PROFILING = {
+    'HEADER': 'X-Profile',
+    'QUERY_PARAM': '_profile',
+    'RATE_LIMIT': 10,
+    'RATE_PERIOD': 60,
+    'EXPLAIN_THRESHOLD_MS': 50,
+    'TOP_FUNCTIONS': 60,
+    'REPORT_DIR': BASE_DIR / 'profiles',
+    'MAX_REPORTS': 100,
+}
+
+# Бюджеты запросов и задержки представлений (@performance_budget, PerformanceBudgetTests).
+# LATENCY_FACTOR умножает бюджеты задержки на медленных машинах CI.
+PERFORMANCE_BUDGETS = {
+    'LATENCY_FACTOR': 1.0,
+}